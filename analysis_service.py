@@ -0,0 +1,242 @@
+import argparse
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterable, Optional
+
+from flask import Flask, jsonify, request
+
+import batch_analyzer
+
+DEFAULT_MAX_UPLOAD_BYTES = 50 * 1024 * 1024
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+class AnalysisService:
+    """
+    Pre-warmed process pools behind a bounded admission queue.
+
+    Each analyzer ('v3', 'rater') gets its own ProcessPoolExecutor whose
+    workers are initialized by batch_analyzer.init_worker, so librosa is
+    imported and numba kernels are compiled before the first request. At most
+    max_pending jobs (running plus queued) are admitted at once; submit()
+    returns None when the service is saturated. A job whose caller stopped
+    waiting still holds its slot until the worker finishes it, so admission
+    reflects the real load on the pool. If a worker dies (out of memory, a
+    crash in native code), its jobs fail and the analyzer's pool is
+    replaced by a fresh, warming one.
+
+    Parameters:
+        analyzers (Iterable[str]): Analyzers to serve (default: both)
+        workers (Optional[int]): Worker processes per analyzer (default: CPU count)
+        max_pending (Optional[int]): Admitted jobs across all analyzers (default: 4 x total workers)
+    """
+
+    def __init__(
+        self,
+        analyzers: Iterable[str] = batch_analyzer.ANALYZERS,
+        workers: Optional[int] = None,
+        max_pending: Optional[int] = None
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.pools = {name: self._make_pool(name) for name in analyzers}
+        self.max_pending = max_pending or 4 * self.workers * len(self.pools)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self.counters = {'submitted': 0, 'completed': 0, 'failed': 0, 'rejected': 0, 'timed_out': 0}
+        self.in_flight = 0
+        self.pool_restarts = 0
+
+    def _make_pool(self, analyzer_name: str) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=batch_analyzer.init_worker,
+            initargs=(analyzer_name,)
+        )
+
+    def _replace_pool(self, analyzer_name: str, broken: ProcessPoolExecutor):
+        """Swap a broken pool for a new one (once, however many jobs saw it break)."""
+        with self._lock:
+            if self.pools.get(analyzer_name) is not broken:
+                return
+            self.pools[analyzer_name] = self._make_pool(analyzer_name)
+            self.pool_restarts += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def warm(self):
+        """Start every worker process and wait until all have finished warming up."""
+        for pool in self.pools.values():
+            futures = [pool.submit(_ping) for _ in range(self.workers)]
+            for future in futures:
+                future.result()
+        return self
+
+    def record_timeout(self):
+        """Count a job whose caller gave up waiting for it."""
+        with self._lock:
+            self.counters['timed_out'] += 1
+
+    def submit(self, analyzer_name: str, audio_path: str):
+        """
+        Queue one file for analysis.
+
+        Args:
+            analyzer_name (str): Pool to run on
+            audio_path (str): Audio file; deleted once the job finishes
+
+        Returns:
+            Future resolving to a batch_analyzer.analyze_file record, or None
+            if the queue is full
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.counters['rejected'] += 1
+            return None
+        try:
+            pool = self.pools[analyzer_name]
+            try:
+                future = pool.submit(batch_analyzer.analyze_file, audio_path)
+            except BrokenProcessPool:
+                self._replace_pool(analyzer_name, pool)
+                pool = self.pools[analyzer_name]
+                future = pool.submit(batch_analyzer.analyze_file, audio_path)
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            self.counters['submitted'] += 1
+            self.in_flight += 1
+        future.add_done_callback(lambda f: self._finish(f, audio_path, analyzer_name, pool))
+        return future
+
+    def _finish(self, future, audio_path: str, analyzer_name: str, pool: ProcessPoolExecutor):
+        error = None if future.cancelled() else future.exception()
+        with self._lock:
+            self.in_flight -= 1
+            failed = future.cancelled() or error is not None or future.result()['status'] != 'ok'
+            self.counters['failed' if failed else 'completed'] += 1
+        self._slots.release()
+        if isinstance(error, BrokenProcessPool):
+            self._replace_pool(analyzer_name, pool)
+        try:
+            os.remove(audio_path)
+        except OSError:
+            pass
+
+    def metrics(self) -> str:
+        """Service counters in the Prometheus text exposition format."""
+        with self._lock:
+            counters, in_flight, restarts = dict(self.counters), self.in_flight, self.pool_restarts
+        lines = []
+        for name, value in counters.items():
+            lines += [f"# TYPE analysis_service_jobs_{name}_total counter",
+                      f"analysis_service_jobs_{name}_total {value}"]
+        lines += ["# TYPE analysis_service_pool_restarts_total counter", f"analysis_service_pool_restarts_total {restarts}",
+                  "# TYPE analysis_service_jobs_in_flight gauge", f"analysis_service_jobs_in_flight {in_flight}",
+                  "# TYPE analysis_service_jobs_capacity gauge", f"analysis_service_jobs_capacity {self.max_pending}"]
+        return '\n'.join(lines) + '\n'
+
+    def shutdown(self):
+        for pool in self.pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def create_app(service: AnalysisService, timeout: float = 60.0,
+               max_upload_bytes: int = DEFAULT_MAX_UPLOAD_BYTES) -> Flask:
+    """
+    Build the Flask app in front of an AnalysisService.
+
+    POST /analyze?analyzer=v3|rater takes a WAV file, either as the 'file'
+    field of a multipart form or as the raw request body. Responses:
+    200 with the result, 422 if the analysis failed, 429 when the queue is
+    full, 504 when the analysis takes longer than timeout seconds and 500 if
+    the worker process died.
+
+    Args:
+        service (AnalysisService): Worker pools to run the jobs on
+        timeout (float): Seconds a request waits for its result (default: 60)
+        max_upload_bytes (int): Largest accepted upload (default: 50 MB)
+
+    Returns:
+        Flask: The application
+    """
+    app = Flask(__name__)
+    app.config['MAX_CONTENT_LENGTH'] = max_upload_bytes
+
+    @app.post('/analyze')
+    def analyze():
+        analyzer_name = request.args.get('analyzer', 'v3')
+        if analyzer_name not in service.pools:
+            return jsonify(error=f"Unknown analyzer '{analyzer_name}'", analyzers=list(service.pools)), 400
+
+        upload = request.files.get('file')
+        data = upload.read() if upload is not None else request.get_data()
+        if not data:
+            return jsonify(error="No audio uploaded"), 400
+
+        fd, path = tempfile.mkstemp(suffix='.wav')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+
+        future = service.submit(analyzer_name, path)
+        if future is None:
+            os.remove(path)
+            response = jsonify(error="Analysis queue is full, retry later")
+            response.headers['Retry-After'] = '1'
+            return response, 429
+
+        try:
+            record = future.result(timeout=timeout)
+        except TimeoutError:
+            service.record_timeout()
+            return jsonify(error=f"Analysis did not finish within {timeout:g} s"), 504
+        except BrokenProcessPool:
+            # The service has already replaced the pool; later requests get fresh workers
+            return jsonify(error="Analysis worker crashed; the worker pool has been restarted"), 500
+
+        if record['status'] != 'ok':
+            return jsonify(error=record['error']), 422
+        return jsonify(analyzer=analyzer_name, result=record['result'])
+
+    @app.get('/healthz')
+    def healthz():
+        return jsonify(status='ok', analyzers=list(service.pools), workers=service.workers,
+                       in_flight=service.in_flight, capacity=service.max_pending)
+
+    @app.get('/metrics')
+    def metrics():
+        return service.metrics(), 200, {'Content-Type': 'text/plain; version=0.0.4'}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP voice analysis service on pre-warmed worker processes")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('-a', '--analyzers', nargs='+', choices=batch_analyzer.ANALYZERS,
+                        default=list(batch_analyzer.ANALYZERS))
+    parser.add_argument('-w', '--workers', type=int, default=None, help="Worker processes per analyzer")
+    parser.add_argument('--max-pending', type=int, default=None, help="Admitted jobs before answering 429")
+    parser.add_argument('--timeout', type=float, default=60.0, help="Per-request timeout in seconds")
+    args = parser.parse_args()
+
+    service = AnalysisService(args.analyzers, workers=args.workers, max_pending=args.max_pending)
+    print("Warming up workers...")
+    service.warm()
+    print(f"Serving {', '.join(service.pools)} with {service.workers} workers each "
+          f"(capacity {service.max_pending}) on http://{args.host}:{args.port}")
+    try:
+        # One process: the HTTP threads only wait on futures, the pools do the work
+        create_app(service, timeout=args.timeout).run(host=args.host, port=args.port, threaded=True)
+    finally:
+        service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
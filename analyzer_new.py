@@ -1,30 +1,50 @@
-import librosa
-import librosa.display
 import numpy as np
-import speech_recognition as sr
 import re
-from scipy.signal import find_peaks
+from functools import lru_cache
+from lazy_imports import lazy_import
+from audio_io import ANALYSIS_SAMPLE_RATE, load_audio
+from block_analysis import analyze_file_in_blocks, audio_duration
+from features import extract_features
+from phrase_matcher import PhraseMatcher
+from result_cache import ResultCache, hash_file
+
+# Heavy dependencies load on first use
+sr = lazy_import("speech_recognition")
+
+# Bump when feature extraction or transcription output changes
+ANALYZER_VERSION = "5"
+
+@lru_cache(maxsize=1)
+def get_cache():
+    # Opened on first use, so importing this module touches no files
+    return ResultCache()
+
+# Files longer than this are analyzed block by block instead of loaded whole
+MAX_IN_MEMORY_SECONDS = 600
 
 def extract_audio_features(audio_file):
-    # Load audio file
-    y, sr = librosa.load(audio_file, sr=None)
+    duration = audio_duration(audio_file)
+    if duration is not None and duration > MAX_IN_MEMORY_SECONDS:
+        return extract_audio_features_blocks(audio_file)
     
-    # Extract pitch (fundamental frequency)
-    pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
-    pitch_values = pitches[pitches > 0]  # Remove zero values
+    # Decode and resample to the shared analysis rate
+    y, sr = load_audio(audio_file)
+    
+    # Compute only the features used below; RMS and speech segments are shared
+    features = extract_features(y, sr, ["voiced_pitches", "rms", "tempo", "pause_metrics"])
+    
+    # Extract pitch (fundamental frequency), voiced frames of speech segments only
+    pitch_values = features["voiced_pitches"]
     avg_pitch = np.mean(pitch_values) if len(pitch_values) > 0 else 0
     
     # Extract loudness (RMS energy)
-    rms = librosa.feature.rms(y=y)
-    avg_loudness = np.mean(rms)
+    avg_loudness = np.mean(features["rms"])
     
     # Extract speech rate (word per second estimation)
-    tempo, _ = librosa.beat.beat_track(y=y, sr=sr)
+    tempo = features["tempo"]
     
-    # Detect pauses (silence regions)
-    silence_threshold = np.percentile(np.abs(y), 10)  # 10th percentile as threshold
-    silent_parts = np.where(np.abs(y) < silence_threshold)[0]
-    pause_ratio = len(silent_parts) / len(y)  # Ratio of silence in audio
+    # Pauses are the gaps between speech segments
+    pause_ratio = features["pause_metrics"]["pause_ratio"]
     
     return {
         "avg_pitch": avg_pitch,
@@ -33,6 +53,17 @@ def extract_audio_features(audio_file):
         "pause_ratio": pause_ratio
     }
 
+def extract_audio_features_blocks(audio_file):
+    # Stream the file in overlapping blocks and aggregate as we go
+    features = analyze_file_in_blocks(audio_file)
+    
+    return {
+        "avg_pitch": features["pitch_mean"],
+        "avg_loudness": features["rms_mean"],
+        "speech_rate": features["tempo"],
+        "pause_ratio": features["pause_ratio"]
+    }
+
 def transcribe_audio(audio_file):
     recognizer = sr.Recognizer()
     with sr.AudioFile(audio_file) as source:
@@ -45,27 +76,46 @@ def transcribe_audio(audio_file):
     except sr.RequestError:
         return "Speech recognition service unavailable."
 
+# Common hesitation markers
+FILLER_WORDS = ["um", "uh", "like", "you know", "sort of", "kind of", "hmm"]
+# Weak (non-assertive) language
+WEAK_PHRASES = ["I think", "maybe", "probably", "kind of", "sort of"]
+phrase_matcher = PhraseMatcher({"filler": FILLER_WORDS, "weak": WEAK_PHRASES})
+
 def analyze_transcription(transcript):
-    # Count filler words (common hesitation markers)
-    filler_words = ["um", "uh", "like", "you know", "sort of", "kind of", "hmm"]
-    filler_count = sum(transcript.lower().split().count(word) for word in filler_words)
-    
-    # Sentence confidence check (checking assertive vs weak language)
-    weak_phrases = ["I think", "maybe", "probably", "kind of", "sort of"]
-    weak_count = sum(1 for phrase in weak_phrases if phrase in transcript.lower())
+    # Count filler words and weak phrases in a single pass over the tokens
+    summary = phrase_matcher.summarize(transcript)
     
     return {
-        "filler_count": filler_count,
-        "weak_phrases_count": weak_count,
-        "word_count": len(transcript.split())
+        "filler_count": summary["totals"]["filler"],
+        "weak_phrases_count": summary["totals"]["weak"],
+        "word_count": summary["word_count"]
     }
 
+def cached_features_and_transcript(audio_file):
+    # Results are keyed by file content, so re-runs on the same audio are free
+    cache = get_cache()
+    content = hash_file(audio_file)
+    features_key = cache.make_key(content, "audio_features", ANALYZER_VERSION,
+                                  {"max_in_memory_seconds": MAX_IN_MEMORY_SECONDS,
+                                   "sample_rate": ANALYSIS_SAMPLE_RATE})
+    audio_features = cache.get_or_compute(features_key, lambda: extract_audio_features(audio_file))
+    
+    transcript_key = cache.make_key(content, "transcript", ANALYZER_VERSION, {"backend": "google"})
+    transcript = cache.get(transcript_key)
+    if transcript is None:
+        transcript = transcribe_audio(audio_file)
+        # Don't cache service failures
+        if transcript != "Speech recognition service unavailable.":
+            cache.set(transcript_key, transcript)
+    
+    return audio_features, transcript
+
 def provide_feedback(audio_file):
-    # Extract audio-based features
-    audio_features = extract_audio_features(audio_file)
+    # Extract audio-based features and transcribe (cached by file content)
+    audio_features, transcript = cached_features_and_transcript(audio_file)
     
-    # Transcribe and analyze text confidence
-    transcript = transcribe_audio(audio_file)
+    # Analyze text confidence
     text_analysis = analyze_transcription(transcript)
     
     # Confidence assessment based on thresholds
@@ -96,14 +146,16 @@ def provide_feedback(audio_file):
         "feedback": feedback
     }
 
-# Example usage
-audio_file = "test_audio.wav"  # Change this to your actual file path
-result = provide_feedback(audio_file)
+if __name__ == "__main__":
+    # Example usage
+    audio_file = "test_audio.wav"  # Change this to your actual file path
+    result = provide_feedback(audio_file)
+
+    # Display results
+    print("\nTranscription:\n", result["transcript"])
+    print("\nAudio Analysis:", result["audio_features"])
+    print("\nText Analysis:", result["text_analysis"])
+    print("\nFeedback:")
+    for f in result["feedback"]:
+        print("-", f)
 
-# Display results
-print("\nTranscription:\n", result["transcript"])
-print("\nAudio Analysis:", result["audio_features"])
-print("\nText Analysis:", result["text_analysis"])
-print("\nFeedback:")
-for f in result["feedback"]:
-    print("-", f)
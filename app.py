@@ -1,41 +1,37 @@
 import streamlit as st
-import sounddevice as sd
 import numpy as np
-import scipy.io.wavfile as wavfile
-from voice_analysiser import VoiceRatingAnalyzer
+from audio_io import record
+from voice_analysiser import VoiceRatingAnalyzer, to_wav_bytes
 import time
 
-# Initialize the analyzer
-analyzer = VoiceRatingAnalyzer()
+@st.cache_resource
+def get_analyzer():
+    """One warmed-up analyzer shared by every session of this server"""
+    analyzer = VoiceRatingAnalyzer()
+    # Run a tiny analysis so librosa imports and numba JIT happen up front
+    t = np.arange(analyzer.sample_rate) / analyzer.sample_rate
+    analyzer.analyze_voice(audio=np.sin(2 * np.pi * 180 * t), save=False)
+    return analyzer
 
-# Initialize session state for recordings
-if 'recordings' not in st.session_state:
-    st.session_state.recordings = []
+# Initialize the analyzer
+analyzer = get_analyzer()
 
 st.title("Voice Recording and Analysis")
 
-def record_audio(duration=5, sample_rate=44100):
+def record_audio(duration=5, sample_rate=analyzer.sample_rate):
     """Record audio for a specified duration"""
-    recording = sd.rec(
-        int(duration * sample_rate),
-        samplerate=sample_rate,
-        channels=1,
-        dtype=np.float32
-    )
     st.info("Recording...")
-    sd.wait()  # Wait until the recording is finished
+    # Captured at the analysis rate when the device supports it
+    recording = record(duration, sample_rate)
     st.success("Recording finished!")
     return recording
 
 if st.button("Record (5 seconds)"):
-    # Record audio
+    # Record audio once, at the analyzer's sample rate
     audio_data = record_audio()
     
-    # Save the recording temporarily
-    wavfile.write("temp.wav", 44100, audio_data)
-    
-    # Analyze the voice
-    results = analyzer.analyze_voice()
+    # Analyze the captured audio in memory
+    results = analyzer.analyze_voice(audio=audio_data, save=False)
     
     # Display results
     st.subheader("Analysis Results")
@@ -46,8 +42,9 @@ if st.button("Record (5 seconds)"):
         st.write(f"{param.title()}: {score:.1f}/100")
     
     st.write("\nFeedback:")
-    for feedback in analyzer.get_feedback():
+    for feedback in analyzer.get_feedback(results['parameters']):
         st.write(f"- {feedback}")
     
-    # Play the recording
-    st.audio("temp.wav")
\ No newline at end of file
+    # Play the recording from memory
+    wav = to_wav_bytes(audio_data, analyzer.sample_rate)
+    st.audio(wav, format="audio/wav")
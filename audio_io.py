@@ -0,0 +1,196 @@
+import os
+from math import gcd
+from typing import Optional, Tuple
+
+import numpy as np
+
+from lazy_imports import lazy_import
+
+# Heavy dependencies load on first use
+sd = lazy_import('sounddevice')
+sf = lazy_import('soundfile')
+signal = lazy_import('scipy.signal')
+
+# Rate every analyzer works at; speech features need nothing above 8 kHz
+ANALYSIS_SAMPLE_RATE = int(os.environ.get('VOICE_ANALYSIS_SAMPLE_RATE', 16000))
+
+
+def resample(audio: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
+    """
+    Resample once, as cheaply as the installed libraries allow.
+
+    Uses soxr (installed with librosa) when available and falls back to a
+    polyphase FIR filter (scipy.signal.resample_poly); both are accurate
+    enough for speech features.
+
+    Args:
+        audio (np.ndarray): Audio data (samples along axis 0)
+        orig_sr (int): Current sampling rate
+        target_sr (int): Desired sampling rate
+
+    Returns:
+        np.ndarray: float32 audio at target_sr
+    """
+    audio = np.asarray(audio, dtype=np.float32)
+    if orig_sr == target_sr:
+        return audio
+    try:
+        import soxr
+    except ImportError:
+        divisor = gcd(int(orig_sr), int(target_sr))
+        up, down = int(target_sr) // divisor, int(orig_sr) // divisor
+        return signal.resample_poly(audio, up, down, axis=0).astype(np.float32)
+    return soxr.resample(audio, orig_sr, target_sr, quality='HQ').astype(np.float32, copy=False)
+
+
+class StreamResampler:
+    """
+    Chunk-by-chunk counterpart of resample() for mono audio read in blocks.
+
+    Filter state carries over between chunks, so the concatenated output
+    matches resampling the whole signal at once, with no edge artefacts at
+    chunk boundaries. Uses soxr's streaming resampler when available; the
+    polyphase fallback keeps enough input on both sides of each chunk to
+    cover the filter and trims the overlapping output.
+
+    Parameters:
+        orig_sr (int): Rate of the input chunks
+        target_sr (int): Rate of the output
+    """
+
+    def __init__(self, orig_sr: int, target_sr: int):
+        self.orig_sr = int(orig_sr)
+        self.target_sr = int(target_sr)
+        divisor = gcd(self.orig_sr, self.target_sr)
+        self._up, self._down = self.target_sr // divisor, self.orig_sr // divisor
+        # Input consumed but not yet resampled, preceded by `_context` samples of history
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._context = 0
+        # resample_poly's filter reaches 10 * max(up, down) samples at the upsampled rate
+        reach = -(-10 * max(self._up, self._down) // self._up)
+        self._margin = self._down * (-(-reach // self._down) + 1)
+        self._stream = None
+        if self.orig_sr != self.target_sr:
+            try:
+                import soxr
+            except ImportError:
+                pass
+            else:
+                self._stream = soxr.ResampleStream(self.orig_sr, self.target_sr, 1, dtype='float32', quality='HQ')
+
+    def process(self, chunk: np.ndarray, last: bool = False) -> np.ndarray:
+        """
+        Resample the next chunk.
+
+        Args:
+            chunk (np.ndarray): Next mono samples at orig_sr
+            last (bool): Whether this is the final chunk; flushes buffered output
+
+        Returns:
+            np.ndarray: float32 audio at target_sr (may lag the input until last)
+        """
+        chunk = np.asarray(chunk, dtype=np.float32)
+        if self.orig_sr == self.target_sr:
+            return chunk
+        if self._stream is not None:
+            return self._stream.resample_chunk(chunk, last=last)
+
+        buffer = np.concatenate((self._pending, chunk))
+        available = len(buffer) - self._context
+        # Emit whole input periods, holding back what the filter still needs to see
+        count = available if last else max(0, (available - self._margin) // self._down * self._down)
+        if count == 0 and not last:
+            self._pending = buffer
+            return np.zeros(0, dtype=np.float32)
+        end = len(buffer) if last else self._context + count + self._margin
+        out = signal.resample_poly(buffer[:end], self._up, self._down).astype(np.float32)
+        start = self._context * self._up // self._down
+        out = out[start:] if last else out[start:start + count * self._up // self._down]
+        keep = min(self._margin, self._context + count)
+        self._pending = buffer[self._context + count - keep:]
+        self._context = keep
+        return out
+
+
+def to_mono(audio: np.ndarray) -> np.ndarray:
+    """Average channels of a (samples, channels) array; 1-D input is returned as is."""
+    if audio.ndim == 1:
+        return audio
+    return audio.mean(axis=1) if audio.shape[1] > 1 else audio[:, 0]
+
+
+def load_audio(
+    audio_path: str,
+    sample_rate: Optional[int] = ANALYSIS_SAMPLE_RATE,
+    mono: bool = True
+) -> Tuple[np.ndarray, int]:
+    """
+    Decode an audio file and bring it to the analysis rate.
+
+    Files are decoded with soundfile; formats it cannot read fall back to
+    librosa's decoder at the native rate. Either way resampling is done
+    once, with resample().
+
+    Args:
+        audio_path (str): Path to the audio file
+        sample_rate (Optional[int]): Target rate (default: ANALYSIS_SAMPLE_RATE; None keeps the native rate)
+        mono (bool): Downmix to mono (default: True)
+
+    Returns:
+        Tuple[np.ndarray, int]: float32 audio and its sampling rate
+    """
+    try:
+        audio, native_sr = sf.read(audio_path, dtype='float32', always_2d=True)
+        if mono:
+            audio = to_mono(audio)
+    except RuntimeError:
+        import librosa
+        audio, native_sr = librosa.load(audio_path, sr=None, mono=mono)
+        if not mono:
+            audio = audio.T
+    if sample_rate is None:
+        return audio, native_sr
+    return resample(audio, native_sr, sample_rate), sample_rate
+
+
+def capture_rate(preferred: int = ANALYSIS_SAMPLE_RATE, device=None, channels: int = 1) -> int:
+    """
+    Pick the rate to open an input stream at.
+
+    Returns preferred if the input device accepts it, so captured audio needs
+    no resampling; otherwise the device's default rate.
+
+    Args:
+        preferred (int): Desired capture rate (default: ANALYSIS_SAMPLE_RATE)
+        device: sounddevice input device (default: the system default)
+        channels (int): Channels that will be opened
+
+    Returns:
+        int: Sampling rate to capture at
+    """
+    try:
+        sd.check_input_settings(device=device, channels=channels, samplerate=preferred)
+        return preferred
+    except Exception:
+        return int(sd.query_devices(device, 'input')['default_samplerate'])
+
+
+def record(duration: float, sample_rate: int = ANALYSIS_SAMPLE_RATE, device=None) -> np.ndarray:
+    """
+    Record mono audio and return it at sample_rate.
+
+    Captures at sample_rate directly when the device supports it and
+    resamples only when it does not.
+
+    Args:
+        duration (float): Recording duration in seconds
+        sample_rate (int): Rate of the returned audio (default: ANALYSIS_SAMPLE_RATE)
+        device: sounddevice input device (default: the system default)
+
+    Returns:
+        np.ndarray: float32 mono audio
+    """
+    rate = capture_rate(sample_rate, device)
+    audio = sd.rec(int(duration * rate), samplerate=rate, channels=1, dtype='float32', device=device)
+    sd.wait()
+    return resample(audio[:, 0], rate, sample_rate)
@@ -0,0 +1,262 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'v3'))
+
+AUDIO_EXTENSIONS = ('.wav', '.flac', '.ogg', '.mp3', '.m4a')
+ANALYZERS = ('v3', 'rater')
+
+# Per-process analyzer, built once by the pool initializer
+_analyzer = None
+_analyzer_name = None
+
+
+def _build_analyzer(analyzer_name: str):
+    if analyzer_name == 'v3':
+        from v3VoiceAnalyzer import VoiceAnalyzer
+        return VoiceAnalyzer()
+    if analyzer_name == 'rater':
+        from voice_rater import VoiceRatingAnalyzer
+        return VoiceRatingAnalyzer()
+    raise ValueError(f"Unknown analyzer: {analyzer_name}")
+
+
+def _warm_up():
+    """
+    Run one tiny analysis so librosa imports and numba JIT happen up front.
+
+    The synthetic tone bypasses v3's result cache, so worker starts do not
+    fill the user's cache with warm-up entries.
+    """
+    import soundfile as sf
+    from audio_io import ANALYSIS_SAMPLE_RATE
+
+    sample_rate = ANALYSIS_SAMPLE_RATE
+    t = np.arange(sample_rate) / sample_rate
+    tone = (0.3 * np.sin(2 * np.pi * 180 * t)).astype(np.float32)
+
+    fd, path = tempfile.mkstemp(suffix='.wav')
+    os.close(fd)
+    try:
+        sf.write(path, tone, sample_rate)
+        analyze_file(path, use_cache=False)
+    finally:
+        os.remove(path)
+
+
+def init_worker(analyzer_name: str):
+    """
+    Process pool initializer: build the analyzer once per worker and warm it up.
+
+    Shared by run_batch and analysis_service.
+
+    Args:
+        analyzer_name (str): One of ANALYZERS
+    """
+    global _analyzer, _analyzer_name
+    _analyzer_name = analyzer_name
+    _analyzer = _build_analyzer(analyzer_name)
+    _warm_up()
+
+
+def to_builtin(value):
+    """Convert numpy scalars/arrays to JSON-serialisable Python values."""
+    if isinstance(value, dict):
+        return {key: to_builtin(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_builtin(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def flatten(result: Dict, prefix: str = '') -> Dict:
+    """
+    Flatten a nested result dict into dotted column names.
+
+    Args:
+        result (Dict): Nested analysis result
+        prefix (str): Prefix for the generated keys
+
+    Returns:
+        Dict: Flat mapping of column name to value
+    """
+    flat = {}
+    for key, value in result.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, prefix=f"{name}."))
+        else:
+            flat[name] = value
+    return flat
+
+
+def analyze_file(audio_path: str, use_cache: bool = True) -> Dict:
+    """
+    Analyze one file with the worker's analyzer.
+
+    Args:
+        audio_path (str): Path to the audio file
+        use_cache (bool): Let the v3 analyzer use its result cache (default: True)
+
+    Returns:
+        Dict: Record with file, status and either result or error
+    """
+    try:
+        if _analyzer_name == 'v3':
+            result = _analyzer.analyze_voice(audio_path, use_cache=use_cache)
+        else:
+            from audio_io import load_audio
+            audio, _ = load_audio(audio_path, _analyzer.sample_rate)
+            result = _analyzer.analyze_voice(audio=audio)
+            result = {
+                'parameters': dict(result['parameters']),
+                'overall_score': result['overall_score']
+            }
+        return {'file': audio_path, 'status': 'ok', 'result': to_builtin(result)}
+    except Exception as e:
+        return {'file': audio_path, 'status': 'error', 'error': str(e)}
+
+
+def collect_files(source: str) -> List[str]:
+    """
+    Collect audio files from a directory (recursively) or a manifest.
+
+    A manifest is a text file with one audio path per line; relative paths
+    are resolved against the manifest's directory and lines starting with
+    '#' are ignored.
+
+    Args:
+        source (str): Directory or manifest path
+
+    Returns:
+        List[str]: Sorted list of audio file paths
+    """
+    if os.path.isdir(source):
+        files = []
+        for root, _, names in os.walk(source):
+            for name in names:
+                if name.lower().endswith(AUDIO_EXTENSIONS):
+                    files.append(os.path.join(root, name))
+        return sorted(files)
+
+    base_dir = os.path.dirname(os.path.abspath(source))
+    files = []
+    with open(source) as manifest:
+        for line in manifest:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            files.append(line if os.path.isabs(line) else os.path.join(base_dir, line))
+    return files
+
+
+class ResultWriter:
+    """
+    Stream analysis records to a JSONL or CSV file as they arrive.
+
+    The format is chosen from the output extension (.csv for CSV, anything
+    else for JSONL). CSV columns are taken from the first successful record.
+    """
+
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        self.is_csv = output_path.lower().endswith('.csv')
+        self._file = open(output_path, 'w', newline='')
+        self._csv_writer = None
+        self._pending: List[Dict] = []
+
+    def write(self, record: Dict):
+        if not self.is_csv:
+            self._file.write(json.dumps(record) + '\n')
+            self._file.flush()
+            return
+
+        row = {'file': record['file'], 'status': record['status'], 'error': record.get('error', '')}
+        row.update(flatten(record.get('result', {})))
+
+        if self._csv_writer is None:
+            if record['status'] != 'ok':
+                # Hold failures back until we know the full column set
+                self._pending.append(row)
+                return
+            self._csv_writer = csv.DictWriter(self._file, fieldnames=list(row), extrasaction='ignore')
+            self._csv_writer.writeheader()
+            for pending in self._pending:
+                self._csv_writer.writerow(pending)
+            self._pending = []
+
+        self._csv_writer.writerow(row)
+        self._file.flush()
+
+    def close(self):
+        if self._pending:
+            writer = csv.DictWriter(self._file, fieldnames=['file', 'status', 'error'], extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(self._pending)
+        self._file.close()
+
+
+def run_batch(
+    files: Iterable[str],
+    output_path: str,
+    analyzer_name: str = 'v3',
+    workers: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    Analyze files on a pool of pre-warmed worker processes.
+
+    Args:
+        files (Iterable[str]): Audio files to analyze
+        output_path (str): JSONL or CSV output path
+        analyzer_name (str): 'v3' (v3 VoiceAnalyzer) or 'rater' (VoiceRatingAnalyzer)
+        workers (Optional[int]): Number of worker processes (default: CPU count)
+
+    Returns:
+        Dict[str, int]: Count of successful and failed files
+    """
+    counts = {'ok': 0, 'error': 0}
+    writer = ResultWriter(output_path)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_worker,
+            initargs=(analyzer_name,)
+        ) as executor:
+            futures = [executor.submit(analyze_file, path) for path in files]
+            for future in as_completed(futures):
+                record = future.result()
+                counts[record['status']] += 1
+                writer.write(record)
+                print(f"[{record['status']}] {record['file']}")
+    finally:
+        writer.close()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch voice analysis over a directory or manifest")
+    parser.add_argument('source', help="Directory of recordings or a manifest file")
+    parser.add_argument('-o', '--output', default='results.jsonl', help="Output file (.jsonl or .csv)")
+    parser.add_argument('-a', '--analyzer', choices=ANALYZERS, default='v3')
+    parser.add_argument('-w', '--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    files = collect_files(args.source)
+    print(f"Analyzing {len(files)} files with the '{args.analyzer}' analyzer...")
+    counts = run_batch(files, args.output, analyzer_name=args.analyzer, workers=args.workers)
+    print(f"Done: {counts['ok']} ok, {counts['error']} failed. Results in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
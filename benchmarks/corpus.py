@@ -0,0 +1,116 @@
+"""
+Deterministic synthetic speech-like corpus for the benchmarks.
+
+Signals are built from "syllables": short harmonic tones whose pitch follows
+a falling phrase contour with random jitter, separated within a phrase by
+brief gaps and between phrases by longer pauses, over a low noise floor.
+The same (duration, sample_rate, seed) always gives the same samples, so
+timings from different runs are comparable.
+
+Write a corpus from the repository root:
+
+    python benchmarks/corpus.py --durations 5 60 600 3600 --out /tmp/voice_corpus
+"""
+import argparse
+import os
+import tempfile
+from typing import Iterator, List
+
+import numpy as np
+
+DEFAULT_CORPUS_DIR = os.path.join(tempfile.gettempdir(), 'voice_benchmark_corpus')
+CORPUS_VERSION = 1
+
+
+def iter_speech_like(duration, sample_rate=22050, seed=0) -> Iterator[np.ndarray]:
+    """Yield consecutive float32 segments totalling exactly duration seconds."""
+    rng = np.random.default_rng(seed)
+    total = int(duration * sample_rate)
+    harmonics = np.arange(1, 9)[:, None]
+    # Roll-off with a mild formant-like bump around the 3rd-4th harmonic
+    amplitudes = (1.0 / harmonics[:, 0]) * (1 + 0.8 * np.exp(-0.5 * (harmonics[:, 0] - 3.5) ** 2))
+    amplitudes = (amplitudes / amplitudes.sum() * 0.6)[:, None]
+    base_f0 = rng.uniform(100, 220)
+    phase = 0.0
+    produced = 0
+
+    while produced < total:
+        # One phrase: a run of syllables on a falling contour, then a pause
+        n_syllables = int(rng.integers(3, 13))
+        start_f0 = base_f0 * rng.uniform(1.05, 1.25)
+        end_f0 = base_f0 * rng.uniform(0.8, 0.95)
+        for i in range(n_syllables):
+            length = int(rng.uniform(0.12, 0.3) * sample_rate)
+            contour = start_f0 + (end_f0 - start_f0) * (i + np.linspace(0, 1, length)) / n_syllables
+            jitter = np.interp(np.arange(length), np.linspace(0, length, 8), rng.normal(0, 0.015, 8))
+            f0 = contour * (1 + jitter) * rng.uniform(0.95, 1.05)
+            phases = phase + 2 * np.pi * np.cumsum(f0) / sample_rate
+            phase = float(phases[-1] % (2 * np.pi))
+
+            envelope = np.sin(np.pi * np.linspace(0, 1, length)) ** 0.5 * rng.uniform(0.4, 1.0)
+            voice = (amplitudes * np.sin(harmonics * phases)).sum(axis=0) * envelope
+            gap = np.zeros(int(rng.uniform(0.02, 0.08) * sample_rate))
+            for segment in (voice, gap):
+                yield _with_noise(segment, rng, total - produced)
+                produced += min(len(segment), total - produced)
+                if produced >= total:
+                    return
+
+        pause = np.zeros(int(rng.uniform(0.25, 1.2) * sample_rate))
+        yield _with_noise(pause, rng, total - produced)
+        produced += min(len(pause), total - produced)
+
+
+def _with_noise(segment, rng, remaining):
+    segment = segment[:remaining]
+    return (segment + 0.003 * rng.standard_normal(len(segment))).astype(np.float32)
+
+
+def speech_like_signal(duration, sample_rate=22050, seed=0) -> np.ndarray:
+    """Return duration seconds of the synthetic speech-like signal."""
+    segments = list(iter_speech_like(duration, sample_rate, seed))
+    return np.concatenate(segments) if segments else np.zeros(0, dtype=np.float32)
+
+
+def corpus_path(directory, duration, sample_rate=22050, seed=0) -> str:
+    return os.path.join(directory, f"speech_v{CORPUS_VERSION}_{duration:g}s_{sample_rate}hz_seed{seed}.wav")
+
+
+def write_speech_like(path, duration, sample_rate=22050, seed=0) -> str:
+    """Stream the signal to a WAV file without holding it all in memory."""
+    import soundfile as sf
+
+    tmp_path = path + '.part'
+    with sf.SoundFile(tmp_path, 'w', samplerate=sample_rate, channels=1, subtype='PCM_16', format='WAV') as f:
+        for segment in iter_speech_like(duration, sample_rate, seed):
+            f.write(segment)
+    os.replace(tmp_path, path)
+    return path
+
+
+def ensure_corpus(durations, directory=DEFAULT_CORPUS_DIR, sample_rate=22050, seed=0) -> List[str]:
+    """Return corpus file paths, generating any that do not exist yet."""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for duration in durations:
+        path = corpus_path(directory, duration, sample_rate, seed)
+        if not os.path.exists(path):
+            write_speech_like(path, duration, sample_rate, seed)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--durations', type=float, nargs='+', default=[5, 60, 600, 3600])
+    parser.add_argument('--sample-rate', type=int, default=22050)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default=DEFAULT_CORPUS_DIR)
+    args = parser.parse_args()
+
+    for path in ensure_corpus(args.durations, args.out, args.sample_rate, args.seed):
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Latency and peak-memory comparison of librosa.piptrack pooling vs. pitch_tracker.
+
+Run from the repository root:
+
+    python benchmarks/pitch_benchmark.py [--durations 10 60 600]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import librosa
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from corpus import speech_like_signal
+from pitch_tracker import track_pitch
+
+
+def piptrack_pooling(y, sample_rate):
+    pitches, magnitudes = librosa.piptrack(y=y, sr=sample_rate)
+    return pitches[pitches > 0]
+
+
+def fast_tracker(y, sample_rate):
+    f0, voiced = track_pitch(y, sample_rate)
+    return f0[voiced]
+
+
+def measure(fn, y, sample_rate):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn(y, sample_rate)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--durations', type=float, nargs='+', default=[10, 60, 600])
+    parser.add_argument('--sample-rate', type=int, default=22050)
+    args = parser.parse_args()
+
+    # Warm up both paths so one-off imports and JIT compilation are not timed
+    warm = speech_like_signal(1, args.sample_rate)
+    piptrack_pooling(warm, args.sample_rate)
+    fast_tracker(warm, args.sample_rate)
+
+    print(f"{'duration':>10} {'method':>12} {'time (s)':>10} {'peak MB':>10}")
+    for duration in args.durations:
+        y = speech_like_signal(duration, args.sample_rate)
+        for name, fn in (('piptrack', piptrack_pooling), ('yin', fast_tracker)):
+            elapsed, peak = measure(fn, y, args.sample_rate)
+            print(f"{duration:>9.0f}s {name:>12} {elapsed:>10.3f} {peak:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
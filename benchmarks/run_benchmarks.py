@@ -0,0 +1,295 @@
+"""
+Speed and memory benchmarks for the voice analyzers.
+
+Every (case, size) pair runs in a fresh process on the synthetic corpus
+(benchmarks/corpus.py): one warm-up on a short input, best-of-N timed runs,
+then a separate tracemalloc run for peak memory. Results can be saved as a
+baseline and later runs compared against it.
+
+Run from the repository root:
+
+    python benchmarks/run_benchmarks.py --save benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --compare benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --cases v3 analyzer_new --durations 5 60 600 3600
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCHMARK_DIR)
+for path in (BENCHMARK_DIR, ROOT_DIR, os.path.join(ROOT_DIR, 'v3'), os.path.join(ROOT_DIR, 'embedding')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from corpus import DEFAULT_CORPUS_DIR, ensure_corpus, speech_like_signal
+
+CASES = ('pitch_tracker', 'voice_rater', 'v3', 'analyzer_new', 'bert')
+AUDIO_UNIT = 'audio-s'
+WARMUP_SECONDS = 1
+
+
+class Case:
+    """A benchmark case: setup() once per process, then run(input) is timed."""
+
+    unit = AUDIO_UNIT
+
+    def __init__(self, sample_rate):
+        self.sample_rate = sample_rate
+
+    def setup(self):
+        pass
+
+    def prepare(self, size, corpus_dir):
+        """Build the input for one run outside of the timed region."""
+        return ensure_corpus([size], corpus_dir, self.sample_rate)[0]
+
+    def run(self, data):
+        raise NotImplementedError
+
+
+class PitchTrackerCase(Case):
+    def setup(self):
+        from pitch_benchmark import fast_tracker
+        self.tracker = fast_tracker
+
+    def prepare(self, size, corpus_dir):
+        return speech_like_signal(size, self.sample_rate)
+
+    def run(self, data):
+        self.tracker(data, self.sample_rate)
+
+
+class VoiceRaterCase(Case):
+    def setup(self):
+        from voice_rater import VoiceRatingAnalyzer
+        self.analyzer = VoiceRatingAnalyzer(sample_rate=self.sample_rate)
+
+    def prepare(self, size, corpus_dir):
+        return speech_like_signal(size, self.sample_rate)
+
+    def run(self, data):
+        self.analyzer.analyze_voice(audio=data)
+
+
+class V3Case(Case):
+    def setup(self):
+        from recognizers import LocalRecognizer
+        from v3VoiceAnalyzer import VoiceAnalyzer
+        self.analyzer = VoiceAnalyzer(cache=False, recognizer=LocalRecognizer('benchmark'))
+
+    def run(self, data):
+        self.analyzer.analyze_voice(data)
+
+
+class AnalyzerNewCase(Case):
+    def setup(self):
+        from analyzer_new import extract_audio_features
+        self.extract = extract_audio_features
+
+    def run(self, data):
+        self.extract(data)
+
+
+class BertCase(Case):
+    """Scores `size` candidate answers against a fixed set of references."""
+
+    unit = 'answers'
+    WORDS = ('react', 'state', 'component', 'virtual', 'dom', 'render', 'props', 'hook', 'library',
+             'javascript', 'user', 'interface', 'update', 'efficient', 'declarative', 'facebook')
+
+    def setup(self):
+        from bert import compare_answers
+        self.compare = compare_answers
+
+    def prepare(self, size, corpus_dir):
+        import numpy as np
+        rng = np.random.default_rng(0)
+        sentence = lambda: ' '.join(rng.choice(self.WORDS, size=int(rng.integers(8, 30))))
+        references = [sentence() for _ in range(8)]
+        return [(sentence(), references[i % len(references)]) for i in range(int(size))]
+
+    def run(self, data):
+        for candidate, reference in data:
+            self.compare(candidate, reference)
+
+
+CASE_CLASSES = {
+    'pitch_tracker': PitchTrackerCase,
+    'voice_rater': VoiceRaterCase,
+    'v3': V3Case,
+    'analyzer_new': AnalyzerNewCase,
+    'bert': BertCase
+}
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1e6 if sys.platform == 'darwin' else 1e3)
+
+
+def run_case(name, size, sample_rate, corpus_dir, repeats, memory):
+    """Run one (case, size) pair; executed in a fresh worker process."""
+    record = {'case': name, 'size': size}
+    try:
+        case = CASE_CLASSES[name](sample_rate)
+        record['unit'] = case.unit
+        case.setup()
+        case.run(case.prepare(WARMUP_SECONDS if case.unit == AUDIO_UNIT else 1, corpus_dir))
+        data = case.prepare(size, corpus_dir)
+
+        best_wall = best_cpu = float('inf')
+        for _ in range(repeats):
+            wall, cpu = time.perf_counter(), time.process_time()
+            case.run(data)
+            best_wall = min(best_wall, time.perf_counter() - wall)
+            best_cpu = min(best_cpu, time.process_time() - cpu)
+
+        record.update(
+            status='ok',
+            wall_s=best_wall,
+            cpu_s=best_cpu,
+            throughput=size / best_cpu if best_cpu > 0 else None,
+            realtime_factor=size / best_wall if case.unit == AUDIO_UNIT and best_wall > 0 else None
+        )
+        if memory:
+            tracemalloc.start()
+            case.run(data)
+            record['peak_traced_mb'] = tracemalloc.get_traced_memory()[1] / 1e6
+            tracemalloc.stop()
+        record['peak_rss_mb'] = _peak_rss_mb()
+    except ImportError as e:
+        record.update(status='skipped', error=str(e))
+    except Exception as e:
+        record.update(status='error', error=f"{type(e).__name__}: {e}")
+    return record
+
+
+def environment():
+    import numpy as np
+    info = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__
+    }
+    try:
+        import librosa
+        info['librosa'] = librosa.__version__
+    except ImportError:
+        pass
+    return info
+
+
+def run_suite(cases, durations, answer_counts, sample_rate=22050, corpus_dir=DEFAULT_CORPUS_DIR,
+              repeats=3, memory=True):
+    """
+    Run every requested case on every size, each in its own process.
+
+    Returns:
+        dict: {'environment': ..., 'created': ..., 'results': [record, ...]}
+    """
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for name in cases:
+        sizes = answer_counts if CASE_CLASSES[name].unit != AUDIO_UNIT else durations
+        for size in sizes:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                record = executor.submit(run_case, name, size, sample_rate, corpus_dir, repeats, memory).result()
+            results.append(record)
+            print(format_record(record), flush=True)
+    return {'environment': environment(), 'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'results': results}
+
+
+def _fmt(value, spec):
+    return format(value, spec) if isinstance(value, (int, float)) else '-'
+
+
+def format_record(record):
+    label = f"{record['case']:>14} {record['size']:>8g} {record.get('unit', ''):>8}"
+    if record['status'] != 'ok':
+        return f"{label}  {record['status']}: {record.get('error', '')}"
+    return (f"{label}  wall {_fmt(record['wall_s'], '9.3f')} s  cpu {_fmt(record['cpu_s'], '9.3f')} s"
+            f"  {_fmt(record['throughput'], '9.1f')} {record['unit']}/cpu-s"
+            f"  traced {_fmt(record.get('peak_traced_mb'), '8.1f')} MB  rss {_fmt(record.get('peak_rss_mb'), '8.1f')} MB")
+
+
+def compare(current, baseline, tolerance=0.15, memory_tolerance=0.25):
+    """
+    Compare a run against a baseline and list regressions.
+
+    A regression is a case whose CPU time or wall time grew by more than
+    tolerance, or whose traced peak memory grew by more than memory_tolerance,
+    relative to the baseline entry with the same case and size.
+
+    Returns:
+        list: (case, size, metric, baseline value, current value, ratio) tuples
+    """
+    previous = {(r['case'], r['size']): r for r in baseline['results'] if r['status'] == 'ok'}
+    regressions = []
+    for record in current['results']:
+        old = previous.get((record['case'], record['size']))
+        if record['status'] != 'ok' or old is None:
+            continue
+        for metric, allowed in (('cpu_s', tolerance), ('wall_s', tolerance), ('peak_traced_mb', memory_tolerance)):
+            before, after = old.get(metric), record.get(metric)
+            if not before or after is None:
+                continue
+            ratio = after / before
+            flag = 'REGRESSION' if ratio > 1 + allowed else ('improved' if ratio < 1 - allowed else '')
+            print(f"{record['case']:>14} {record['size']:>8g} {metric:>15} "
+                  f"{before:>10.3f} -> {after:>10.3f}  x{ratio:5.2f} {flag}")
+            if flag == 'REGRESSION':
+                regressions.append((record['case'], record['size'], metric, before, after, ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--cases', nargs='+', choices=CASES, default=list(CASES))
+    parser.add_argument('--durations', type=float, nargs='+', default=[5, 60, 600],
+                        help="Audio lengths in seconds (add 3600 for the 1 h run)")
+    parser.add_argument('--answers', type=int, nargs='+', default=[16, 256],
+                        help="Answer counts for the bert case")
+    parser.add_argument('--sample-rate', type=int, default=22050)
+    parser.add_argument('--corpus-dir', default=DEFAULT_CORPUS_DIR)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--no-memory', action='store_true', help="Skip the tracemalloc pass")
+    parser.add_argument('--save', help="Write results to this JSON file")
+    parser.add_argument('--compare', help="Baseline JSON to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.15, help="Allowed relative slowdown")
+    parser.add_argument('--memory-tolerance', type=float, default=0.25, help="Allowed relative memory growth")
+    args = parser.parse_args()
+
+    report = run_suite(args.cases, args.durations, args.answers, args.sample_rate, args.corpus_dir,
+                       args.repeats, memory=not args.no_memory)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved results to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\nComparison with {args.compare} (created {baseline.get('created', '?')}):")
+        regressions = compare(report, baseline, args.tolerance, args.memory_tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s) found")
+            sys.exit(1)
+        print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from audio_io import ANALYSIS_SAMPLE_RATE, StreamResampler, to_mono
+from lazy_imports import lazy_import
+from pitch_tracker import frame_signal, track_pitch
+from running_stats import RunningStats
+from vad import FrameLevels, VoiceActivityDetector
+
+librosa = lazy_import('librosa')
+sf = lazy_import('soundfile')
+
+
+def audio_duration(audio_path: str) -> Optional[float]:
+    """
+    Return a file's duration in seconds from its header, without decoding it.
+
+    Args:
+        audio_path (str): Path to the audio file
+
+    Returns:
+        Optional[float]: Duration, or None if soundfile cannot read the format
+    """
+    try:
+        return sf.info(audio_path).duration
+    except RuntimeError:
+        return None
+
+
+def block_frames(block: np.ndarray, new_samples: int, frame_length: int, hop_length: int) -> np.ndarray:
+    """
+    Frames starting in a block's new samples, on the grid shared by consecutive blocks.
+
+    Args:
+        block (np.ndarray): Mono block including the overlap with the next block
+        new_samples (int): The block's advance (see BlockFeatureAccumulator.update)
+        frame_length (int): Frame size in samples
+        hop_length (int): Hop between frames in samples
+
+    Returns:
+        np.ndarray: Frames, one per row
+    """
+    if len(block) < frame_length:
+        block = np.pad(block, (0, frame_length - len(block)))
+    n_frames = max(1, -(-new_samples // hop_length))
+    return frame_signal(block, frame_length, hop_length, center=False)[:n_frames]
+
+
+def frames_rms(frames: np.ndarray) -> np.ndarray:
+    """RMS of each frame (row)."""
+    return np.sqrt(np.mean(frames.astype(np.float64) ** 2, axis=1))
+
+
+class BlockFeatureAccumulator:
+    """
+    Aggregates frame-level features over consecutive audio blocks.
+
+    Blocks must overlap by frame_length - hop_length samples and advance by a
+    whole number of hops, so the frames of consecutive blocks tile one
+    continuous frame grid without gaps or duplicates. Only running statistics
+    and a fixed-size amplitude histogram are kept between blocks. Each block's
+    frames are classified as speech or pause by a VoiceActivityDetector
+    against the noise floor and speech level of the whole recording, since a
+    block holding only noise has no speech level of its own; pitch is
+    tracked on the speech frames only.
+
+    Parameters:
+        sample_rate (int): Sampling rate of the blocks
+        levels (Tuple[float, float]): Noise floor and speech level of the whole
+            recording in dB (FrameLevels.levels())
+        frame_length (int): Analysis frame size in samples (default: 2048)
+        hop_length (int): Hop between frames in samples (default: 512)
+        histogram_bins (int): Resolution of the |amplitude| histogram (default: 4096)
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        levels: Tuple[float, float],
+        frame_length: int = 2048,
+        hop_length: int = 512,
+        histogram_bins: int = 4096
+    ):
+        self.sample_rate = sample_rate
+        self.levels = levels
+        self.frame_length = frame_length
+        self.hop_length = hop_length
+        self.pitch = RunningStats()
+        self.rms = RunningStats()
+        self.zcr = RunningStats()
+        self.vad = VoiceActivityDetector(sample_rate, frame_length, hop_length)
+        self.voiced_frames = 0
+        self.speech_frames = 0
+        self.total_frames = 0
+        self._first_speech = None
+        self._last_speech = None
+        self.samples = 0
+        self._tempo_sum = 0.0
+        self._tempo_weight = 0.0
+        self._histogram_edges = np.linspace(0.0, 1.0, histogram_bins + 1)
+        self._histogram = np.zeros(histogram_bins, dtype=np.int64)
+
+    def update(self, block: np.ndarray, new_samples: int):
+        """
+        Fold one block into the aggregates.
+
+        Args:
+            block (np.ndarray): Mono block including the overlap with the previous block
+            new_samples (int): Number of samples at the start of the block not
+                covered by the next block (the block's advance)
+        """
+        if len(block) < self.frame_length:
+            block = np.pad(block, (0, self.frame_length - len(block)))
+        frames = block_frames(block, new_samples, self.frame_length, self.hop_length)
+        n_frames = len(frames)
+        rms = frames_rms(frames)
+        crossings = np.abs(np.diff(np.signbit(frames).astype(np.int8), axis=1))
+        zcr = crossings.sum(axis=1) / self.frame_length
+        self.rms.update(rms)
+        self.zcr.update(zcr)
+
+        speech = self.vad.detect(rms=rms, levels=self.levels).voiced
+        speech_index = np.flatnonzero(speech) + self.total_frames
+        if len(speech_index):
+            if self._first_speech is None:
+                self._first_speech = int(speech_index[0])
+            self._last_speech = int(speech_index[-1])
+        self.speech_frames += len(speech_index)
+
+        f0, voiced = track_pitch(block, self.sample_rate, hop_length=self.hop_length, center=False,
+                                 frame_mask=speech)
+        f0, voiced = f0[:n_frames], voiced[:n_frames]
+        self.pitch.update(f0[voiced])
+        self.voiced_frames += int(voiced.sum())
+        self.total_frames += len(frames)
+
+        segment = block[:new_samples]
+        self.samples += len(segment)
+        self._histogram += np.histogram(np.clip(np.abs(segment), 0, 1), bins=self._histogram_edges)[0]
+
+        # Tempo per block, weighted by the block's duration
+        if len(block) > self.frame_length * 2:
+            onset_env = librosa.onset.onset_strength(y=block, sr=self.sample_rate, hop_length=self.hop_length)
+            tempo = librosa.feature.tempo(onset_envelope=onset_env, sr=self.sample_rate,
+                                          hop_length=self.hop_length)[0]
+            self._tempo_sum += tempo * len(segment)
+            self._tempo_weight += len(segment)
+
+    def amplitude_percentile(self, q: float) -> float:
+        """Approximate percentile of |amplitude| from the histogram."""
+        if self.samples == 0:
+            return 0.0
+        cumulative = np.cumsum(self._histogram)
+        index = np.searchsorted(cumulative, q / 100 * self.samples)
+        return float(self._histogram_edges[min(index + 1, len(self._histogram))])
+
+    def fraction_below(self, amplitude: float) -> float:
+        """Approximate fraction of samples with |amplitude| below a level."""
+        if self.samples == 0:
+            return 0.0
+        index = np.searchsorted(self._histogram_edges, amplitude) - 1
+        return float(self._histogram[:max(index, 0)].sum() / self.samples)
+
+    def result(self) -> Dict[str, float]:
+        """
+        Return the aggregated features.
+
+        Returns:
+            Dict[str, float]: Whole-recording feature summary
+        """
+        silence_threshold = self.amplitude_percentile(10)
+        # Pauses are the non-speech frames between the first and last speech frame
+        if self._first_speech is None:
+            pause_ratio = 0.0
+        else:
+            span = self._last_speech - self._first_speech + 1
+            pause_ratio = 1.0 - self.speech_frames / span
+        return {
+            'duration': self.samples / self.sample_rate,
+            'sample_rate': self.sample_rate,
+            'pitch_mean': self.pitch.mean if self.pitch.count else 0.0,
+            'pitch_std': self.pitch.std,
+            'voiced_ratio': self.voiced_frames / self.total_frames if self.total_frames else 0.0,
+            'speech_ratio': self.speech_frames / self.total_frames if self.total_frames else 0.0,
+            'rms_mean': self.rms.mean,
+            'rms_std': self.rms.std,
+            'zcr_mean': self.zcr.mean,
+            'zcr_std': self.zcr.std,
+            'tempo': self._tempo_sum / self._tempo_weight if self._tempo_weight else 0.0,
+            'silence_threshold': silence_threshold,
+            'pause_ratio': pause_ratio
+        }
+
+
+def iter_blocks(
+    audio_path: str,
+    sample_rate: int,
+    advance: int,
+    overlap: int
+) -> Iterator[Tuple[np.ndarray, int]]:
+    """
+    Stream a file as overlapping mono blocks at sample_rate.
+
+    The file is decoded in chunks at its native rate, downmixed and passed
+    through one StreamResampler, so the blocks are exactly what load_audio()
+    would return for the whole file, cut into pieces.
+
+    Args:
+        audio_path (str): Path to the audio file
+        sample_rate (int): Rate of the yielded blocks
+        advance (int): Samples between the starts of consecutive blocks
+        overlap (int): Samples each block shares with the next
+
+    Yields:
+        Tuple[np.ndarray, int]: float32 block and its number of new samples
+            (advance, or the whole block for the final one)
+    """
+    native_sr = sf.info(audio_path).samplerate
+    resampler = StreamResampler(native_sr, sample_rate)
+    read_size = max(1, advance * native_sr // sample_rate)
+    pending = np.zeros(0, dtype=np.float32)
+    chunks = sf.blocks(audio_path, blocksize=read_size, dtype='float32', always_2d=True)
+    chunk = next(chunks, None)
+    while chunk is not None:
+        following = next(chunks, None)
+        resampled = resampler.process(to_mono(chunk), last=following is None)
+        pending = np.concatenate((pending, resampled))
+        while len(pending) >= advance + overlap:
+            yield pending[:advance + overlap], advance
+            pending = pending[advance:]
+        chunk = following
+    # The final block is not followed by another, so all of it is new
+    if len(pending):
+        yield pending, len(pending)
+
+
+def analyze_file_in_blocks(
+    audio_path: str,
+    block_seconds: float = 30.0,
+    frame_length: int = 2048,
+    hop_length: int = 512,
+    sample_rate: int = ANALYSIS_SAMPLE_RATE
+) -> Dict[str, float]:
+    """
+    Compute whole-file voice features while holding only one block in memory.
+
+    Blocks are resampled to sample_rate on the way in, so the features use
+    the same rate and frame grid as the in-memory analyzers. The file is
+    read twice: a first, cheap pass measures the frame level distribution
+    the speech/pause thresholds are derived from, the second extracts the
+    features.
+
+    Args:
+        audio_path (str): Path to the audio file
+        block_seconds (float): Approximate block length (default: 30 s)
+        frame_length (int): Analysis frame size in samples (default: 2048)
+        hop_length (int): Hop between frames in samples (default: 512)
+        sample_rate (int): Analysis rate (default: ANALYSIS_SAMPLE_RATE)
+
+    Returns:
+        Dict[str, float]: Whole-recording feature summary
+    """
+    hops_per_block = max(1, int(block_seconds * sample_rate / hop_length))
+    advance = hops_per_block * hop_length
+    overlap = frame_length - hop_length
+
+    levels = FrameLevels()
+    for block, new_samples in iter_blocks(audio_path, sample_rate, advance, overlap):
+        levels.update(frames_rms(block_frames(block, new_samples, frame_length, hop_length)))
+
+    accumulator = BlockFeatureAccumulator(sample_rate, levels.levels(), frame_length, hop_length)
+    for block, new_samples in iter_blocks(audio_path, sample_rate, advance, overlap):
+        accumulator.update(block, new_samples)
+    return accumulator.result()
@@ -1,24 +1,98 @@
-from sentence_transformers import SentenceTransformer, util
+import hashlib
+import os
 
-# Load the pre-trained SBERT model
-model = SentenceTransformer('paraphrase-MiniLM-L6-v2')
+import numpy as np
 
-def compare_answers(candidate_answer, expected_answer):
-    # Convert answers into embeddings
-    candidate_embedding = model.encode(candidate_answer, convert_to_tensor=True)
-    expected_embedding = model.encode(expected_answer, convert_to_tensor=True)
+MODEL_NAME = 'paraphrase-MiniLM-L6-v2'
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'voice_assistant', 'embeddings')
+
+_models = {}
+
+def get_model(model_name=MODEL_NAME):
+    # Load the pre-trained SBERT model on first use, not at import
+    if model_name not in _models:
+        from sentence_transformers import SentenceTransformer
+        _models[model_name] = SentenceTransformer(model_name)
+    return _models[model_name]
+
+
+class AnswerScorer:
+    """Scores candidate answers against reference answers by cosine similarity
+
+    Reference embeddings are cached in memory and on disk, keyed by the
+    model name and a hash of the text, so a fixed question bank is encoded
+    once. Candidates are encoded in batches and every candidate x reference
+    similarity comes from a single product of L2-normalized matrices.
+    """
+    def __init__(self, model=None, model_name=MODEL_NAME, cache_dir=CACHE_DIR, batch_size=64):
+        self._model = model
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.cache_dir = os.path.join(cache_dir, model_name.replace('/', '_')) if cache_dir else None
+        self._references = {}
+
+    @property
+    def model(self):
+        if self._model is None:
+            self._model = get_model(self.model_name)
+        return self._model
+
+    def _key(self, text):
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode()).hexdigest()
 
-    # Compute cosine similarity
-    similarity_score = util.pytorch_cos_sim(candidate_embedding, expected_embedding).item()
-    
-    # Scale similarity score to percentage
-    percentage_score = round(similarity_score * 100, 2)
+    def encode(self, texts):
+        """Batch-encode texts into L2-normalized embeddings (one row per text)"""
+        return self.model.encode(
+            list(texts),
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
 
-    return percentage_score
+    def reference_embeddings(self, references):
+        """Embeddings for reference answers, encoding only the uncached ones"""
+        keys = [self._key(text) for text in references]
+        missing = {}
+        for key, text in zip(keys, references):
+            if key in self._references or key in missing:
+                continue
+            path = os.path.join(self.cache_dir, key + '.npy') if self.cache_dir else None
+            if path and os.path.exists(path):
+                self._references[key] = np.load(path)
+            else:
+                missing[key] = text
+
+        if missing:
+            embeddings = self.encode(missing.values())
+            if self.cache_dir:
+                os.makedirs(self.cache_dir, exist_ok=True)
+            for key, embedding in zip(missing, embeddings):
+                self._references[key] = embedding
+                if self.cache_dir:
+                    np.save(os.path.join(self.cache_dir, key + '.npy'), embedding)
+
+        return np.stack([self._references[key] for key in keys])
+
+    def score_matrix(self, candidates, references):
+        """Similarity percentages, shape (len(candidates), len(references))"""
+        candidate_embeddings = self.encode(candidates)
+        reference_embeddings = self.reference_embeddings(references)
+        return np.round(candidate_embeddings @ reference_embeddings.T * 100, 2)
+
+    def score(self, candidate, reference):
+        return float(self.score_matrix([candidate], [reference])[0, 0])
+
+
+scorer = AnswerScorer()
+
+def compare_answers(candidate_answer, expected_answer):
+    # Cosine similarity scaled to a percentage; the expected answer's embedding is cached
+    return scorer.score(candidate_answer, expected_answer)
 
-# Example Usage
-expected_answer = "React is a JavaScript library for building user interfaces, developed by Facebook. It allows developers to build reusable UI components and manage state efficiently using a virtual DOM. React follows a declarative programming approach and enables fast updates through its reconciliation process."
-candidate_answer = "react is used for frontend designing and can work well for state management and efficient state handling"
+if __name__ == "__main__":
+    # Example Usage
+    expected_answer = "React is a JavaScript library for building user interfaces, developed by Facebook. It allows developers to build reusable UI components and manage state efficiently using a virtual DOM. React follows a declarative programming approach and enables fast updates through its reconciliation process."
+    candidate_answer = "react is used for frontend designing and can work well for state management and efficient state handling"
 
-score = compare_answers(candidate_answer, expected_answer)
-print(f"Similarity Score: {score}%")
+    score = compare_answers(candidate_answer, expected_answer)
+    print(f"Similarity Score: {score}%")
@@ -0,0 +1,121 @@
+import html
+import json
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_PAGES = {
+    "MS Dhoni": (
+        "Mahendra Singh Dhoni is an Indian professional cricketer who plays as a "
+        "right-handed batter and a wicket-keeper. He captained the Indian national team "
+        "in limited-overs formats from 2007 to 2017."
+    ),
+    "Python (programming language)": (
+        "Python is a high-level, general-purpose programming language. Its design "
+        "philosophy emphasizes code readability with the use of significant indentation."
+    ),
+}
+
+
+class FakeWikiServer:
+    """Local stand-in for Wikipedia
+
+    GET /api/rest_v1/page/summary/<title> answers like the REST summary
+    endpoint and GET /w/index.php?search=<query> returns an article page for
+    the browser path. Titles match case-insensitively, ignoring underscores.
+    Every request path is recorded in requests; delay simulates latency.
+    """
+    def __init__(self, pages=None, delay=0.0, host="127.0.0.1", port=0):
+        self.pages = dict(DEFAULT_PAGES if pages is None else pages)
+        self.delay = delay
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests.append(self.path)
+                time.sleep(server.delay)
+                url = urllib.parse.urlsplit(self.path)
+                prefix = "/api/rest_v1/page/summary/"
+                if url.path.startswith(prefix):
+                    self._summary(urllib.parse.unquote(url.path[len(prefix):]))
+                elif url.path == "/w/index.php":
+                    query = urllib.parse.parse_qs(url.query).get("search", [""])[0]
+                    self._article(query)
+                else:
+                    self._send(404, "text/plain", b"not found")
+
+            def _summary(self, title):
+                found = server.find(title)
+                if found is None:
+                    body = {"type": "https://mediawiki.org/wiki/HyperSwitch/errors/not_found", "title": "Not found."}
+                    self._send(404, "application/json", json.dumps(body).encode())
+                    return
+                name, extract = found
+                body = {
+                    "type": "standard",
+                    "title": name,
+                    "extract": extract,
+                    "content_urls": {"desktop": {"page": f"{server.url}wiki/{urllib.parse.quote(name.replace(' ', '_'))}"}},
+                }
+                self._send(200, "application/json", json.dumps(body).encode())
+
+            def _article(self, query):
+                found = server.find(query)
+                name, extract = found if found is not None else (f"Search results for {query}", "")
+                page = (
+                    f"<html><head><title>{html.escape(name)} - Wikipedia</title></head><body>"
+                    f"<div id=\"mw-content-text\"><p>{html.escape(extract)}</p></div></body></html>"
+                )
+                self._send(200, "text/html; charset=utf-8", page.encode())
+
+            def _send(self, status, content_type, body):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.thread = None
+
+    def find(self, title):
+        wanted = title.replace("_", " ").strip().lower()
+        for name, extract in self.pages.items():
+            if name.lower() == wanted:
+                return name, extract
+        return None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    server = FakeWikiServer(port=8766).start()
+    print(f"Fake Wikipedia server listening on {server.url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,303 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from instrumentation import Instrumentation
+from lazy_imports import lazy_import
+from pitch_tracker import track_pitch
+from spectral_frontend import Spectrum
+from vad import VoiceActivityDetector
+
+# Heavy dependencies load on first use
+librosa = lazy_import('librosa')
+
+
+class Feature:
+    """
+    A named feature: the function computing it and the features it needs.
+
+    Parameters:
+        name (str): Registry key
+        compute (Callable): Called as compute(context, *dependency_values)
+        requires (Tuple[str, ...]): Names of the features passed to compute
+        stage (str): Instrumentation stage the computation is timed as (default: name)
+    """
+
+    __slots__ = ('name', 'compute', 'requires', 'stage')
+
+    def __init__(self, name: str, compute: Callable, requires: Tuple[str, ...] = (), stage: Optional[str] = None):
+        self.name = name
+        self.compute = compute
+        self.requires = tuple(requires)
+        self.stage = stage or name
+
+
+class FeatureRegistry:
+    """
+    Named features and their declared dependencies.
+
+    The dependencies form a DAG; plan() orders the features a caller asks
+    for, and everything they depend on, so that each is computed after its
+    inputs.
+    """
+
+    def __init__(self):
+        self._features: Dict[str, Feature] = {}
+
+    def register(self, name: str, requires: Iterable[str] = (), stage: Optional[str] = None) -> Callable:
+        """
+        Decorator registering a function as the feature `name`.
+
+        Args:
+            name (str): Feature name
+            requires (Iterable[str]): Features whose values are passed to the function
+            stage (Optional[str]): Instrumentation stage name (default: the feature name)
+
+        Returns:
+            Callable: Decorator returning the function unchanged
+        """
+        def decorator(fn):
+            if name in self._features:
+                raise ValueError(f"Feature '{name}' is already registered")
+            self._features[name] = Feature(name, fn, tuple(requires), stage)
+            return fn
+        return decorator
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._features
+
+    def __getitem__(self, name: str) -> Feature:
+        try:
+            return self._features[name]
+        except KeyError:
+            raise KeyError(f"Unknown feature '{name}'") from None
+
+    def names(self) -> List[str]:
+        return sorted(self._features)
+
+    def plan(self, names: Iterable[str]) -> List[str]:
+        """
+        Order the requested features and their dependencies for evaluation.
+
+        Args:
+            names (Iterable[str]): Requested features
+
+        Returns:
+            List[str]: Every needed feature, dependencies first
+
+        Raises:
+            KeyError: A feature or dependency is not registered
+            ValueError: The dependencies contain a cycle
+        """
+        order: List[str] = []
+        done = set()
+        visiting = set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle through feature '{name}'")
+            visiting.add(name)
+            for dependency in self[name].requires:
+                visit(dependency)
+            visiting.discard(name)
+            done.add(name)
+            order.append(name)
+
+        for name in names:
+            visit(name)
+        return order
+
+
+class FeatureContext:
+    """
+    Lazy, memoized evaluation of registered features for one recording.
+
+    Indexing (context['rms']) computes a feature, and whatever it depends
+    on, the first time it is asked for and returns the stored value after
+    that. Features nobody asks for are never computed, so a caller that only
+    needs loudness and pauses does not pay for the STFT, HPSS or pitch
+    tracking. All frame-level features share one frame grid.
+
+    Parameters:
+        audio (np.ndarray): Mono audio data
+        sample_rate (int): Sampling rate of the audio
+        n_fft (int): Frame / FFT size in samples (default: 2048)
+        hop_length (int): Hop between frames in samples (default: 512)
+        registry (Optional[FeatureRegistry]): Feature definitions (default: FEATURES)
+        instrumentation (Optional[Instrumentation]): Times each computed feature as a stage
+    """
+
+    def __init__(
+        self,
+        audio: np.ndarray,
+        sample_rate: int,
+        n_fft: int = 2048,
+        hop_length: int = 512,
+        registry: Optional[FeatureRegistry] = None,
+        instrumentation: Optional[Instrumentation] = None
+    ):
+        self.audio = audio
+        self.sample_rate = sample_rate
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.registry = registry or FEATURES
+        self.instrumentation = instrumentation or Instrumentation(enabled=False)
+        self._values: Dict[str, Any] = {}
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self._values:
+            self._evaluate([name])
+        return self._values[name]
+
+    def __contains__(self, name: str) -> bool:
+        """Whether the feature has been computed already."""
+        return name in self._values
+
+    @property
+    def computed(self) -> List[str]:
+        """Names of the features computed so far, in evaluation order."""
+        return list(self._values)
+
+    def compute(self, names: Iterable[str]) -> Dict[str, Any]:
+        """
+        Compute several features at once.
+
+        Args:
+            names (Iterable[str]): Requested features
+
+        Returns:
+            Dict[str, Any]: Requested feature values by name
+        """
+        names = list(names)
+        self._evaluate(names)
+        return {name: self._values[name] for name in names}
+
+    def _evaluate(self, names: Iterable[str]):
+        for name in self.registry.plan(names):
+            if name in self._values:
+                continue
+            feature = self.registry[name]
+            inputs = [self._values[dependency] for dependency in feature.requires]
+            with self.instrumentation.stage(feature.stage):
+                self._values[name] = feature.compute(self, *inputs)
+
+
+def extract_features(audio: np.ndarray, sample_rate: int, names: Iterable[str], **kwargs) -> Dict[str, Any]:
+    """
+    Compute only the named features of a recording.
+
+    Args:
+        audio (np.ndarray): Mono audio data
+        sample_rate (int): Sampling rate of the audio
+        names (Iterable[str]): Requested features
+        **kwargs: Further FeatureContext parameters
+
+    Returns:
+        Dict[str, Any]: Requested feature values by name
+    """
+    return FeatureContext(audio, sample_rate, **kwargs).compute(names)
+
+
+# Built-in features shared by the voice analyzers
+FEATURES = FeatureRegistry()
+feature = FEATURES.register
+
+
+@feature('spectrum', stage='stft')
+def _spectrum(ctx: FeatureContext) -> Spectrum:
+    """Complex STFT and magnitude; derived spectral views are cached on it."""
+    return Spectrum(ctx.audio, ctx.sample_rate, n_fft=ctx.n_fft, hop_length=ctx.hop_length)
+
+
+@feature('spectral_db', requires=('spectrum',))
+def _spectral_db(ctx: FeatureContext, spectrum: Spectrum) -> np.ndarray:
+    return spectrum.db
+
+
+@feature('rms')
+def _rms(ctx: FeatureContext) -> np.ndarray:
+    """Time-domain RMS per frame; needs no STFT."""
+    return librosa.feature.rms(y=ctx.audio, frame_length=ctx.n_fft, hop_length=ctx.hop_length)[0]
+
+
+@feature('zcr')
+def _zcr(ctx: FeatureContext) -> np.ndarray:
+    return librosa.feature.zero_crossing_rate(ctx.audio, frame_length=ctx.n_fft, hop_length=ctx.hop_length)[0]
+
+
+@feature('voice_activity', requires=('rms',), stage='vad')
+def _voice_activity(ctx: FeatureContext, rms: np.ndarray):
+    return VoiceActivityDetector(ctx.sample_rate, ctx.n_fft, ctx.hop_length).detect(rms=rms)
+
+
+@feature('pause_metrics', requires=('voice_activity',))
+def _pause_metrics(ctx: FeatureContext, activity) -> Dict[str, float]:
+    return activity.pause_metrics()
+
+
+@feature('pitch', requires=('voice_activity',))
+def _pitch(ctx: FeatureContext, activity) -> Tuple[np.ndarray, np.ndarray]:
+    """F0 per frame and voicing flags, tracked inside speech segments only."""
+    return track_pitch(ctx.audio, ctx.sample_rate, hop_length=ctx.hop_length, frame_mask=activity.voiced)
+
+
+@feature('voiced_pitches', requires=('pitch',))
+def _voiced_pitches(ctx: FeatureContext, pitch) -> np.ndarray:
+    f0, voiced = pitch
+    return f0[voiced]
+
+
+@feature('speech_magnitude', requires=('spectrum', 'voice_activity'))
+def _speech_magnitude(ctx: FeatureContext, spectrum: Spectrum, activity) -> np.ndarray:
+    """Magnitude columns of the speech frames (all of them if none are speech)."""
+    if not activity.voiced.any():
+        return spectrum.magnitude
+    return spectrum.magnitude[:, activity.voiced[:spectrum.n_frames]]
+
+
+@feature('hpss', requires=('speech_magnitude',))
+def _hpss(ctx: FeatureContext, magnitude: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    return librosa.decompose.hpss(magnitude)
+
+
+@feature('harmonic_ratio', requires=('hpss',))
+def _harmonic_ratio(ctx: FeatureContext, hpss) -> float:
+    harmonic, percussive = hpss
+    return float(np.sum(np.abs(harmonic)) / (np.sum(np.abs(percussive)) + 1e-6))
+
+
+@feature('spectral_contrast', requires=('speech_magnitude',))
+def _spectral_contrast(ctx: FeatureContext, magnitude: np.ndarray) -> np.ndarray:
+    return librosa.feature.spectral_contrast(
+        S=magnitude,
+        sr=ctx.sample_rate,
+        n_fft=ctx.n_fft,
+        hop_length=ctx.hop_length
+    )
+
+
+@feature('spectral_centroid', requires=('spectrum',))
+def _spectral_centroid(ctx: FeatureContext, spectrum: Spectrum) -> np.ndarray:
+    return librosa.feature.spectral_centroid(
+        S=spectrum.magnitude,
+        sr=ctx.sample_rate,
+        n_fft=ctx.n_fft,
+        hop_length=ctx.hop_length
+    )[0]
+
+
+@feature('onset_envelope', requires=('spectrum',), stage='onset')
+def _onset_envelope(ctx: FeatureContext, spectrum: Spectrum) -> np.ndarray:
+    return spectrum.onset_envelope
+
+
+@feature('tempo', requires=('onset_envelope',))
+def _tempo(ctx: FeatureContext, onset_envelope: np.ndarray) -> float:
+    """Global tempo estimate in BPM, used as the speaking-rate proxy."""
+    return float(librosa.feature.tempo(
+        onset_envelope=onset_envelope,
+        sr=ctx.sample_rate,
+        hop_length=ctx.hop_length
+    )[0])
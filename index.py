@@ -1,29 +1,33 @@
-import pyttsx3 as p
 import speech_recognition as sr # speech to text
 from selenium_web import Inflow
-engine = p.init()
-rate = engine.getProperty("rate")
-engine.setProperty('rate',130)
-voices = engine.getProperty('voices')
-engine.setProperty('voice',voices[0].id) #voices[0].id -> male voice and voices[1].id -> female voice
-print(voices)
+from noise_calibration import NoiseCalibrator
+from tts_worker import BargeInMonitor, TTSWorker
+
+# The worker thread owns the pyttsx3 engine (tts_worker.default_engine)
+tts = TTSWorker()
 
 def speak(text):
-    engine.say(text)
-    engine.runAndWait()
+    # Non-blocking: returns a future while listening/recognition carry on
+    return tts.say(text)
 
 
 
 
 r = sr.Recognizer() # helps to retrive audio from microphone
+calibrator = NoiseCalibrator(r) # ambient-noise calibration shared by every listen
+# Stop talking when the user talks over the assistant
+barge_in = BargeInMonitor(tts, threshold=lambda: r.energy_threshold * 3).start()
 speak("hello sir, I'm your voice assistant how are you")
 
-# Capture audio from microphone
+# Capture audio from microphone once the greeting has been spoken
+tts.wait_idle()
 with sr.Microphone() as source:
-    print("Adjusting for ambient noise... Please wait")
-    r.adjust_for_ambient_noise(source)  # Helps in noisy environments
+    if calibrator.needs_calibration:
+        print("Adjusting for ambient noise... Please wait")
+    calibrator.prepare(source)  # Calibrates once, then tracks the noise floor
     print("Say something...")
     audio = r.listen(source, timeout=10)
+    calibrator.update(audio)
 
 # Try recognizing the speech
 try:
@@ -45,11 +49,14 @@ if "what" or "about" or "you" in text:
     speak("I'm having a good day")
 speak("how can I help you")
 
+tts.wait_idle()
 with sr.Microphone() as source:
-    print("Adjusting for ambient noise... Please wait")
-    r.adjust_for_ambient_noise(source)  # Helps in noisy environments
+    if calibrator.needs_calibration:
+        print("Adjusting for ambient noise... Please wait")
+    calibrator.prepare(source)  # Calibrates once, then tracks the noise floor
     print("Say something...")
     audio = r.listen(source, timeout=10)
+    calibrator.update(audio)
 
 # Try recognizing the speech
 text2=""
@@ -65,11 +72,14 @@ except sr.RequestError as e:
 
 if "information" in text2:
     speak("You want information related to which topic:")
+    tts.wait_idle()
     with sr.Microphone() as source:
-        print("Adjusting for ambient noise... Please wait")
-        r.adjust_for_ambient_noise(source)  # Helps in noisy environments
+        if calibrator.needs_calibration:
+            print("Adjusting for ambient noise... Please wait")
+        calibrator.prepare(source)  # Calibrates once, then tracks the noise floor
         print("Say something...")
         audio = r.listen(source, timeout=10)
+        calibrator.update(audio)
 
     try:
         infor_query = r.recognize_google(audio)
@@ -84,7 +94,13 @@ if "information" in text2:
         infor_query = ""
 
 
-    # Run the script
-    # assist = Inflow()
-    # assist.getinfo(infor_query)
+    # Run the script: REST summary (cached) first, pooled browser as fallback
+    if infor_query:
+        assist = Inflow()
+        info = assist.get_info(infor_query)
+        if info and info['extract']:
+            speak(info['extract'])
 
+# Let any queued speech finish before exiting
+barge_in.stop()
+tts.close()
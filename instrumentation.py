@@ -0,0 +1,187 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterator, Optional
+
+ENV_VAR = 'VOICE_ANALYSIS_TIMINGS'
+
+
+def enabled_from_env(default: bool = False) -> bool:
+    """Return whether timings are switched on by the VOICE_ANALYSIS_TIMINGS variable."""
+    value = os.environ.get(ENV_VAR)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+class StageStats:
+    """Accumulated cost of one named stage."""
+
+    __slots__ = ('calls', 'wall', 'cpu', 'max_wall')
+
+    def __init__(self, calls: int = 0, wall: float = 0.0, cpu: float = 0.0, max_wall: float = 0.0):
+        self.calls = calls
+        self.wall = wall
+        self.cpu = cpu
+        self.max_wall = max_wall
+
+    def as_dict(self) -> Dict[str, float]:
+        return {'calls': self.calls, 'wall_s': self.wall, 'cpu_s': self.cpu, 'max_wall_s': self.max_wall}
+
+
+class _NullStage:
+    """Context manager returned while instrumentation is disabled; does nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ('_owner', '_name', '_wall', '_cpu')
+
+    def __init__(self, owner: 'Instrumentation', name: str):
+        self._owner = owner
+        self._name = name
+
+    def __enter__(self):
+        self._cpu = time.thread_time()
+        self._wall = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self._wall
+        cpu = time.thread_time() - self._cpu
+        self._owner._record(self._name, wall, cpu)
+        return False
+
+
+class Instrumentation:
+    """
+    Per-stage wall time, CPU time and call counts for an analyzer.
+
+    Wrap each stage in `with instrumentation.stage('name'):`. While disabled,
+    stage() returns a shared no-op context manager, so the cost is one
+    attribute check per stage. CPU time is per thread (time.thread_time), so
+    stages running concurrently on helper threads are attributed correctly.
+
+    Parameters:
+        enabled (Optional[bool]): Record timings (default: VOICE_ANALYSIS_TIMINGS env var, else off)
+        prefix (str): Metric name prefix for the Prometheus export
+    """
+
+    def __init__(self, enabled: Optional[bool] = None, prefix: str = 'voice_analysis'):
+        self.enabled = enabled_from_env() if enabled is None else enabled
+        self.prefix = prefix
+        self._stats: Dict[str, StageStats] = {}
+        self._lock = threading.Lock()
+
+    def stage(self, name: str):
+        """
+        Time a block of code as the named stage.
+
+        Args:
+            name (str): Stage name, e.g. 'stft' or 'asr'
+
+        Returns:
+            Context manager recording the stage on exit
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def timed(self, name: str) -> Callable:
+        """Decorator form of stage()."""
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def _record(self, name: str, wall: float, cpu: float):
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = StageStats()
+            stats.calls += 1
+            stats.wall += wall
+            stats.cpu += cpu
+            if wall > stats.max_wall:
+                stats.max_wall = wall
+
+    def snapshot(self) -> Dict[str, StageStats]:
+        """Return a copy of the accumulated stats."""
+        with self._lock:
+            return {name: StageStats(s.calls, s.wall, s.cpu, s.max_wall) for name, s in self._stats.items()}
+
+    @contextmanager
+    def collect(self) -> Iterator[Dict[str, Dict[str, float]]]:
+        """
+        Collect the stages recorded inside the block into a dict.
+
+        The dict is filled in when the block exits and stays empty while
+        instrumentation is disabled. Stages recorded concurrently by other
+        callers of the same instance are included as well.
+
+        Yields:
+            Dict[str, Dict[str, float]]: Stage name to calls / wall_s / cpu_s
+        """
+        timings: Dict[str, Dict[str, float]] = {}
+        if not self.enabled:
+            yield timings
+            return
+        before = self.snapshot()
+        try:
+            yield timings
+        finally:
+            for name, after in self.snapshot().items():
+                prior = before.get(name, StageStats())
+                if after.calls == prior.calls:
+                    continue
+                timings[name] = {
+                    'calls': after.calls - prior.calls,
+                    'wall_s': after.wall - prior.wall,
+                    'cpu_s': after.cpu - prior.cpu
+                }
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        return {name: stats.as_dict() for name, stats in sorted(self.snapshot().items())}
+
+    def to_json(self, **kwargs) -> str:
+        """Export the accumulated stats as JSON."""
+        return json.dumps({'enabled': self.enabled, 'stages': self.to_dict()}, **kwargs)
+
+    def to_prometheus(self) -> str:
+        """Export the accumulated stats in the Prometheus text exposition format."""
+        stats = sorted(self.snapshot().items())
+        metrics = (
+            ('stage_calls_total', 'counter', 'Number of times each analysis stage ran.', 'calls'),
+            ('stage_wall_seconds_total', 'counter', 'Wall-clock time spent in each analysis stage.', 'wall'),
+            ('stage_cpu_seconds_total', 'counter', 'CPU time spent in each analysis stage.', 'cpu'),
+            ('stage_max_wall_seconds', 'gauge', 'Longest single run of each analysis stage.', 'max_wall')
+        )
+        lines = []
+        for suffix, kind, help_text, attribute in metrics:
+            name = f"{self.prefix}_{suffix}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for stage, values in stats:
+                label = stage.replace('\\', '\\\\').replace('"', '\\"')
+                lines.append(f'{name}{{stage="{label}"}} {getattr(values, attribute)}')
+        return '\n'.join(lines) + '\n'
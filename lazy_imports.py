@@ -0,0 +1,30 @@
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Return a module that is only actually imported on first attribute access.
+
+    Heavy dependencies (librosa, sounddevice, speech_recognition, ...) are
+    bound at module level with this so that importing the analyzers is
+    cheap and short-lived tools only pay for what they use.
+
+    Args:
+        name (str): Fully qualified module name
+
+    Returns:
+        ModuleType: The (possibly not yet executed) module
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,130 @@
+from typing import Optional
+
+import numpy as np
+
+_SAMPLE_DTYPES = {2: np.int16, 4: np.int32}
+
+
+def frame_energies(raw: bytes, sample_width: int, frame_samples: int) -> np.ndarray:
+    """
+    RMS energy of consecutive frames of raw PCM, in the integer units
+    speech_recognition uses for energy_threshold.
+
+    Args:
+        raw (bytes): Little-endian PCM data
+        sample_width (int): Bytes per sample (2 or 4)
+        frame_samples (int): Samples per frame
+
+    Returns:
+        np.ndarray: One RMS value per complete frame
+    """
+    samples = np.frombuffer(raw, dtype=_SAMPLE_DTYPES[sample_width]).astype(np.float64)
+    n_frames = len(samples) // frame_samples
+    if n_frames == 0:
+        return np.zeros(0)
+    frames = samples[:n_frames * frame_samples].reshape(n_frames, frame_samples)
+    return np.sqrt(np.mean(frames ** 2, axis=1))
+
+
+class NoiseCalibrator:
+    """
+    Calibrates a speech_recognition.Recognizer once per session and then keeps
+    its energy_threshold in line with the ambient noise from audio it already
+    captures.
+
+    After each utterance the quietest frames of the captured audio (the lead-in
+    and the trailing pause that ends listen()) give a noise sample, which is
+    folded into an exponential moving noise floor. A full calibration is only
+    repeated when several consecutive samples drift away from the floor.
+
+    Parameters:
+        recognizer: speech_recognition.Recognizer to manage
+        calibration_seconds (float): Length of the initial calibration (default: 1 s)
+        smoothing (float): Weight of each new noise sample in the moving floor (default: 0.2)
+        threshold_ratio (float): energy_threshold as a multiple of the floor (default: 1.5)
+        drift_tolerance (float): Relative deviation that counts as drift (default: 0.5)
+        drift_updates (int): Consecutive drifting samples that force recalibration (default: 3)
+        noise_percentile (float): Percentile of frame energies taken as noise (default: 10)
+        frame_ms (float): Frame length for energy measurement (default: 30 ms)
+        min_threshold (float): Lower bound for energy_threshold (default: 50)
+    """
+
+    def __init__(
+        self,
+        recognizer,
+        calibration_seconds: float = 1.0,
+        smoothing: float = 0.2,
+        threshold_ratio: float = 1.5,
+        drift_tolerance: float = 0.5,
+        drift_updates: int = 3,
+        noise_percentile: float = 10,
+        frame_ms: float = 30,
+        min_threshold: float = 50
+    ):
+        self.recognizer = recognizer
+        self.calibration_seconds = calibration_seconds
+        self.smoothing = smoothing
+        self.threshold_ratio = threshold_ratio
+        self.drift_tolerance = drift_tolerance
+        self.drift_updates = drift_updates
+        self.noise_percentile = noise_percentile
+        self.frame_ms = frame_ms
+        self.min_threshold = min_threshold
+        self.noise_floor: Optional[float] = None
+        self.calibrations = 0
+        self._drift_count = 0
+        # We manage the threshold ourselves
+        self.recognizer.dynamic_energy_threshold = False
+
+    @property
+    def needs_calibration(self) -> bool:
+        return self.noise_floor is None
+
+    def prepare(self, source):
+        """
+        Get the recognizer ready to listen on source, calibrating only if needed.
+
+        Args:
+            source: Open speech_recognition.Microphone (or other AudioSource)
+        """
+        if not self.needs_calibration:
+            return
+        self.recognizer.adjust_for_ambient_noise(source, duration=self.calibration_seconds)
+        self.noise_floor = self.recognizer.energy_threshold / self.threshold_ratio
+        self.calibrations += 1
+        self._drift_count = 0
+        self._apply()
+
+    def update(self, audio) -> Optional[float]:
+        """
+        Update the noise floor from a captured utterance.
+
+        Args:
+            audio: speech_recognition.AudioData returned by listen()
+
+        Returns:
+            Optional[float]: The noise sample taken from the audio, if any
+        """
+        if self.noise_floor is None or audio.sample_width not in _SAMPLE_DTYPES:
+            return None
+        frame_samples = max(1, int(audio.sample_rate * self.frame_ms / 1000))
+        energies = frame_energies(audio.get_raw_data(), audio.sample_width, frame_samples)
+        if len(energies) == 0:
+            return None
+        sample = float(np.percentile(energies, self.noise_percentile))
+
+        if abs(sample - self.noise_floor) > self.drift_tolerance * self.noise_floor:
+            self._drift_count += 1
+        else:
+            self._drift_count = 0
+
+        if self._drift_count >= self.drift_updates:
+            # Environment changed for good: recalibrate before the next listen
+            self.noise_floor = None
+        else:
+            self.noise_floor += self.smoothing * (sample - self.noise_floor)
+            self._apply()
+        return sample
+
+    def _apply(self):
+        self.recognizer.energy_threshold = max(self.min_threshold, self.noise_floor * self.threshold_ratio)
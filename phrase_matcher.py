@@ -0,0 +1,130 @@
+import re
+from collections import namedtuple
+from multiprocessing import Pool
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z0-9]+)*")
+
+PhraseMatch = namedtuple('PhraseMatch', ['category', 'phrase', 'start', 'end', 'char_start', 'char_end'])
+
+# Marker key for "a phrase ends at this trie node"
+_END = None
+
+
+def tokenize(text: str) -> List[Tuple[str, int, int]]:
+    """
+    Split text into lowercase word tokens with character offsets.
+
+    Args:
+        text (str): Input text
+
+    Returns:
+        List[Tuple[str, int, int]]: (token, char_start, char_end) triples
+    """
+    return [(m.group(), m.start(), m.end()) for m in TOKEN_PATTERN.finditer(text.lower())]
+
+
+class PhraseMatcher:
+    """
+    Token-trie matcher for single- and multi-word phrases in several categories.
+
+    All phrases are compiled into one trie over word tokens, so a single pass
+    over the text finds every category at once. Matching is on whole tokens
+    (no "so" inside "also") and, within a category, leftmost-longest and
+    non-overlapping ("kind of" counts once, not also as "kind").
+
+    Parameters:
+        categories (Dict[str, Iterable[str]]): Phrase lists keyed by category name
+    """
+
+    def __init__(self, categories: Dict[str, Iterable[str]]):
+        self.categories = {name: sorted(set(phrases)) for name, phrases in categories.items()}
+        self._trie: Dict = {}
+        for category, phrases in self.categories.items():
+            for phrase in phrases:
+                tokens = [token for token, _, _ in tokenize(phrase)]
+                if not tokens:
+                    continue
+                node = self._trie
+                for token in tokens:
+                    node = node.setdefault(token, {})
+                node.setdefault(_END, {})[category] = ' '.join(tokens)
+
+    def find(self, text: str) -> List[PhraseMatch]:
+        """
+        Find all phrase occurrences in one pass.
+
+        Args:
+            text (str): Input text
+
+        Returns:
+            List[PhraseMatch]: Matches ordered by start token
+        """
+        return self._find_tokens(tokenize(text))
+
+    def _find_tokens(self, tokens: List[Tuple[str, int, int]]) -> List[PhraseMatch]:
+        matches = []
+        next_free = dict.fromkeys(self.categories, 0)
+        for start in range(len(tokens)):
+            node = self._trie
+            longest = {}
+            position = start
+            while position < len(tokens):
+                node = node.get(tokens[position][0])
+                if node is None:
+                    break
+                position += 1
+                for category, phrase in node.get(_END, {}).items():
+                    longest[category] = (phrase, position)
+            for category, (phrase, end) in longest.items():
+                if start >= next_free[category]:
+                    matches.append(PhraseMatch(
+                        category, phrase, start, end, tokens[start][1], tokens[end - 1][2]
+                    ))
+                    next_free[category] = end
+        return matches
+
+    def summarize(self, text: str) -> Dict:
+        """
+        Count phrase occurrences per category.
+
+        Args:
+            text (str): Input text
+
+        Returns:
+            Dict containing word_count, per-category phrase counts and totals
+        """
+        tokens = tokenize(text)
+        counts = {category: {} for category in self.categories}
+        for match in self._find_tokens(tokens):
+            category_counts = counts[match.category]
+            category_counts[match.phrase] = category_counts.get(match.phrase, 0) + 1
+        return {
+            'word_count': len(tokens),
+            'counts': counts,
+            'totals': {category: sum(c.values()) for category, c in counts.items()}
+        }
+
+    def summarize_batch(
+        self,
+        texts: Iterable[str],
+        processes: Optional[int] = None,
+        chunksize: int = 1000
+    ) -> Iterator[Dict]:
+        """
+        Summarize many texts, optionally across worker processes.
+
+        Args:
+            texts (Iterable[str]): Transcripts to score
+            processes (Optional[int]): Worker processes; None or 1 runs in-process
+            chunksize (int): Texts sent to a worker at a time
+
+        Returns:
+            Iterator[Dict]: One summary per text, in input order
+        """
+        if processes is None or processes <= 1:
+            for text in texts:
+                yield self.summarize(text)
+            return
+        with Pool(processes) as pool:
+            yield from pool.imap(self.summarize, texts, chunksize=chunksize)
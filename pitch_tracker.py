@@ -0,0 +1,159 @@
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from lazy_imports import lazy_import
+
+fft = lazy_import('scipy.fft')
+
+
+def default_frame_length(sample_rate: int, fmin: float) -> int:
+    """
+    Smallest power-of-two frame that fits two periods of the lowest pitch.
+
+    Args:
+        sample_rate (int): Sampling rate of the audio
+        fmin (float): Lowest pitch to track in Hz
+
+    Returns:
+        int: Frame length in samples
+    """
+    max_lag = int(math.ceil(sample_rate / fmin))
+    return 1 << int(math.ceil(math.log2(2 * (max_lag + 2))))
+
+
+def frame_signal(
+    audio: np.ndarray,
+    frame_length: int,
+    hop_length: int,
+    center: bool = True
+) -> np.ndarray:
+    """
+    Return a strided (n_frames, frame_length) view of the signal.
+
+    With center=True the signal is zero-padded by half a frame on both sides,
+    giving the same 1 + len(audio) // hop_length frame grid librosa uses.
+
+    Args:
+        audio (np.ndarray): Audio data
+        frame_length (int): Frame size in samples
+        hop_length (int): Hop between frames in samples
+        center (bool): Centre frames on their timestamps
+
+    Returns:
+        np.ndarray: Frame view
+    """
+    if center:
+        audio = np.pad(audio, frame_length // 2)
+    if len(audio) < frame_length:
+        audio = np.pad(audio, (0, frame_length - len(audio)))
+    return sliding_window_view(audio, frame_length)[::hop_length]
+
+
+def track_pitch(
+    audio: np.ndarray,
+    sample_rate: int,
+    fmin: float = 65.0,
+    fmax: float = 400.0,
+    frame_length: int = None,
+    hop_length: int = 512,
+    threshold: float = 0.15,
+    silence_db: float = -30.0,
+    center: bool = True,
+    block_frames: int = 256,
+    frame_mask: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Estimate one fundamental frequency per frame with a vectorized YIN.
+
+    The difference function of every frame in a block is computed at once
+    from FFT cross-correlations and cumulative energy sums; blocks bound the
+    working memory to a few MB regardless of input length.
+
+    Args:
+        audio (np.ndarray): Mono audio data
+        sample_rate (int): Sampling rate of the audio
+        fmin (float): Lowest pitch searched in Hz (default: 65)
+        fmax (float): Highest pitch searched in Hz (default: 400)
+        frame_length (int): Frame size (default: fits two periods of fmin)
+        hop_length (int): Hop between frames in samples (default: 512)
+        threshold (float): YIN dip threshold on the normalized difference (default: 0.15)
+        silence_db (float): Frames this far below the loudest frame are unvoiced (default: -30 dB)
+        center (bool): Centre frames on their timestamps, as librosa does
+        block_frames (int): Frames processed per vectorized block
+        frame_mask (Optional[np.ndarray]): Only analyze frames where this is True
+            (e.g. speech frames from vad); others, and frames past its end, are unvoiced
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: f0 per frame in Hz (NaN when unvoiced)
+            and the boolean voicing flag per frame
+    """
+    if frame_length is None:
+        frame_length = default_frame_length(sample_rate, fmin)
+    window = frame_length // 2
+    min_lag = max(1, int(sample_rate / fmax))
+    max_lag = min(window - 1, int(math.ceil(sample_rate / fmin)))
+    if min_lag + 1 >= max_lag:
+        raise ValueError("fmin/fmax range is too narrow for this frame length")
+
+    frames = frame_signal(np.asarray(audio, dtype=np.float32), frame_length, hop_length, center)
+    n_frames = len(frames)
+    n_fft = fft.next_fast_len(frame_length + window)
+    lags = np.arange(1, max_lag + 1, dtype=np.float32)
+
+    f0 = np.full(n_frames, np.nan, dtype=np.float32)
+    voiced = np.zeros(n_frames, dtype=bool)
+    energy = np.zeros(n_frames, dtype=np.float32)
+
+    if frame_mask is None:
+        indices = np.arange(n_frames)
+    else:
+        indices = np.flatnonzero(np.asarray(frame_mask, dtype=bool)[:n_frames])
+
+    for start in range(0, len(indices), block_frames):
+        index = indices[start:start + block_frames]
+        block = frames[index]
+        rows = np.arange(len(block))
+
+        # cross[t, lag] = sum_{j < window} x[j] * x[j + lag]
+        spectrum = fft.rfft(block, n_fft, axis=1)
+        head = fft.rfft(block[:, :window], n_fft, axis=1)
+        cross = fft.irfft(spectrum * np.conj(head), n_fft, axis=1)[:, :max_lag + 1]
+
+        # energy[t, lag] = sum_{j < window} x[j + lag] ** 2
+        cumulative = np.zeros((len(block), frame_length + 1), dtype=np.float32)
+        np.cumsum(block ** 2, axis=1, out=cumulative[:, 1:])
+        lag_energy = cumulative[:, window:window + max_lag + 1] - cumulative[:, :max_lag + 1]
+        energy[index] = lag_energy[:, 0]
+
+        difference = np.maximum(lag_energy[:, :1] + lag_energy - 2 * cross, 0)
+        cmnd = np.ones_like(difference)
+        cmnd[:, 1:] = difference[:, 1:] * lags / (np.cumsum(difference[:, 1:], axis=1) + 1e-10)
+
+        # First local minimum below threshold inside [min_lag, max_lag)
+        inner = cmnd[:, min_lag:max_lag]
+        is_dip = (
+            (inner < threshold)
+            & (inner <= cmnd[:, min_lag - 1:max_lag - 1])
+            & (inner < cmnd[:, min_lag + 1:max_lag + 1])
+        )
+        found = is_dip.any(axis=1)
+        lag = np.argmax(is_dip, axis=1) + min_lag
+
+        # Parabolic interpolation around the chosen lag
+        before = cmnd[rows, lag - 1]
+        at = cmnd[rows, lag]
+        after = cmnd[rows, lag + 1]
+        curvature = before - 2 * at + after
+        shift = np.where(np.abs(curvature) > 1e-10, 0.5 * (before - after) / (curvature + 1e-20), 0)
+        period = lag + np.clip(shift, -1, 1)
+
+        f0[index] = np.where(found, sample_rate / period, np.nan)
+        voiced[index] = found
+
+    if n_frames and energy.max() > 0:
+        voiced &= energy > energy.max() * 10 ** (silence_db / 10)
+    f0[~voiced] = np.nan
+    return f0, voiced
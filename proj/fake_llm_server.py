@@ -0,0 +1,87 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_RESPONSE = (
+    "Sure, here is a short answer. The Maharashtra Public Service Commission "
+    "recruits officers for the state government. It conducts preliminary and "
+    "main examinations followed by an interview. Let me know if you want more detail!"
+)
+
+
+class FakeLLMServer:
+    """Local stand-in for a streaming LLM API
+
+    POST / with {"prompt": ...} streams the canned response back as
+    newline-delimited JSON chunks of a few words, sleeping token_delay
+    seconds between chunks to mimic generation speed.
+    """
+    def __init__(self, response=DEFAULT_RESPONSE, token_delay=0.05, words_per_chunk=3, host="127.0.0.1", port=0):
+        self.response = response
+        self.token_delay = token_delay
+        self.words_per_chunk = words_per_chunk
+        self.prompts = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                server.prompts.append(body.get("prompt", ""))
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                words = server.response.split(" ")
+                for i in range(0, len(words), server.words_per_chunk):
+                    text = " ".join(words[i:i + server.words_per_chunk])
+                    if i + server.words_per_chunk < len(words):
+                        text += " "
+                    self._write_chunk(json.dumps({"text": text}) + "\n")
+                    time.sleep(server.token_delay)
+                self.wfile.write(b"0\r\n\r\n")
+
+            def _write_chunk(self, data):
+                data = data.encode()
+                self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    server = FakeLLMServer(port=8765).start()
+    print(f"Fake LLM server listening on {server.url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
@@ -1,33 +1,76 @@
+import os
+import sys
+from contextlib import contextmanager
 import google.generativeai as genai
-import pyttsx3 as p
 import speech_recognition as sr
+from turn_pipeline import GeminiStreamingLLM, TurnPipeline
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from noise_calibration import NoiseCalibrator
+from tts_worker import BargeInMonitor, TTSWorker
 
 class VoiceAssistant:
-    def __init__(self, api_key):
+    def __init__(self, api_key, llm=None):
         # Initialize Gemini
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel("gemini-1.5-flash")
+        # Streaming LLM backend; pass turn_pipeline.HttpStreamingLLM to test locally
+        self.llm = llm or GeminiStreamingLLM(self.model)
         
-        # Initialize text-to-speech engine
-        self.engine = p.init()
-        self.engine.setProperty('rate', 130)
-        voices = self.engine.getProperty('voices')
-        self.engine.setProperty('voice', voices[0].id)
+        # Text-to-speech runs on its own worker thread so listening, recognition
+        # and LLM calls can proceed during playback
+        self.tts = TTSWorker()
         
         # Initialize speech recognizer
         self.recognizer = sr.Recognizer()
+        self.calibrator = NoiseCalibrator(self.recognizer)
+        # Interrupt playback when the user starts speaking over it
+        self.barge_in = BargeInMonitor(self.tts, threshold=lambda: self.recognizer.energy_threshold * 3)
+        
+        # Microphone opened ahead of the next listen, while the reply plays
+        self._prepared_microphone = None
+        
+        # Speak each sentence of the response as soon as it has been generated
+        # and stop the turn when the user barges in
+        self.pipeline = TurnPipeline(self.llm, self.speak, prepare_listen=self.prepare_listen,
+                                     generation=lambda: self.tts.generation)
     
     def speak(self, text):
-        self.engine.say(text)
-        self.engine.runAndWait()
+        """Queue text for speech; returns a future that resolves when it has been spoken"""
+        return self.tts.say(text)
+    
+    def prepare_listen(self):
+        """Open the microphone stream now so the next listen starts without that delay"""
+        if self._prepared_microphone is None:
+            self._prepared_microphone = sr.Microphone().__enter__()
+    
+    @contextmanager
+    def _microphone(self):
+        source, self._prepared_microphone = self._prepared_microphone, None
+        if source is None:
+            source = sr.Microphone().__enter__()
+        else:
+            # Drop what the open stream buffered before this listen started
+            stream = source.stream.pyaudio_stream
+            stale = stream.get_read_available()
+            if stale:
+                stream.read(stale, exception_on_overflow=False)
+        try:
+            yield source
+        finally:
+            source.__exit__(None, None, None)
     
     def listen(self):
-        with sr.Microphone() as source:
-            print("Adjusting for ambient noise... Please wait")
-            self.recognizer.adjust_for_ambient_noise(source)
+        # Let queued speech finish so the microphone doesn't hear the assistant
+        self.tts.wait_idle()
+        with self._microphone() as source:
+            if self.calibrator.needs_calibration:
+                print("Adjusting for ambient noise... Please wait")
+            self.calibrator.prepare(source)
             print("Listening...")
             try:
                 audio = self.recognizer.listen(source, timeout=10)
+                self.calibrator.update(audio)
                 text = self.recognizer.recognize_google(audio)
                 print("You said:", text)
                 return text
@@ -38,15 +81,8 @@ class VoiceAssistant:
                 print(f"Could not request results; {e}")
                 return None
     
-    def get_gemini_response(self, prompt):
-        try:
-            response = self.model.generate_content(prompt)
-            return response.text
-        except Exception as e:
-            print(f"Error getting response from Gemini: {e}")
-            return "I'm sorry, I couldn't get a response at this time."
-    
     def run(self):
+        self.barge_in.start()
         self.speak("Hello! I'm your voice assistant. How can I help you?")
         
         while True:
@@ -60,11 +96,11 @@ class VoiceAssistant:
                 self.speak("Goodbye!")
                 break
             
-            # Get response from Gemini
-            gemini_response = self.get_gemini_response(user_input)
-            
-            # Speak the response
-            self.speak(gemini_response)
+            # Stream the response from Gemini and speak it sentence by sentence
+            self.pipeline.run_turn(user_input)
+        
+        self.barge_in.stop()
+        self.tts.close()
 
 def main():
     # Replace with your actual API key
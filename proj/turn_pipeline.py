@@ -0,0 +1,166 @@
+import json
+import queue
+import re
+import threading
+import time
+import urllib.request
+from concurrent.futures import wait
+
+# Sentence end: terminal punctuation (optionally closed by quotes/brackets) followed by whitespace
+SENTENCE_END = re.compile(r'[.!?]+["\')\]]*\s+')
+
+
+def split_sentences(chunks, min_chars=12):
+    """Regroup a stream of text chunks into sentences as soon as each one ends
+
+    Sentences shorter than min_chars are merged with the next one so that
+    fragments like "Dr." or "1." are not spoken on their own.
+    """
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        start = 0
+        for match in SENTENCE_END.finditer(buffer):
+            if match.end() - start >= min_chars:
+                yield buffer[start:match.end()].strip()
+                start = match.end()
+        buffer = buffer[start:]
+    if buffer.strip():
+        yield buffer.strip()
+
+
+class GeminiStreamingLLM:
+    """Streams a Gemini response chunk by chunk"""
+    def __init__(self, model):
+        self.model = model
+
+    def stream(self, prompt):
+        for chunk in self.model.generate_content(prompt, stream=True):
+            yield chunk.text
+
+
+class HttpStreamingLLM:
+    """Streams newline-delimited JSON ({"text": ...}) chunks from an HTTP endpoint
+
+    Used with fake_llm_server.FakeLLMServer for local testing.
+    """
+    def __init__(self, url, timeout=30):
+        self.url = url
+        self.timeout = timeout
+
+    def stream(self, prompt):
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps({"prompt": prompt}).encode(),
+            headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            for line in response:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)["text"]
+
+
+class TurnPipeline:
+    """Overlaps LLM generation with speech synthesis for one assistant turn
+
+    The LLM stream is consumed on a background thread and split into
+    sentences; the calling thread queues each sentence for speech as soon as
+    it is complete instead of waiting for the full response. speak(text)
+    must return a future that is done once the text has been spoken (or
+    dropped), such as tts_worker.TTSWorker.say. Once generation has finished
+    and the last sentence starts playing, prepare_listen (if given) runs in
+    the background so the next listen is ready when playback ends.
+    run_turn returns only after playback has finished.
+
+    Barge-in ends the turn: once generation() changes (for a TTSWorker,
+    lambda: worker.generation) or an utterance comes back cut short or
+    cancelled, no further sentences are queued, the LLM stream is
+    abandoned and run_turn returns without preparing to listen.
+    """
+    def __init__(self, llm, speak, prepare_listen=None,
+                 fallback="I'm sorry, I couldn't get a response at this time.",
+                 generation=None):
+        self.llm = llm
+        self.speak = speak
+        self.prepare_listen = prepare_listen
+        self.fallback = fallback
+        self.generation = generation
+        self.last_stats = {}
+
+    def _produce(self, prompt, sentences, stop):
+        stream = None
+        try:
+            stream = split_sentences(self.llm.stream(prompt))
+            for sentence in stream:
+                if stop.is_set():
+                    break
+                sentences.put(sentence)
+        except Exception as e:
+            print(f"Error streaming LLM response: {e}")
+            sentences.put(e)
+        finally:
+            # Closing the generator closes the LLM stream (and its connection) too
+            if stream is not None:
+                stream.close()
+            sentences.put(None)
+
+    def _interrupted(self, turn, utterances):
+        if self.generation is not None and self.generation() != turn:
+            return True
+        return any(
+            utterance.done() and (utterance.cancelled()
+                                  or (utterance.exception() is None and utterance.result() is False))
+            for utterance in utterances
+        )
+
+    def run_turn(self, prompt):
+        """Generate and speak a response; returns the text queued for speech"""
+        started = time.perf_counter()
+        turn = self.generation() if self.generation is not None else None
+        sentences = queue.Queue()
+        stop = threading.Event()
+        producer = threading.Thread(target=self._produce, args=(prompt, sentences, stop), daemon=True)
+        producer.start()
+
+        spoken = []
+        utterances = []
+        interrupted = False
+        while True:
+            sentence = sentences.get()
+            if sentence is None:
+                break
+            if self._interrupted(turn, utterances):
+                interrupted = True
+                break
+            if isinstance(sentence, Exception):
+                if not spoken:
+                    sentence = self.fallback
+                else:
+                    continue
+            utterances.append(self.speak(sentence))
+            spoken.append(sentence)
+
+        preparer = None
+        if interrupted:
+            stop.set()
+        else:
+            # Everything is queued: get ready to listen while the last sentence plays
+            wait(utterances[:-1])
+            interrupted = self._interrupted(turn, utterances)
+            if self.prepare_listen and not interrupted:
+                preparer = threading.Thread(target=self.prepare_listen, daemon=True)
+                preparer.start()
+            wait(utterances[-1:])
+            if preparer is not None:
+                preparer.join()
+
+        # Utterances cut short by barge-in before they started have no start time
+        first_audio = getattr(utterances[0], 'started_at', None) if utterances else None
+        self.last_stats = {
+            'time_to_first_audio': first_audio - started if first_audio is not None else None,
+            'total_time': time.perf_counter() - started,
+            'sentences': len(spoken),
+            'interrupted': interrupted
+        }
+        return " ".join(spoken)
@@ -0,0 +1,152 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from typing import Optional
+
+from lazy_imports import lazy_import
+
+sr = lazy_import('speech_recognition')
+
+
+class RecognitionError(Exception):
+    """The backend could not produce a transcript."""
+
+
+class SpeechNotUnderstood(RecognitionError):
+    """The audio was processed but no speech was recognized."""
+
+
+class RecognitionServiceError(RecognitionError):
+    """The recognition service could not be reached or failed."""
+
+
+class RecognitionCancelled(RecognitionError):
+    """Recognition was cancelled before it finished."""
+
+
+class RecognitionTimeout(RecognitionError):
+    """Recognition did not finish within the allowed time."""
+
+
+class RecognizerBackend(ABC):
+    """
+    Interface for speech-to-text backends.
+
+    Implementations should check cancel_event wherever they can stop early
+    and raise RecognitionCancelled when it is set.
+    """
+
+    name = 'base'
+
+    @abstractmethod
+    def transcribe(self, audio_path: str, cancel_event: Optional[threading.Event] = None) -> str:
+        """
+        Transcribe an audio file.
+
+        Args:
+            audio_path (str): Path to a WAV/AIFF/FLAC file
+            cancel_event (Optional[threading.Event]): Set to request cancellation
+
+        Returns:
+            str: Transcript
+        """
+
+
+class GoogleRecognizer(RecognizerBackend):
+    """
+    Google Web Speech API through speech_recognition.
+
+    The request itself cannot be aborted once sent; cancellation is honoured
+    before it starts, and operation_timeout bounds how long it can block.
+
+    Parameters:
+        operation_timeout (Optional[float]): Network timeout in seconds (default: 30)
+        language (str): Recognition language (default: 'en-US')
+    """
+
+    name = 'google'
+
+    def __init__(self, operation_timeout: Optional[float] = 30, language: str = 'en-US'):
+        self.recognizer = sr.Recognizer()
+        self.recognizer.operation_timeout = operation_timeout
+        self.language = language
+
+    def transcribe(self, audio_path: str, cancel_event: Optional[threading.Event] = None) -> str:
+        with sr.AudioFile(audio_path) as source:
+            audio = self.recognizer.record(source)
+        if cancel_event is not None and cancel_event.is_set():
+            raise RecognitionCancelled()
+        try:
+            return self.recognizer.recognize_google(audio, language=self.language)
+        except sr.UnknownValueError as e:
+            raise SpeechNotUnderstood() from e
+        except sr.RequestError as e:
+            raise RecognitionServiceError(str(e)) from e
+
+
+class LocalRecognizer(RecognizerBackend):
+    """
+    Offline stand-in recognizer for tests and development.
+
+    Returns the contents of a sidecar transcript (<audio_path>.txt or the
+    audio path with its extension replaced by .txt) if one exists, otherwise
+    a fixed text, after an optional simulated (cancellable) latency.
+
+    Parameters:
+        text (str): Transcript returned when no sidecar file exists
+        delay (float): Simulated recognition latency in seconds
+    """
+
+    name = 'local'
+
+    def __init__(self, text: str = '', delay: float = 0.0):
+        self.text = text
+        self.delay = delay
+
+    def transcribe(self, audio_path: str, cancel_event: Optional[threading.Event] = None) -> str:
+        cancel_event = cancel_event or threading.Event()
+        if cancel_event.wait(self.delay):
+            raise RecognitionCancelled()
+
+        for sidecar in (audio_path + '.txt', os.path.splitext(audio_path)[0] + '.txt'):
+            if os.path.exists(sidecar):
+                with open(sidecar) as f:
+                    return f.read().strip()
+        if not self.text:
+            raise SpeechNotUnderstood()
+        return self.text
+
+
+def transcribe_with_timeout(
+    backend: RecognizerBackend,
+    audio_path: str,
+    timeout: Optional[float],
+    cancel_event: Optional[threading.Event] = None
+) -> str:
+    """
+    Run a backend on a helper thread and give up after timeout seconds.
+
+    On timeout the backend is asked to cancel and RecognitionTimeout is raised
+    without waiting for it to finish. Callers can also cancel the backend
+    early by setting cancel_event from another thread.
+
+    Args:
+        backend (RecognizerBackend): Recognizer to run
+        audio_path (str): Audio file to transcribe
+        timeout (Optional[float]): Seconds to wait (None waits forever)
+        cancel_event (Optional[threading.Event]): Set to request cancellation (default: a private event)
+
+    Returns:
+        str: Transcript
+    """
+    cancel_event = cancel_event or threading.Event()
+    executor = ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(backend.transcribe, audio_path, cancel_event)
+    try:
+        return future.result(timeout=timeout)
+    except TimeoutError:
+        cancel_event.set()
+        raise RecognitionTimeout(f"{backend.name} recognizer timed out after {timeout} s")
+    finally:
+        executor.shutdown(wait=False)
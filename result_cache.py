@@ -0,0 +1,201 @@
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'voice_assistant', 'results.sqlite')
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_MISSING = object()
+
+
+def hash_file(path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Return the SHA-256 of a file's contents.
+
+    Args:
+        path (str): File to hash
+        chunk_size (int): Read size in bytes
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_array(audio: np.ndarray, sample_rate: int) -> str:
+    """
+    Return the SHA-256 of an in-memory signal and its sampling rate.
+
+    Args:
+        audio (np.ndarray): Audio data
+        sample_rate (int): Sampling rate of the audio
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{audio.dtype.str}:{audio.shape}:{sample_rate}".encode())
+    digest.update(np.ascontiguousarray(audio).data)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Size-bounded, content-addressed on-disk cache shared between processes.
+
+    Values are pickled into a single SQLite database in WAL mode, so several
+    worker processes can read and write concurrently. When the total stored
+    size exceeds max_bytes, the least recently used entries are evicted.
+
+    Parameters:
+        path (Optional[str]): Database file (default: ~/.cache/voice_assistant/results.sqlite)
+        max_bytes (int): Upper bound on stored value bytes (default: 512 MB)
+    """
+
+    def __init__(self, path: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path or DEFAULT_CACHE_PATH
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS entries ('
+                ' key TEXT PRIMARY KEY,'
+                ' value BLOB NOT NULL,'
+                ' size INTEGER NOT NULL,'
+                ' created REAL NOT NULL,'
+                ' accessed REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)')
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(
+        content_hash: str,
+        namespace: str,
+        version: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Build a cache key from content and everything that affects the result.
+
+        Args:
+            content_hash (str): Hash of the input (see hash_file / hash_array)
+            namespace (str): Kind of result, e.g. 'transcript' or 'voice_analysis'
+            version (str): Version of the code producing the result
+            params (Optional[Dict[str, Any]]): Parameters the result depends on
+
+        Returns:
+            str: Cache key
+        """
+        spec = json.dumps(
+            {'content': content_hash, 'namespace': namespace, 'version': version, 'params': params or {}},
+            sort_keys=True,
+            default=str
+        )
+        return f"{namespace}:{hashlib.sha256(spec.encode()).hexdigest()}"
+
+    def get(self, key: str, default: Any = None, max_age: Optional[float] = None) -> Any:
+        """
+        Look up a value and mark it as recently used.
+
+        Args:
+            key (str): Cache key
+            default (Any): Returned on a miss
+            max_age (Optional[float]): Treat entries older than this many seconds as missing
+
+        Returns:
+            Any: Cached value or default
+        """
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute('SELECT value, created FROM entries WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return default
+            if max_age is not None and now - row[1] > max_age:
+                conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+                return default
+            conn.execute('UPDATE entries SET accessed = ? WHERE key = ?', (now, key))
+        try:
+            return pickle.loads(row[0])
+        except Exception:
+            self.delete(key)
+            return default
+
+    def set(self, key: str, value: Any):
+        """
+        Store a value, evicting least recently used entries if over budget.
+
+        Args:
+            key (str): Cache key
+            value (Any): Picklable value
+        """
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.execute(
+                    'INSERT OR REPLACE INTO entries (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)',
+                    (key, blob, len(blob), now, now)
+                )
+                self._evict(conn)
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+
+    def _evict(self, conn: sqlite3.Connection):
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in conn.execute('SELECT key, size FROM entries ORDER BY accessed').fetchall():
+            conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def delete(self, key: str):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM entries')
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key, computing and storing it on a miss.
+
+        Args:
+            key (str): Cache key
+            compute (Callable[[], Any]): Producer of the value
+
+        Returns:
+            Any: Cached or freshly computed value
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value)
+        return value
@@ -0,0 +1,54 @@
+from typing import Union
+
+import numpy as np
+
+
+class RunningStats:
+    """
+    Running count/mean/variance/min/max with O(1) memory.
+
+    Batches are merged with Chan's parallel form of Welford's algorithm, so
+    updating with a whole array costs one vectorized pass.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values: Union[np.ndarray, float]):
+        values = np.atleast_1d(np.asarray(values, dtype=np.float64))
+        n = values.size
+        if n == 0:
+            return
+        batch_mean = values.mean()
+        batch_m2 = np.sum((values - batch_mean) ** 2)
+        total = self.count + n
+        delta = batch_mean - self.mean
+        self.mean += delta * n / total
+        self._m2 += batch_m2 + delta ** 2 * self.count * n / total
+        self.count = total
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+
+    def merge(self, other: 'RunningStats'):
+        """Fold another accumulator into this one."""
+        if other.count == 0:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self._m2 += other._m2 + delta ** 2 * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.variance))
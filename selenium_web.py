@@ -1,43 +1,243 @@
+import atexit
+import json
 import logging
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from webdriver_manager.chrome import ChromeDriverManager  # ✅ Auto-manage ChromeDriver
+import os
+import queue
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from contextlib import contextmanager
+from functools import lru_cache
+
+from result_cache import ResultCache
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 
-class Inflow:
-    def __init__(self):
+WIKIPEDIA_URL = 'https://en.wikipedia.org'
+WEB_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'voice_assistant', 'web.sqlite')
+WEB_CACHE_VERSION = '1'
+CSS_SELECTOR = 'css selector'  # selenium By.CSS_SELECTOR, without importing selenium
+_MISSING = object()
+
+
+@lru_cache(maxsize=1)
+def chromedriver_path():
+    # ✅ Resolve (and download if needed) ChromeDriver once per process
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+
+def make_driver():
+    # Selenium is imported here so the HTTP path works without it
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+
+    options = Options()
+    options.add_argument("--headless")  # ✅ Runs in headless mode (optional)
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    return webdriver.Chrome(service=Service(chromedriver_path()), options=options)
+
+
+class DriverPool:
+    """Pool of warm browser sessions shared by every Inflow instance
+
+    Drivers are created on demand up to size and handed back after each
+    use instead of being quit, so only the first lookup pays for browser
+    startup. warm() starts that first driver in the background.
+    """
+    def __init__(self, size=1, factory=make_driver):
+        self.size = size
+        self.factory = factory
+        self._idle = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def warm(self):
+        def create():
+            try:
+                with self.driver():
+                    pass
+            except Exception as e:
+                logging.error(f"Error warming up WebDriver: {e}")
+        threading.Thread(target=create, daemon=True).start()
+        return self
+
+    def _acquire(self, timeout):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Driver pool is closed")
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                create = self._created < self.size
+                if create:
+                    self._created += 1
+        if not create:
+            return self._idle.get(timeout=timeout)
         try:
             logging.debug("Initializing WebDriver...")
+            driver = self.factory()
+            logging.debug("WebDriver initialized successfully.")
+            return driver
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    @contextmanager
+    def driver(self, timeout=60):
+        driver = self._acquire(timeout)
+        healthy = True
+        try:
+            yield driver
+        except Exception:
+            healthy = False
+            raise
+        finally:
+            if healthy and not self._closed:
+                self._idle.put(driver)
+            else:
+                # A session that failed mid-lookup may be wedged; replace it
+                with self._lock:
+                    self._created -= 1
+                _quit(driver)
 
-            options = Options()
-            options.add_argument("--headless")  # ✅ Runs in headless mode (optional)
-            options.add_argument("--disable-gpu")
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
+    def close(self):
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                _quit(self._idle.get_nowait())
+            except queue.Empty:
+                break
 
-            # ✅ Professional way to initialize WebDriver
-            self.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
 
-            logging.debug("WebDriver initialized successfully.")
+def _quit(driver):
+    try:
+        driver.quit()
+    except Exception as e:
+        logging.debug(f"Error quitting WebDriver: {e}")
 
-        except Exception as e:
-            logging.error(f"Error initializing WebDriver: {e}")
+
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_driver_pool():
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = DriverPool()
+            atexit.register(_shared_pool.close)
+        return _shared_pool
+
+
+class WikipediaClient:
+    """Wikipedia lookups over the REST summary endpoint, with an on-disk cache
+
+    Responses are kept in a ResultCache (SQLite, LRU-evicted above max_bytes)
+    and treated as stale after ttl seconds. Queries with no page are cached
+    too (as None), so repeated misses don't hit the network either.
+    base_url can point at a local stand-in server for testing.
+    """
+    def __init__(self, base_url=WIKIPEDIA_URL, timeout=5, ttl=24 * 3600, cache=None):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.ttl = ttl
+        self.cache = cache if cache is not None else ResultCache(WEB_CACHE_PATH, max_bytes=32 * 1024 * 1024)
+
+    @staticmethod
+    def normalize(query):
+        """Collapse runs of whitespace; the form used for both the cache key and the request"""
+        return ' '.join(query.split())
+
+    def _key(self, query):
+        return ResultCache.make_key(query.lower(), 'wiki_summary', WEB_CACHE_VERSION, {'base_url': self.base_url})
+
+    def fetch(self, query):
+        """Fetch a summary over HTTP; returns None when there is no page for the query"""
+        title = urllib.parse.quote(query.strip().replace(' ', '_'), safe='')
+        request = urllib.request.Request(
+            f"{self.base_url}/api/rest_v1/page/summary/{title}?redirect=true",
+            headers={'Accept': 'application/json', 'User-Agent': 'voice-assistant/1.0'}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                data = json.loads(response.read().decode('utf-8'))
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                return None
             raise
+        if data.get('type') == 'disambiguation' or not data.get('extract'):
+            return None
+        return {
+            'title': data.get('title', query),
+            'extract': data['extract'],
+            'url': data.get('content_urls', {}).get('desktop', {}).get('page', ''),
+            'source': 'api'
+        }
+
+    def summary(self, query):
+        query = self.normalize(query)
+        key = self._key(query)
+        info = self.cache.get(key, _MISSING, max_age=self.ttl)
+        if info is not _MISSING:
+            logging.debug(f"Cache hit for: {query}")
+            return dict(info, source='cache') if info is not None else None
+        info = self.fetch(query)
+        self.cache.set(key, info)
+        return info
+
+
+class Inflow:
+    """Wikipedia lookups: REST summary first, a pooled browser only after a miss
+
+    The browser pool is not touched until the first lookup the REST path
+    cannot answer, so lookups it does answer never start Chrome.
+    """
+    def __init__(self, base_url=WIKIPEDIA_URL, client=None, pool=None, use_browser=True):
+        self.base_url = base_url.rstrip('/')
+        self.client = client if client is not None else WikipediaClient(self.base_url)
+        self.use_browser = use_browser
+        self._pool = pool
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            self._pool = get_driver_pool()
+        return self._pool
 
     def get_info(self, query):
         try:
-            logging.debug(f"Opening Wikipedia to search for: {query}")
-            self.driver.get('https://www.wikipedia.org')
+            info = self.client.summary(query)
+            if info is not None:
+                logging.debug(f"Found summary for: {query} ({info['source']})")
+                return info
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            logging.warning(f"Summary lookup failed, falling back to the browser: {e}")
+
+        if not self.use_browser:
+            return None
+        return self.get_info_browser(query)
 
-            search = self.driver.find_element(By.XPATH, '//*[@id="searchInput"]')
-            search.send_keys(query)
-            search.submit()
+    def get_info_browser(self, query):
+        try:
+            logging.debug(f"Opening Wikipedia to search for: {query}")
+            with self.pool.driver() as driver:
+                # Search URL directly instead of loading the home page and submitting the form
+                driver.get(f"{self.base_url}/w/index.php?{urllib.parse.urlencode({'search': query})}")
+                paragraphs = driver.find_elements(CSS_SELECTOR, '#mw-content-text p')
+                extract = next((p.text.strip() for p in paragraphs if p.text.strip()), '')
+                info = {'title': driver.title, 'extract': extract, 'url': driver.current_url, 'source': 'browser'}
 
             logging.debug("Search completed!")
+            return info
 
         except Exception as e:
             logging.error(f"Error during the get_info method: {e}")
@@ -45,4 +245,4 @@ class Inflow:
 
 if __name__ == "__main__":
     assist = Inflow()
-    assist.get_info("dhoni")
+    print(assist.get_info("dhoni"))
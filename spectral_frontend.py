@@ -0,0 +1,119 @@
+from functools import lru_cache
+from typing import Dict
+
+import numpy as np
+
+from lazy_imports import lazy_import
+
+librosa = lazy_import('librosa')
+
+
+@lru_cache(maxsize=8)
+def get_window(n_fft: int) -> np.ndarray:
+    """
+    Return the (cached) periodic Hann window used for every STFT.
+
+    Args:
+        n_fft (int): FFT size
+
+    Returns:
+        np.ndarray: Window of length n_fft
+    """
+    return librosa.filters.get_window('hann', n_fft, fftbins=True)
+
+
+@lru_cache(maxsize=8)
+def get_mel_basis(sample_rate: int, n_fft: int, n_mels: int) -> np.ndarray:
+    """
+    Return the (cached) mel filterbank for the given frame layout.
+
+    Args:
+        sample_rate (int): Sampling rate of the audio
+        n_fft (int): FFT size
+        n_mels (int): Number of mel bands
+
+    Returns:
+        np.ndarray: Mel filterbank of shape (n_mels, 1 + n_fft // 2)
+    """
+    return librosa.filters.mel(sr=sample_rate, n_fft=n_fft, n_mels=n_mels)
+
+
+class Spectrum:
+    """
+    Spectral representation of one recording on a single frame grid.
+
+    The complex STFT and its magnitude are computed once on construction;
+    everything derived from them (dB spectrogram, RMS, mel spectrogram,
+    onset envelope) is computed on first access and then reused.
+    """
+
+    def __init__(
+        self,
+        audio: np.ndarray,
+        sample_rate: int,
+        n_fft: int = 2048,
+        hop_length: int = 512,
+        n_mels: int = 128
+    ):
+        self.audio = audio
+        self.sample_rate = sample_rate
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.n_mels = n_mels
+        self.stft = librosa.stft(
+            audio,
+            n_fft=n_fft,
+            hop_length=hop_length,
+            window=get_window(n_fft)
+        )
+        self.magnitude = np.abs(self.stft)
+        self._cache: Dict[str, np.ndarray] = {}
+
+    def _cached(self, name, compute):
+        if name not in self._cache:
+            self._cache[name] = compute()
+        return self._cache[name]
+
+    @property
+    def n_frames(self) -> int:
+        return self.magnitude.shape[1]
+
+    @property
+    def times(self) -> np.ndarray:
+        """Frame centre times in seconds."""
+        return self._cached('times', lambda: librosa.frames_to_time(
+            np.arange(self.n_frames),
+            sr=self.sample_rate,
+            hop_length=self.hop_length
+        ))
+
+    @property
+    def db(self) -> np.ndarray:
+        """Magnitude spectrogram in dB."""
+        return self._cached('db', lambda: librosa.amplitude_to_db(self.magnitude))
+
+    @property
+    def rms(self) -> np.ndarray:
+        """Time-domain RMS energy per frame, on the STFT frame grid."""
+        return self._cached('rms', lambda: librosa.feature.rms(
+            y=self.audio,
+            frame_length=self.n_fft,
+            hop_length=self.hop_length
+        )[0])
+
+    @property
+    def mel_db(self) -> np.ndarray:
+        """Log-power mel spectrogram (the input librosa uses for onsets)."""
+        def compute():
+            mel_basis = get_mel_basis(self.sample_rate, self.n_fft, self.n_mels)
+            return librosa.power_to_db(np.dot(mel_basis, self.magnitude ** 2))
+        return self._cached('mel_db', compute)
+
+    @property
+    def onset_envelope(self) -> np.ndarray:
+        """Spectral-flux onset strength envelope."""
+        return self._cached('onset_envelope', lambda: librosa.onset.onset_strength(
+            S=self.mel_db,
+            sr=self.sample_rate,
+            hop_length=self.hop_length
+        ))
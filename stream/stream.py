@@ -1,8 +1,10 @@
 import streamlit as st
 import sounddevice as sd
-import scipy.io.wavfile as wavfile
+import soundfile as sf
 import numpy as np
-import time
+import queue
+import threading
+from collections import deque
 from datetime import datetime
 import os
 
@@ -10,59 +12,111 @@ import os
 if not os.path.exists("recordings"):
     os.makedirs("recordings")
 
+class BackgroundRecorder:
+    """Capture audio on a callback stream and write it to disk as it arrives.
+
+    PortAudio's callback thread only copies each block into a queue; a writer
+    thread appends the blocks to the WAV file. Only the last few seconds are
+    kept in memory, for preview.
+    """
+    def __init__(self, filename, sample_rate=44100, blocksize=1024, preview_seconds=3):
+        self.filename = filename
+        self.sample_rate = sample_rate
+        self.blocksize = blocksize
+        self.frames_written = 0
+        self.dropped_blocks = 0
+        self.preview = deque(maxlen=max(1, int(preview_seconds * sample_rate / blocksize)))
+        # The callback appends to preview while the script thread copies it
+        self._preview_lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._writer = None
+        self._stream = None
+
+    def _callback(self, indata, frames, time, status):
+        if status.input_overflow:
+            self.dropped_blocks += 1
+        chunk = indata.copy()
+        self._queue.put(chunk)
+        with self._preview_lock:
+            self.preview.append(chunk[:, 0])
+
+    def _write_loop(self):
+        with sf.SoundFile(self.filename, mode='w', samplerate=self.sample_rate,
+                          channels=1, subtype='PCM_16') as wav:
+            while True:
+                chunk = self._queue.get()
+                if chunk is None:
+                    break
+                wav.write(chunk)
+                self.frames_written += len(chunk)
+
+    def start(self):
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+        self._stream = sd.InputStream(
+            samplerate=self.sample_rate,
+            channels=1,
+            dtype=np.float32,
+            blocksize=self.blocksize,
+            callback=self._callback
+        )
+        self._stream.start()
+
+    def stop(self):
+        """Stop capturing, flush the remaining blocks and close the file"""
+        self._stream.stop()
+        self._stream.close()
+        self._queue.put(None)
+        self._writer.join()
+
+    @property
+    def duration(self):
+        return self.frames_written / self.sample_rate
+
+    def preview_audio(self):
+        """Most recent few seconds of audio"""
+        with self._preview_lock:
+            blocks = list(self.preview)
+        return np.concatenate(blocks) if blocks else np.zeros(0, dtype=np.float32)
+
 # Initialize session state variables
-if 'recording' not in st.session_state:
-    st.session_state.recording = False
-if 'audio_data' not in st.session_state:
-    st.session_state.audio_data = []
+if 'recorder' not in st.session_state:
+    st.session_state.recorder = None
 if 'sample_rate' not in st.session_state:
     st.session_state.sample_rate = 44100  # CD quality audio
 if 'recordings' not in st.session_state:
     st.session_state.recordings = []
 
-def record_audio():
-    while st.session_state.recording:
-        # Record audio in chunks
-        audio_chunk = sd.rec(
-            frames=1024,
-            samplerate=st.session_state.sample_rate,
-            channels=1,
-            dtype=np.float32
-        )
-        sd.wait()  # Wait until recording is finished
-        st.session_state.audio_data.extend(audio_chunk)
+def start_recording():
+    # Generate filename with timestamp
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"recordings/recording_{timestamp}.wav"
+
+    recorder = BackgroundRecorder(filename, sample_rate=st.session_state.sample_rate)
+    recorder.timestamp = timestamp
+    recorder.start()
+    st.session_state.recorder = recorder
 
 def save_recording():
-    if len(st.session_state.audio_data) > 0:
-        # Convert to numpy array and scale to int16 range
-        audio_data = np.array(st.session_state.audio_data)
-        audio_data = (audio_data * 32767).astype(np.int16)
-        
-        # Generate filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"recordings/recording_{timestamp}.wav"
-        
-        # Save the WAV file
-        wavfile.write(filename, st.session_state.sample_rate, audio_data)
-        
+    recorder = st.session_state.recorder
+    st.session_state.recorder = None
+    recorder.stop()
+
+    if recorder.frames_written > 0:
         # Add to recordings list
         recording_info = {
-            'filename': filename,
-            'timestamp': timestamp,
-            'duration': len(audio_data) / st.session_state.sample_rate
+            'filename': recorder.filename,
+            'timestamp': recorder.timestamp,
+            'duration': recorder.duration
         }
         st.session_state.recordings.append(recording_info)
-        
-        # Clear the audio data
-        st.session_state.audio_data = []
-        return filename
+        return recorder.filename
     return None
 
 def toggle_recording():
-    st.session_state.recording = not st.session_state.recording
-    if st.session_state.recording:
+    if st.session_state.recorder is None:
         # Start new recording
-        st.session_state.audio_data = []
+        start_recording()
     else:
         # Stop and save recording
         filename = save_recording()
@@ -73,13 +127,20 @@ def toggle_recording():
 st.title("Audio Recording Application")
 
 # Record button
-if st.button("Record" if not st.session_state.recording else "Stop Recording"):
+if st.button("Record" if st.session_state.recorder is None else "Stop Recording"):
     toggle_recording()
 
 # Display recording status
-if st.session_state.recording:
+if st.session_state.recorder is not None:
+    recorder = st.session_state.recorder
     st.write("🔴 Recording in progress...")
-    record_audio()
+    st.write(f"Captured: {recorder.duration:.1f} seconds")
+    if recorder.dropped_blocks:
+        st.warning(f"{recorder.dropped_blocks} audio blocks dropped by the input device")
+    preview = recorder.preview_audio()
+    if len(preview):
+        # Plot a decimated envelope of the last few seconds
+        st.line_chart(np.abs(preview[::64]))
 else:
     st.write("⚪ Recording stopped")
 
@@ -91,8 +152,8 @@ if st.session_state.recordings:
         st.write(f"Filename: {recording['filename']}")
         st.write(f"Timestamp: {recording['timestamp']}")
         st.write(f"Duration: {recording['duration']:.2f} seconds")
-        
+
         # Add play button for the recording
         audio_file = open(recording['filename'], 'rb')
         st.audio(audio_file)
-        st.write("---")
\ No newline at end of file
+        st.write("---")
@@ -0,0 +1,330 @@
+import threading
+import time
+from typing import Dict, Optional, Union
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from audio_io import ANALYSIS_SAMPLE_RATE
+from running_stats import RunningStats
+from vad import VoiceActivityDetector, VoiceActivityTracker
+
+
+class AudioRingBuffer:
+    """
+    Fixed-capacity float32 ring buffer holding the most recent samples.
+
+    Parameters:
+        capacity (int): Number of samples retained
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=np.float32)
+        self._write = 0
+        self._filled = 0
+
+    def write(self, chunk: np.ndarray):
+        chunk = chunk[-self.capacity:]
+        n = len(chunk)
+        end = self._write + n
+        if end <= self.capacity:
+            self._data[self._write:end] = chunk
+        else:
+            split = self.capacity - self._write
+            self._data[self._write:] = chunk[:split]
+            self._data[:n - split] = chunk[split:]
+        self._write = end % self.capacity
+        self._filled = min(self.capacity, self._filled + n)
+
+    def latest(self, n_samples: Optional[int] = None) -> np.ndarray:
+        """
+        Return a contiguous copy of the most recent samples, oldest first.
+
+        Args:
+            n_samples (Optional[int]): Number of samples (default: all retained)
+
+        Returns:
+            np.ndarray: Audio samples
+        """
+        n = self._filled if n_samples is None else min(n_samples, self._filled)
+        start = (self._write - n) % self.capacity
+        if start + n <= self.capacity:
+            return self._data[start:start + n].copy()
+        return np.concatenate((self._data[start:], self._data[:self._write]))
+
+    def __len__(self):
+        return self._filled
+
+
+def contrast_bands(freqs: np.ndarray, fmin: float = 200.0, n_bands: int = 6, quantile: float = 0.02):
+    """
+    Octave sub-bands used for spectral contrast, laid out as in librosa.
+
+    Args:
+        freqs (np.ndarray): Frequency of every FFT bin
+        fmin (float): Upper edge of the lowest band (default: 200 Hz)
+        n_bands (int): Number of octave bands above the lowest (default: 6)
+        quantile (float): Share of each band averaged for its peak and valley (default: 0.02)
+
+    Returns:
+        List[Tuple[np.ndarray, int]]: Bin indices of each band and the number of bins averaged
+    """
+    edges = np.zeros(n_bands + 2)
+    edges[1:] = fmin * 2.0 ** np.arange(n_bands + 1)
+    bands = []
+    for k, (low, high) in enumerate(zip(edges[:-1], edges[1:])):
+        band = (freqs >= low) & (freqs <= high)
+        index = np.flatnonzero(band)
+        if k > 0:
+            band[index[0] - 1] = True
+        if k == n_bands:
+            band[index[-1] + 1:] = True
+        count = max(int(np.rint(quantile * band.sum())), 1)
+        index = np.flatnonzero(band)
+        if k < n_bands:
+            index = index[:-1]
+        bands.append((index, count))
+    return bands
+
+
+class StreamingVoiceAnalyzer:
+    """
+    Incremental voice analyzer fed with audio chunks as they are captured.
+
+    Each push() frames only the newly arrived samples and folds the per-frame
+    pitch, RMS, spectral centroid and contrast, pause and onset measurements into running
+    statistics, so snapshot() is O(1) and memory stays constant regardless of
+    session length. Pauses are the gaps between the speech segments of a
+    VoiceActivityTracker, the incremental form of the detector the file
+    analyzers use. Scores use the same formulas as VoiceRatingAnalyzer, but
+    on statistics gathered as the audio arrives (speaking rate is an onset
+    count rather than a tempo estimate), so they approximate what the file
+    analyzers would report for the same recording.
+
+    Parameters:
+        sample_rate (int): Sampling rate of the pushed audio (default: ANALYSIS_SAMPLE_RATE, 16 kHz)
+        frame_length (int): Analysis frame size in samples (default: 2048)
+        hop_length (int): Hop between frames in samples (default: 512)
+        history_seconds (float): Audio retained in the ring buffer (default: 10 s)
+        fmin (float): Lowest pitch searched (default: 65 Hz)
+        fmax (float): Highest pitch searched (default: 400 Hz)
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = ANALYSIS_SAMPLE_RATE,
+        frame_length: int = 2048,
+        hop_length: int = 512,
+        history_seconds: float = 10.0,
+        fmin: float = 65.0,
+        fmax: float = 400.0
+    ):
+        self.sample_rate = sample_rate
+        self.frame_length = frame_length
+        self.hop_length = hop_length
+        self.fmin = fmin
+        self.fmax = fmax
+        self.history = AudioRingBuffer(int(history_seconds * sample_rate))
+        self._window = np.hanning(frame_length + 1)[:-1].astype(np.float32)
+        self._freqs = np.fft.rfftfreq(frame_length, 1.0 / sample_rate)
+        self._contrast_bands = contrast_bands(self._freqs)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget all accumulated statistics."""
+        with self._lock:
+            self._pending = np.zeros(0, dtype=np.float32)
+            self._prev_log_mag = None
+            self._frames_seen = 0
+            self._samples_seen = 0
+            self._peak = 0.0
+            self._onsets = 0
+            self._last_onset = -np.inf
+            self.pitch = RunningStats()
+            self.rms = RunningStats()
+            self.centroid = RunningStats()
+            self.contrast = RunningStats()
+            self.flux = RunningStats()
+            self.activity = VoiceActivityTracker(
+                VoiceActivityDetector(self.sample_rate, self.frame_length, self.hop_length)
+            )
+
+    def push(self, chunk: np.ndarray) -> int:
+        """
+        Feed newly captured audio.
+
+        Args:
+            chunk (np.ndarray): Mono (or first-channel) audio samples
+
+        Returns:
+            int: Number of analysis frames completed by this chunk
+        """
+        chunk = np.asarray(chunk, dtype=np.float32)
+        if chunk.ndim > 1:
+            chunk = chunk[:, 0]
+
+        with self._lock:
+            self.history.write(chunk)
+            self._samples_seen += len(chunk)
+            if len(chunk):
+                self._peak = max(self._peak, float(np.max(np.abs(chunk))))
+
+            buffer = np.concatenate((self._pending, chunk))
+            if len(buffer) < self.frame_length:
+                self._pending = buffer
+                return 0
+
+            n_frames = 1 + (len(buffer) - self.frame_length) // self.hop_length
+            frames = sliding_window_view(buffer, self.frame_length)[::self.hop_length][:n_frames]
+            self._process_frames(frames)
+            self._pending = buffer[n_frames * self.hop_length:].copy()
+            return n_frames
+
+    def _process_frames(self, frames: np.ndarray):
+        first_index = self._frames_seen
+        self._frames_seen += len(frames)
+
+        # Energy
+        rms = np.sqrt(np.mean(frames.astype(np.float64) ** 2, axis=1))
+        self.rms.update(rms)
+
+        # Spectral centroid
+        spectrum = np.abs(np.fft.rfft(frames * self._window, axis=1))
+        centroid = spectrum @ self._freqs / (spectrum.sum(axis=1) + 1e-10)
+        self.centroid.update(centroid[rms > 1e-6])
+
+        # Spectral contrast: peak-to-valley level in dB per octave band
+        audible = spectrum[rms > 1e-6]
+        if len(audible):
+            contrast = np.zeros(len(audible))
+            for index, count in self._contrast_bands:
+                band = np.sort(audible[:, index], axis=1)
+                valley = np.maximum(band[:, :count].mean(axis=1), 1e-10)
+                peak = np.maximum(band[:, -count:].mean(axis=1), 1e-10)
+                contrast += 10 * np.log10(peak / valley)
+            self.contrast.update(contrast / len(self._contrast_bands))
+
+        # Spectral flux onsets with an adaptive threshold and 50 ms refractory period
+        log_mag = np.log1p(spectrum)
+        previous = log_mag[:1] if self._prev_log_mag is None else self._prev_log_mag[None, :]
+        flux = np.maximum(0.0, np.diff(np.vstack((previous, log_mag)), axis=0)).sum(axis=1)
+        self._prev_log_mag = log_mag[-1]
+        self.flux.update(flux)
+        threshold = self.flux.mean + self.flux.std
+        refractory = 0.05 * self.sample_rate / self.hop_length
+        for offset in np.flatnonzero(flux > threshold):
+            index = first_index + offset
+            if index - self._last_onset >= refractory:
+                self._onsets += 1
+                self._last_onset = index
+
+        # Speech segments; pauses are the gaps between them
+        self.activity.update(rms)
+
+        # Pitch from the normalized autocorrelation peak in the speech range
+        acf = np.fft.irfft(np.abs(np.fft.rfft(frames, n=2 * self.frame_length, axis=1)) ** 2, axis=1)
+        min_lag = max(1, int(self.sample_rate / self.fmax))
+        max_lag = min(self.frame_length - 1, int(self.sample_rate / self.fmin))
+        lags = acf[:, min_lag:max_lag + 1]
+        best = np.argmax(lags, axis=1)
+        strength = lags[np.arange(len(frames)), best] / (acf[:, 0] + 1e-10)
+        voiced = (strength > 0.3) & (rms > self.rms.mean * 0.5)
+        self.pitch.update(self.sample_rate / (best[voiced] + min_lag))
+
+    @property
+    def duration(self) -> float:
+        """Seconds of audio pushed so far."""
+        return self._samples_seen / self.sample_rate
+
+    def recent_audio(self, seconds: Optional[float] = None) -> np.ndarray:
+        """
+        Return the most recent audio from the ring buffer.
+
+        Args:
+            seconds (Optional[float]): Amount of audio (default: whole history)
+
+        Returns:
+            np.ndarray: Audio samples
+        """
+        with self._lock:
+            n = None if seconds is None else int(seconds * self.sample_rate)
+            return self.history.latest(n)
+
+    def snapshot(self) -> Dict[str, Union[float, Dict[str, float]]]:
+        """
+        Return scores for everything pushed so far.
+
+        Returns:
+            Dict containing parameter scores, overall score and raw statistics
+        """
+        with self._lock:
+            parameters = {}
+
+            if self.pitch.count:
+                stability_score = 100 - min(100, (self.pitch.std / self.pitch.mean) * 100)
+                range_score = 100 - min(100, abs(self.pitch.mean - 200) / 2)
+                parameters['pitch'] = float(np.mean([stability_score, range_score]))
+
+            if self.centroid.count:
+                contrast_score = min(100, self.contrast.mean * 20 + 50)
+                variation_score = min(100, max(0, 100 - self.centroid.std * 0.1))
+                parameters['frequency_variation'] = float(np.mean([contrast_score, variation_score]))
+
+            pause_metrics = self.activity.pause_metrics()
+            if self._frames_seen:
+                ratio_score = min(100, max(0, 100 - abs(pause_metrics['pause_ratio'] - 0.2) * 200))
+                # Evenly sized pauses score higher
+                if pause_metrics['pauses'] > 1:
+                    spacing_score = min(100, max(0, 100 - pause_metrics['pause_std'] * 50))
+                else:
+                    spacing_score = 50
+                parameters['pauses'] = float(np.mean([ratio_score, spacing_score]))
+
+                # Normalize energy by the running peak, as the batch analyzer does
+                mean_rms = self.rms.mean / (self._peak + 1e-6)
+                amplitude_score = min(100, max(0, mean_rms * 200 + 50))
+                onset_rate = self._onsets / max(self.duration, 1e-6) * 60
+                tempo_score = min(100, max(0, 100 - abs(onset_rate - 120) * 0.5))
+                parameters['confidence'] = float(np.mean([amplitude_score, tempo_score]))
+
+            overall_score = float(np.mean(list(parameters.values()))) if parameters else 0.0
+
+            return {
+                'parameters': parameters,
+                'overall_score': overall_score,
+                'duration': self.duration,
+                'statistics': {
+                    'pitch_mean': self.pitch.mean,
+                    'pitch_std': self.pitch.std,
+                    'rms_mean': self.rms.mean,
+                    'centroid_mean': self.centroid.mean,
+                    'centroid_std': self.centroid.std,
+                    'contrast_mean': self.contrast.mean,
+                    'pause_ratio': pause_metrics['pause_ratio'],
+                    'speech_ratio': pause_metrics['speech_ratio'],
+                    'onsets_per_minute': self._onsets / max(self.duration, 1e-6) * 60
+                }
+            }
+
+
+if __name__ == "__main__":
+    import sounddevice as sd
+
+    analyzer = StreamingVoiceAnalyzer()
+
+    def callback(indata, frames, time_info, status):
+        analyzer.push(indata[:, 0])
+
+    print("Streaming analysis... press Ctrl+C to stop")
+    with sd.InputStream(samplerate=analyzer.sample_rate, channels=1,
+                        blocksize=analyzer.hop_length, callback=callback):
+        try:
+            while True:
+                time.sleep(1)
+                result = analyzer.snapshot()
+                scores = ", ".join(f"{k}: {v:.1f}" for k, v in result['parameters'].items())
+                print(f"[{result['duration']:6.1f}s] overall {result['overall_score']:.1f} | {scores}")
+        except KeyboardInterrupt:
+            print("Stopped.")
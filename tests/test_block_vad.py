@@ -0,0 +1,54 @@
+"""
+The block path must find the same pauses as the in-memory analysis.
+
+Run from the repository root:
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from block_analysis import analyze_file_in_blocks  # noqa: E402
+from features import extract_features  # noqa: E402
+
+sf = pytest.importorskip('soundfile')
+
+SAMPLE_RATE = 16000
+
+
+def bursty_tone(seconds, rate=SAMPLE_RATE):
+    """A 200 Hz tone switched on for 0.35 s of every 0.6 s."""
+    t = np.arange(int(seconds * rate)) / rate
+    return 0.3 * np.sin(2 * np.pi * 200 * t) * ((t % 0.6) < 0.35)
+
+
+@pytest.fixture(scope='module')
+def speech_and_noise(tmp_path_factory):
+    """
+    Three 30 s stretches of bursts separated by two 30 s stretches of noise
+    only, over a -46 dBFS noise floor; the noise-only stretches fill whole
+    30 s blocks and are above the detector's -50 dBFS silence level.
+    """
+    rng = np.random.default_rng(0)
+    silence = np.zeros(30 * SAMPLE_RATE)
+    audio = np.concatenate([bursty_tone(30), silence, bursty_tone(30), silence, bursty_tone(30)])
+    audio = (audio + 10 ** (-46 / 20) * rng.standard_normal(len(audio))).astype(np.float32)
+    path = str(tmp_path_factory.mktemp('audio') / 'speech_and_noise.wav')
+    sf.write(path, audio, SAMPLE_RATE)
+    return audio, path
+
+
+def test_block_pauses_match_in_memory(speech_and_noise):
+    audio, path = speech_and_noise
+    in_memory = extract_features(audio, SAMPLE_RATE, ['pause_metrics'])['pause_metrics']
+    blocks = analyze_file_in_blocks(path, block_seconds=30.0)
+
+    # The noise-only blocks are pauses, not speech
+    assert in_memory['pause_ratio'] == pytest.approx(0.4, abs=0.05)
+    assert blocks['pause_ratio'] == pytest.approx(in_memory['pause_ratio'], abs=0.02)
+    assert blocks['speech_ratio'] == pytest.approx(in_memory['speech_ratio'], abs=0.02)
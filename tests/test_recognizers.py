@@ -0,0 +1,62 @@
+"""
+LocalRecognizer reads sidecar transcripts and honours cancellation.
+
+Run from the repository root:
+
+    python -m pytest tests
+"""
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from recognizers import (  # noqa: E402
+    LocalRecognizer,
+    RecognitionCancelled,
+    RecognitionTimeout,
+    SpeechNotUnderstood,
+    transcribe_with_timeout,
+)
+
+
+@pytest.fixture
+def recording(tmp_path):
+    return str(tmp_path / 'answer.wav')
+
+
+def test_reads_appended_sidecar(recording):
+    with open(recording + '.txt', 'w') as f:
+        f.write("  The commission recruits state officers.\n")
+    assert LocalRecognizer(text="fallback").transcribe(recording) == "The commission recruits state officers."
+
+
+def test_reads_replaced_extension_sidecar(recording):
+    with open(os.path.splitext(recording)[0] + '.txt', 'w') as f:
+        f.write("Preliminary, main and interview.")
+    assert LocalRecognizer().transcribe(recording) == "Preliminary, main and interview."
+
+
+def test_falls_back_to_fixed_text(recording):
+    assert LocalRecognizer(text="fixed transcript").transcribe(recording) == "fixed transcript"
+
+
+def test_no_sidecar_and_no_text_is_not_understood(recording):
+    with pytest.raises(SpeechNotUnderstood):
+        LocalRecognizer().transcribe(recording)
+
+
+def test_cancel_during_delay(recording):
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(RecognitionCancelled):
+        LocalRecognizer(text="too late", delay=5).transcribe(recording, cancel)
+
+
+def test_timeout_cancels_the_backend(recording):
+    cancel = threading.Event()
+    with pytest.raises(RecognitionTimeout):
+        transcribe_with_timeout(LocalRecognizer(text="too late", delay=5), recording, 0.05, cancel)
+    assert cancel.is_set()
@@ -0,0 +1,55 @@
+"""
+The streaming analyzer must score pauses like the file analyzers.
+
+Run from the repository root:
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from corpus import speech_like_signal  # noqa: E402
+from stream_analyzer import StreamingVoiceAnalyzer  # noqa: E402
+from vad import VoiceActivityDetector, VoiceActivityTracker, frame_rms  # noqa: E402
+from voice_rater import VoiceRatingAnalyzer  # noqa: E402
+
+SAMPLE_RATE = 16000
+
+
+@pytest.fixture(scope='module')
+def speech():
+    return speech_like_signal(60, SAMPLE_RATE, seed=3)
+
+
+def test_tracker_matches_detector(speech):
+    detector = VoiceActivityDetector(SAMPLE_RATE)
+    rms = frame_rms(speech, center=False)
+    expected = detector.detect(rms=rms).pause_metrics()
+
+    tracker = VoiceActivityTracker(detector)
+    for start in range(0, len(rms), 4):
+        tracker.update(rms[start:start + 4])
+    metrics = tracker.pause_metrics()
+
+    assert metrics['segments'] == expected['segments']
+    assert metrics['pause_ratio'] == pytest.approx(expected['pause_ratio'], abs=0.01)
+    assert metrics['pause_std'] == pytest.approx(expected['pause_std'], abs=0.02)
+
+
+def test_streaming_pause_score_matches_file_analysis(speech):
+    streaming = StreamingVoiceAnalyzer(sample_rate=SAMPLE_RATE)
+    for start in range(0, len(speech), 512):
+        streaming.push(speech[start:start + 512])
+
+    analyzer = VoiceRatingAnalyzer()
+    audio = speech / np.max(np.abs(speech))
+    expected = analyzer.analyze_pauses(audio, analyzer.features(audio))
+
+    assert streaming.snapshot()['parameters']['pauses'] == pytest.approx(expected, abs=2)
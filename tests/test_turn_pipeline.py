@@ -0,0 +1,128 @@
+"""
+TurnPipeline streaming from the local FakeLLMServer and speaking through a
+TTSWorker with a fake pyttsx3 engine.
+
+Run from the repository root:
+
+    python -m pytest tests
+"""
+import itertools
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'proj'))
+
+from fake_llm_server import DEFAULT_RESPONSE, FakeLLMServer  # noqa: E402
+from tts_worker import TTSWorker  # noqa: E402
+from turn_pipeline import HttpStreamingLLM, TurnPipeline, split_sentences  # noqa: E402
+
+
+class FakeEngine:
+    """Stands in for a pyttsx3 engine; records what it was asked to speak."""
+
+    def __init__(self):
+        self.spoken = []
+        self.first_spoken = threading.Event()
+        self._text = None
+
+    def connect(self, name, callback):
+        pass
+
+    def say(self, text):
+        self._text = text
+
+    def runAndWait(self):
+        self.spoken.append(self._text)
+        self.first_spoken.set()
+
+    def stop(self):
+        pass
+
+
+class BargeInLLM:
+    """
+    Streams one sentence, waits until it has been spoken, interrupts the
+    worker as the barge-in monitor would, then keeps streaming sentences.
+    """
+
+    def __init__(self, engine, worker):
+        self.engine = engine
+        self.worker = worker
+        self.closed = threading.Event()
+
+    def stream(self, prompt):
+        try:
+            yield "First sentence here. "
+            assert self.engine.first_spoken.wait(5)
+            self.worker.interrupt()
+            for n in itertools.count(2):
+                yield f"Sentence number {n} follows. "
+                time.sleep(0.01)
+        finally:
+            self.closed.set()
+
+
+def test_turn_against_fake_llm_server():
+    engine = FakeEngine()
+    worker = TTSWorker(engine_factory=lambda: engine)
+    prepared = threading.Event()
+    with FakeLLMServer(token_delay=0.1) as server:
+        pipeline = TurnPipeline(HttpStreamingLLM(server.url), worker.say, prepare_listen=prepared.set,
+                                generation=lambda: worker.generation)
+        try:
+            text = pipeline.run_turn("What is MPSC?")
+        finally:
+            worker.close(wait=False)
+
+    expected = list(split_sentences([DEFAULT_RESPONSE]))
+    assert server.prompts == ["What is MPSC?"]
+    assert engine.spoken == expected
+    assert text == " ".join(expected)
+    assert prepared.is_set()
+    stats = pipeline.last_stats
+    assert stats['sentences'] == len(expected)
+    assert not stats['interrupted']
+    # Speech starts with the first sentence, well before the response is complete
+    streaming_time = 0.1 * len(DEFAULT_RESPONSE.split(" ")) / server.words_per_chunk
+    assert stats['time_to_first_audio'] < streaming_time / 2 < stats['total_time']
+
+
+def test_unreachable_llm_speaks_the_fallback():
+    engine = FakeEngine()
+    worker = TTSWorker(engine_factory=lambda: engine)
+    server = FakeLLMServer()
+    url = server.url
+    server.stop()
+    pipeline = TurnPipeline(HttpStreamingLLM(url, timeout=5), worker.say)
+    try:
+        text = pipeline.run_turn("hello")
+    finally:
+        worker.close(wait=False)
+
+    assert text == pipeline.fallback
+    assert engine.spoken == [pipeline.fallback]
+
+
+def test_barge_in_ends_the_turn():
+    engine = FakeEngine()
+    worker = TTSWorker(engine_factory=lambda: engine)
+    prepared = threading.Event()
+    llm = BargeInLLM(engine, worker)
+    pipeline = TurnPipeline(llm, worker.say, prepare_listen=prepared.set,
+                            generation=lambda: worker.generation)
+    try:
+        text = pipeline.run_turn("hello")
+        assert worker.wait_idle(5)
+    finally:
+        worker.close(wait=False)
+
+    assert engine.spoken == ["First sentence here."]
+    assert text == "First sentence here."
+    assert pipeline.last_stats['interrupted']
+    assert not prepared.is_set()
+    # The producer stops pulling from the LLM instead of draining the stream
+    assert llm.closed.wait(5)
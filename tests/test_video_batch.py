@@ -0,0 +1,59 @@
+"""
+Shard boundaries of the headless video batch must not skip or repeat frames.
+
+Run from the repository root:
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip('cv2')
+
+from video.video_batch import grab_range, plan_shards  # noqa: E402
+
+FPS = 25
+
+
+class ApproximateSeekCapture:
+    """
+    Stands in for cv2.VideoCapture on a stream whose POS_FRAMES seeks land
+    `error` frames away from the requested frame, as keyframe seeks do.
+    """
+
+    def __init__(self, frame_count, error):
+        self.frame_count = frame_count
+        self.error = error
+        self._next = 0
+        self._current = None
+
+    def set(self, prop, value):
+        self._next = max(0, int(value) + self.error)
+        return True
+
+    def grab(self):
+        if self._next >= self.frame_count:
+            return False
+        self._current, self._next = self._next, self._next + 1
+        return True
+
+    def get(self, prop):
+        # CAP_PROP_POS_MSEC after grab: the grabbed frame's timestamp
+        return self._current * 1000.0 / FPS
+
+
+@pytest.mark.parametrize('error', [-7, 0, 3, 40])
+def test_shards_cover_every_frame_once(error):
+    frame_count = 500
+    indices = []
+    for start, end in plan_shards(frame_count, FPS, shard_seconds=3):
+        indices.extend(grab_range(ApproximateSeekCapture(frame_count, error), start, end, FPS))
+    assert indices == list(range(frame_count))
+
+
+def test_open_ended_shard_reads_to_the_end():
+    assert list(grab_range(ApproximateSeekCapture(40, 0), *plan_shards(0, FPS)[0], FPS)) == list(range(40))
@@ -0,0 +1,64 @@
+"""
+WikipediaClient and Inflow against the local FakeWikiServer.
+
+Run from the repository root:
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_wiki_server import FakeWikiServer  # noqa: E402
+from result_cache import ResultCache  # noqa: E402
+from selenium_web import Inflow, WikipediaClient  # noqa: E402
+
+
+@pytest.fixture
+def server():
+    with FakeWikiServer() as server:
+        yield server
+
+
+@pytest.fixture
+def client(server, tmp_path):
+    return WikipediaClient(server.url, cache=ResultCache(str(tmp_path / 'web.sqlite')))
+
+
+def summary_requests(server):
+    return [path for path in server.requests if path.startswith('/api/rest_v1/page/summary/')]
+
+
+def test_cache_hit_makes_no_second_request(server, client):
+    first = client.summary("MS Dhoni")
+    second = client.summary("MS Dhoni")
+
+    assert first['source'] == 'api'
+    assert second['source'] == 'cache'
+    assert second['extract'] == first['extract']
+    assert len(summary_requests(server)) == 1
+
+
+def test_missing_page_is_cached_as_none(server, client):
+    assert client.summary("No such article") is None
+    assert client.summary("No such article") is None
+    assert len(summary_requests(server)) == 1
+
+
+def test_queries_are_normalized_before_the_request(server, client):
+    assert client.summary("  MS   Dhoni ")['title'] == "MS Dhoni"
+    assert client.summary("ms dhoni")['source'] == 'cache'
+    assert summary_requests(server) == ['/api/rest_v1/page/summary/MS_Dhoni?redirect=true']
+
+
+def test_rest_hit_never_starts_the_browser(server, client):
+    class UnusablePool:
+        def driver(self, timeout=60):
+            raise AssertionError("The browser pool must not be used")
+
+    inflow = Inflow(server.url, client=client, pool=UnusablePool())
+    assert inflow.get_info("Python (programming language)")['source'] == 'api'
+    assert inflow.get_info("python (programming language)")['source'] == 'cache'
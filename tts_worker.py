@@ -0,0 +1,273 @@
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+import numpy as np
+
+
+def default_engine():
+    """pyttsx3 engine with the assistant's usual rate and voice."""
+    import pyttsx3
+
+    engine = pyttsx3.init()
+    engine.setProperty('rate', 130)
+    voices = engine.getProperty('voices')
+    engine.setProperty('voice', voices[0].id)  # voices[0] -> male, voices[1] -> female
+    return engine
+
+
+class Utterance(Future):
+    """Future for one queued utterance; started_at is set when playback begins."""
+
+    def __init__(self, text: str):
+        super().__init__()
+        self.text = text
+        self.started_at: Optional[float] = None
+
+
+class TTSWorker:
+    """
+    Speaks queued utterances on a dedicated thread that owns the TTS engine.
+
+    say() returns immediately with an Utterance future that resolves to True
+    when the utterance was spoken completely and False if it was cut short
+    by interrupt(); utterances dropped from the queue by interrupt() are
+    cancelled. The queue is bounded, so say() blocks once max_queue
+    utterances are waiting. Call wait_idle() before listening, so the
+    microphone does not record the assistant's own voice.
+
+    Parameters:
+        engine_factory (Callable): Creates the pyttsx3 engine (called on the worker thread)
+        max_queue (int): Maximum number of waiting utterances (default: 8)
+    """
+
+    def __init__(self, engine_factory: Callable = default_engine, max_queue: int = 8):
+        self._engine_factory = engine_factory
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        # say() and interrupt() run on the caller's, the worker's and audio callback threads
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._pending = 0
+        self._idle = threading.Event()
+        self._idle.set()
+        self._current_generation = None
+        self._speaking = threading.Event()
+        self._ready = threading.Event()
+        self._engine = None
+        self._startup_error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._startup_error is not None:
+            raise self._startup_error
+
+    @property
+    def is_speaking(self) -> bool:
+        return self._speaking.is_set()
+
+    @property
+    def generation(self) -> int:
+        """Barge-in counter; interrupt() increments it."""
+        with self._lock:
+            return self._generation
+
+    def _run(self):
+        try:
+            self._engine = self._engine_factory()
+            self._engine.connect('started-word', self._on_word)
+        except Exception as e:
+            self._startup_error = e
+            return
+        finally:
+            self._ready.set()
+
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            generation, future = item
+            try:
+                if generation < self._generation or not future.set_running_or_notify_cancel():
+                    continue
+                self._current_generation = generation
+                self._speaking.set()
+                future.started_at = time.perf_counter()
+                try:
+                    self._engine.say(future.text)
+                    self._engine.runAndWait()
+                    future.set_result(generation == self._generation)
+                except Exception as e:
+                    future.set_exception(e)
+                finally:
+                    self._speaking.clear()
+                    self._current_generation = None
+            finally:
+                self._done(1)
+
+    def _done(self, count: int):
+        with self._lock:
+            self._pending -= count
+            if self._pending == 0:
+                self._idle.set()
+
+    def _on_word(self, name, location, length):
+        # Runs on the worker thread inside runAndWait, where stop() is safe
+        if self._current_generation is not None and self._current_generation < self._generation:
+            self._engine.stop()
+
+    def say(self, text: str, timeout: Optional[float] = None) -> Utterance:
+        """
+        Queue an utterance.
+
+        Args:
+            text (str): Text to speak
+            timeout (Optional[float]): Seconds to wait for queue space (default: forever)
+
+        Returns:
+            Utterance: Resolves to True if spoken completely, False if interrupted
+        """
+        future = Utterance(text)
+        with self._lock:
+            generation = self._generation
+            self._pending += 1
+            self._idle.clear()
+        try:
+            self._queue.put((generation, future), timeout=timeout)
+        except queue.Full:
+            self._done(1)
+            raise
+        return future
+
+    def interrupt(self):
+        """Barge-in: stop the current utterance and drop everything queued."""
+        with self._lock:
+            self._generation += 1
+        dropped = 0
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)
+                break
+            item[1].cancel()
+            dropped += 1
+        if dropped:
+            self._done(dropped)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every queued utterance has been spoken or dropped.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait (default: forever)
+
+        Returns:
+            bool: True if the worker is idle
+        """
+        return self._idle.wait(timeout)
+
+    def close(self, wait: bool = True):
+        """
+        Stop the worker thread.
+
+        Args:
+            wait (bool): Finish queued utterances first (otherwise they are dropped)
+        """
+        if not wait:
+            self.interrupt()
+        self._queue.put(None)
+        self._thread.join()
+
+
+class BargeInMonitor:
+    """
+    Interrupts a TTSWorker when the microphone picks up the user speaking.
+
+    Audio is watched on a separate sounddevice input stream, and only while
+    the worker is speaking. Without a headset the microphone also hears the
+    assistant, so the monitor tracks that echo: the median energy of the
+    recent playback blocks. A block counts as the user speaking only if
+    its RMS energy (int16 units, like speech_recognition's energy_threshold)
+    exceeds both the threshold and echo_ratio times the echo level. The
+    first echo_warmup blocks of each utterance only measure the echo. If
+    min_blocks consecutive blocks count as speech, the worker is interrupted.
+
+    Parameters:
+        worker (TTSWorker): Worker to interrupt
+        threshold (Callable[[], float]): Returns the current energy threshold
+        sample_rate (int): Capture rate (default: 16000 Hz)
+        block_ms (float): Block length (default: 30 ms)
+        min_blocks (int): Consecutive loud blocks needed (default: 5)
+        echo_ratio (float): How much louder than the echo the user must be (default: 2, ~6 dB)
+        echo_warmup (int): Blocks measured before barge-in is armed (default: 10)
+        echo_history (int): Playback blocks the echo level is taken from (default: 100, 3 s)
+    """
+
+    def __init__(
+        self,
+        worker: TTSWorker,
+        threshold: Callable[[], float],
+        sample_rate: int = 16000,
+        block_ms: float = 30,
+        min_blocks: int = 5,
+        echo_ratio: float = 2.0,
+        echo_warmup: int = 10,
+        echo_history: int = 100
+    ):
+        self.worker = worker
+        self.threshold = threshold
+        self.sample_rate = sample_rate
+        self.blocksize = int(sample_rate * block_ms / 1000)
+        self.min_blocks = min_blocks
+        self.echo_ratio = echo_ratio
+        self.echo_warmup = echo_warmup
+        self.interruptions = 0
+        self._loud_blocks = 0
+        self._playback_blocks = 0
+        self._echo = deque(maxlen=echo_history)
+        self._stream = None
+
+    def _callback(self, indata, frames, time, status):
+        if not self.worker.is_speaking:
+            self._loud_blocks = 0
+            self._playback_blocks = 0
+            return
+        energy = np.sqrt(np.mean(indata[:, 0].astype(np.float64) ** 2))
+        self._playback_blocks += 1
+        if self._playback_blocks <= self.echo_warmup:
+            self._echo.append(energy)
+            return
+        echo = float(np.median(self._echo))
+        loud = energy > self.threshold() and energy > echo * self.echo_ratio
+        if not loud:
+            # Only blocks that are not barge-in candidates update the echo level
+            self._echo.append(energy)
+        self._loud_blocks = self._loud_blocks + 1 if loud else 0
+        if self._loud_blocks >= self.min_blocks:
+            self._loud_blocks = 0
+            self.interruptions += 1
+            self.worker.interrupt()
+
+    def start(self):
+        import sounddevice as sd
+
+        self._stream = sd.InputStream(
+            samplerate=self.sample_rate,
+            channels=1,
+            dtype='int16',
+            blocksize=self.blocksize,
+            callback=self._callback
+        )
+        self._stream.start()
+        return self
+
+    def stop(self):
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
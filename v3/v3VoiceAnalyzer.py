@@ -1,36 +1,114 @@
 import numpy as np
-import librosa
-import sounddevice as sd
-import soundfile as sf
 import threading
 import datetime
 import os
-import speech_recognition as sr
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lazy_imports import lazy_import
+from audio_io import ANALYSIS_SAMPLE_RATE, capture_rate, load_audio, resample
+from instrumentation import Instrumentation
+from block_analysis import analyze_file_in_blocks, audio_duration
+from features import FeatureContext
+from phrase_matcher import PhraseMatcher
+from recognizers import (
+    GoogleRecognizer, RecognitionCancelled, RecognitionServiceError,
+    RecognitionTimeout, SpeechNotUnderstood, transcribe_with_timeout
+)
+from result_cache import ResultCache, hash_array, hash_file
+
+# Heavy dependencies load on first use
+sd = lazy_import('sounddevice')
+sf = lazy_import('soundfile')
+
+# Bump when analysis or transcription output changes, to invalidate cached results
+ANALYZER_VERSION = "3.4"
+
+class AudioBuffer:
+    """Preallocated float32 sample buffer that doubles its capacity when full"""
+    def __init__(self, initial_capacity):
+        self._data = np.zeros(initial_capacity, dtype=np.float32)
+        self._size = 0
+        self._lock = threading.Lock()
+        
+    def append(self, chunk):
+        """Copy a block of samples into the buffer, growing it if needed"""
+        n = len(chunk)
+        with self._lock:
+            needed = self._size + n
+            if needed > len(self._data):
+                grown = np.zeros(max(needed, 2 * len(self._data)), dtype=np.float32)
+                grown[:self._size] = self._data[:self._size]
+                self._data = grown
+            self._data[self._size:needed] = chunk
+            self._size = needed
+            
+    def view(self):
+        """Zero-copy view of the captured samples (overwritten after clear())"""
+        with self._lock:
+            return self._data[:self._size]
+        
+    def clear(self):
+        with self._lock:
+            self._size = 0
+            
+    def __len__(self):
+        return self._size
 
 class AudioRecorder:
-    def __init__(self, sample_rate=44100):
+    """Callback-driven recorder; captures at the analysis rate when the device allows it"""
+    def __init__(self, sample_rate=ANALYSIS_SAMPLE_RATE, blocksize=1024, initial_seconds=60):
+        self.preferred_sample_rate = sample_rate
+        # Resolved against the input device when recording starts
         self.sample_rate = sample_rate
+        self.blocksize = blocksize
         self.recording = False
-        self.audio_data = []
+        self.buffer = AudioBuffer(int(initial_seconds * sample_rate))
+        self.stream = None
+        self.overflows = 0
+        self.underflows = 0
+        
+    @property
+    def audio_data(self):
+        """Zero-copy view of the audio captured so far"""
+        return self.buffer.view()
+        
+    def _callback(self, indata, frames, time, status):
+        """Called by PortAudio on its own thread for every captured block"""
+        if status.input_overflow:
+            self.overflows += 1
+        if status.input_underflow:
+            self.underflows += 1
+        self.buffer.append(indata[:, 0])
         
     def start_recording(self):
         """Start recording audio"""
         self.recording = True
-        self.audio_data = []
-        
-        def record():
-            with sd.InputStream(samplerate=self.sample_rate, channels=1) as stream:
-                while self.recording:
-                    audio_chunk, _ = stream.read(self.sample_rate)
-                    self.audio_data.extend(audio_chunk.flatten())
-                    
-        self.record_thread = threading.Thread(target=record)
-        self.record_thread.start()
+        self.buffer.clear()
+        self.overflows = 0
+        self.underflows = 0
+        self.sample_rate = capture_rate(self.preferred_sample_rate)
+        
+        self.stream = sd.InputStream(
+            samplerate=self.sample_rate,
+            channels=1,
+            dtype='float32',
+            blocksize=self.blocksize,
+            callback=self._callback
+        )
+        self.stream.start()
         
     def stop_recording(self):
         """Stop recording and save the audio file"""
         self.recording = False
-        self.record_thread.join()
+        # Returns once the in-flight block (blocksize / sample_rate seconds) is delivered
+        self.stream.stop()
+        self.stream.close()
+        self.stream = None
+        
+        if self.overflows or self.underflows:
+            print(f"Warning: {self.overflows} input overflows, {self.underflows} underflows")
         
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"recording_{timestamp}.wav"
@@ -38,51 +116,63 @@ class AudioRecorder:
         os.makedirs("recordings", exist_ok=True)
         filepath = os.path.join("recordings", filename)
         
-        sf.write(filepath, np.array(self.audio_data), self.sample_rate)
+        sf.write(filepath, self.audio_data, self.sample_rate)
         return filepath
 
 class VoiceAnalyzer:
-    def __init__(self):
+    def __init__(self, cache=True, recognizer=None, asr_timeout=30, instrumentation=None):
         self.recorder = AudioRecorder()
-        self.recognizer = sr.Recognizer()
+        # Per-stage timings; when enabled, results carry a 'timings' entry
+        self.instrumentation = instrumentation or Instrumentation()
+        self.cache = ResultCache() if cache is True else (cache or None)
+        # Any recognizers.RecognizerBackend; LocalRecognizer works offline
+        self.recognizer = recognizer or GoogleRecognizer()
+        self.asr_timeout = asr_timeout
         self.filler_words = {
             'um', 'uh', 'ah', 'er', 'like', 'you know', 'sort of', 'kind of',
             'basically', 'literally', 'actually', 'so', 'well', 'i mean',
             'right', 'okay', 'hmm', 'mhm'
         }
-        
-    def transcribe_audio(self, audio_path):
-        """Convert speech to text"""
-        with sr.AudioFile(audio_path) as source:
-            audio = self.recognizer.record(source)
-            try:
-                text = self.recognizer.recognize_google(audio)
-                return text.lower()
-            except sr.UnknownValueError:
-                return "Speech recognition could not understand the audio"
-            except sr.RequestError:
-                return "Could not request results from speech recognition service"
+        self.filler_matcher = PhraseMatcher({'filler': self.filler_words})
+        # Files longer than this are analyzed block by block
+        self.max_in_memory_seconds = 600
+        
+    def transcribe_audio(self, audio_path, cancel_event=None):
+        """Convert speech to text; setting cancel_event stops the recognizer early"""
+        key = None
+        if self.cache is not None:
+            key = self.cache.make_key(hash_file(audio_path), 'transcript', ANALYZER_VERSION,
+                                      {'backend': self.recognizer.name})
+            text = self.cache.get(key)
+            if text is not None:
+                return text
+        
+        try:
+            with self.instrumentation.stage('asr'):
+                text = transcribe_with_timeout(self.recognizer, audio_path, self.asr_timeout, cancel_event)
+        except SpeechNotUnderstood:
+            return "Speech recognition could not understand the audio"
+        except RecognitionServiceError:
+            return "Could not request results from speech recognition service"
+        except RecognitionTimeout:
+            return "Speech recognition timed out"
+        except RecognitionCancelled:
+            return "Speech recognition was cancelled"
+        
+        # Only successful transcripts are cached; failures are retried next time
+        text = text.lower()
+        if key is not None:
+            self.cache.set(key, text)
+        return text
 
     def analyze_filler_words(self, text):
         """Analyze the use of filler words in the text"""
-        words = text.lower().split()
-        total_words = len(words)
-        filler_count = {}
-        total_fillers = 0
-        
-        # Count individual filler words
-        for word in words:
-            if word in self.filler_words:
-                filler_count[word] = filler_count.get(word, 0) + 1
-                total_fillers += 1
-        
-        # Check for multi-word fillers
-        text_lower = text.lower()
-        for filler in self.filler_words:
-            if ' ' in filler and filler in text_lower:
-                count = text_lower.count(filler)
-                filler_count[filler] = count
-                total_fillers += count
+        # Single- and multi-word fillers in one pass, on whole words only
+        with self.instrumentation.stage('filler_words'):
+            summary = self.filler_matcher.summarize(text)
+        total_words = summary['word_count']
+        filler_count = summary['counts']['filler']
+        total_fillers = summary['totals']['filler']
         
         return {
             'total_words': total_words,
@@ -101,52 +191,119 @@ class VoiceAnalyzer:
         audio_path = self.recorder.stop_recording()
         print(f"Recording saved to: {audio_path}")
         
-        # Transcribe speech
-        transcribed_text = self.transcribe_audio(audio_path)
-        
-        # Analyze voice characteristics
-        voice_analysis = self.analyze_voice(audio_path)
-        
-        # Analyze filler words
-        filler_analysis = self.analyze_filler_words(transcribed_text)
+        with self.instrumentation.collect() as timings:
+            # Transcribe speech (network-bound) in the background while the
+            # voice characteristics (CPU-bound) are analyzed on this thread
+            cancel_asr = threading.Event()
+            executor = ThreadPoolExecutor(max_workers=1)
+            transcript_future = executor.submit(self.transcribe_audio, audio_path, cancel_asr)
+            try:
+                # Analyze voice characteristics straight from the recorder's buffer
+                try:
+                    voice_analysis = self.analyze_voice(
+                        audio_path,
+                        audio=self.recorder.audio_data,
+                        sample_rate=self.recorder.sample_rate
+                    )
+                except BaseException:
+                    # Nobody will read the transcript; stop the recognizer
+                    cancel_asr.set()
+                    raise
+                # transcribe_audio enforces asr_timeout itself
+                transcribed_text = transcript_future.result()
+            finally:
+                executor.shutdown(wait=False)
+            
+            # Analyze filler words
+            filler_analysis = self.analyze_filler_words(transcribed_text)
         
         # Adjust confidence score based on filler word usage
         filler_penalty = min(filler_analysis['filler_percentage'] / 100, 0.3)  # Max 30% penalty
         adjusted_confidence = voice_analysis['confidence_score'] * (1 - filler_penalty)
         
-        return {
+        result = {
             'voice_analysis': voice_analysis,
             'transcribed_text': transcribed_text,
             'filler_analysis': filler_analysis,
             'final_confidence_score': adjusted_confidence
-        }, audio_path
+        }
+        if self.instrumentation.enabled:
+            result['timings'] = timings
+        return result, audio_path
 
-    def analyze_voice(self, audio_path):
-        """Analyze voice characteristics using librosa"""
-        # Load audio file
-        y, sr = librosa.load(audio_path)
-        
-        # Calculate various voice characteristics
-        
-        # 1. Pitch analysis
-        pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
-        pitch_mean = np.mean(pitches[pitches > 0])
-        pitch_std = np.std(pitches[pitches > 0])
-        pitch_stability = 1.0 / (pitch_std + 1e-6)
-        
-        # 2. Volume/energy analysis
-        rms = librosa.feature.rms(y=y)[0]
+    def analyze_voice(self, audio_path, audio=None, sample_rate=None, use_cache=True):
+        """Analyze voice characteristics using librosa
+        
+        If audio (and its sample_rate) is given it is analyzed directly and
+        audio_path is not read. Results are cached by audio content; the
+        'timings' entry added when instrumentation is enabled is not.
+        use_cache=False bypasses the cache for this call (e.g. warm-up runs).
+        """
+        with self.instrumentation.collect() as timings:
+            with self.instrumentation.stage('total'):
+                if self.cache is None or not use_cache:
+                    result = self._analyze_voice(audio_path, audio, sample_rate)
+                else:
+                    with self.instrumentation.stage('cache_key'):
+                        content = hash_file(audio_path) if audio is None else hash_array(audio, sample_rate)
+                    key = self.cache.make_key(content, 'voice_analysis', ANALYZER_VERSION,
+                                              {'max_in_memory_seconds': self.max_in_memory_seconds,
+                                               'sample_rate': ANALYSIS_SAMPLE_RATE})
+                    result = self.cache.get_or_compute(
+                        key, lambda: self._analyze_voice(audio_path, audio, sample_rate))
+        if self.instrumentation.enabled:
+            result = dict(result, timings=timings)
+        return result
+    
+    def _analyze_voice(self, audio_path, audio=None, sample_rate=None):
+        if audio is not None:
+            with self.instrumentation.stage('resample'):
+                y, sr = resample(audio, sample_rate, ANALYSIS_SAMPLE_RATE), ANALYSIS_SAMPLE_RATE
+        else:
+            duration = audio_duration(audio_path)
+            if duration is not None and duration > self.max_in_memory_seconds:
+                return self.analyze_voice_blocks(audio_path)
+            # Load audio file
+            with self.instrumentation.stage('load'):
+                y, sr = load_audio(audio_path)
+        
+        # Calculate various voice characteristics; shared intermediates
+        # (RMS frames, speech segments, spectrum) are computed once
+        features = FeatureContext(y, sr, instrumentation=self.instrumentation)
+        
+        # 1. Volume/energy analysis
+        rms = features['rms']
         energy_mean = np.mean(rms)
         energy_std = np.std(rms)
-        energy_stability = 1.0 / (energy_std + 1e-6)
+        
+        # 2. Pitch analysis inside speech segments only
+        pitch_std = np.std(features['voiced_pitches'])
         
         # 3. Speaking rate
-        onset_env = librosa.onset.onset_strength(y=y, sr=sr)
-        tempo = librosa.beat.tempo(onset_envelope=onset_env, sr=sr)[0]
+        tempo = features['tempo']
         
         # 4. Voice clarity
-        zcr = librosa.feature.zero_crossing_rate(y)[0]
-        clarity = 1.0 / (np.std(zcr) + 1e-6)
+        zcr = features['zcr']
+        
+        return self._score_voice(pitch_std, energy_mean, energy_std, tempo, np.std(zcr))
+    
+    def analyze_voice_blocks(self, audio_path):
+        """Analyze a long recording block by block without loading it whole"""
+        with self.instrumentation.stage('block_analysis'):
+            features = analyze_file_in_blocks(audio_path)
+        return self._score_voice(
+            features['pitch_std'],
+            features['rms_mean'],
+            features['rms_std'],
+            features['tempo'],
+            features['zcr_std']
+        )
+    
+    def _score_voice(self, pitch_std, energy_mean, energy_std, tempo, zcr_std):
+        """Turn the raw voice measurements into metrics and a confidence score"""
+        pitch_stability = 1.0 / (pitch_std + 1e-6)
+        energy_stability = 1.0 / (energy_std + 1e-6)
+        clarity = 1.0 / (zcr_std + 1e-6)
         
         # Calculate confidence score based on these metrics
         confidence_indicators = {
@@ -0,0 +1,399 @@
+import copy
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from pitch_tracker import frame_signal
+from running_stats import RunningStats
+
+
+def frame_rms(audio: np.ndarray, frame_length: int = 2048, hop_length: int = 512, center: bool = True) -> np.ndarray:
+    """
+    RMS energy per frame, on the same frame grid as pitch_tracker and librosa.
+
+    Args:
+        audio (np.ndarray): Audio data
+        frame_length (int): Frame size in samples (default: 2048)
+        hop_length (int): Hop between frames in samples (default: 512)
+        center (bool): Centre frames on their timestamps
+
+    Returns:
+        np.ndarray: RMS per frame
+    """
+    frames = frame_signal(np.asarray(audio, dtype=np.float32), frame_length, hop_length, center)
+    return np.sqrt(np.mean(frames.astype(np.float64) ** 2, axis=1))
+
+
+def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Start and end (exclusive) indices of every run of True values."""
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.flatnonzero(np.diff(padded.astype(np.int8)))
+    return edges[0::2], edges[1::2]
+
+
+class VoiceActivity:
+    """
+    Frame-level speech/non-speech decision and the speech segments it implies.
+
+    Parameters:
+        voiced (np.ndarray): Boolean speech flag per frame
+        sample_rate (int): Sampling rate of the analyzed audio
+        hop_length (int): Hop between frames in samples
+    """
+
+    def __init__(self, voiced: np.ndarray, sample_rate: int, hop_length: int):
+        self.voiced = voiced
+        self.sample_rate = sample_rate
+        self.hop_length = hop_length
+        starts, ends = _runs(voiced)
+        self.frame_segments = np.stack([starts, ends], axis=1) if len(starts) else np.zeros((0, 2), dtype=int)
+
+    @property
+    def frame_duration(self) -> float:
+        return self.hop_length / self.sample_rate
+
+    @property
+    def segments(self) -> List[Tuple[float, float]]:
+        """Speech segments as (start, end) times in seconds."""
+        return [(start * self.frame_duration, end * self.frame_duration) for start, end in self.frame_segments]
+
+    @property
+    def speech_ratio(self) -> float:
+        return float(self.voiced.mean()) if len(self.voiced) else 0.0
+
+    def pause_durations(self) -> np.ndarray:
+        """Lengths in seconds of the gaps between consecutive speech segments."""
+        if len(self.frame_segments) < 2:
+            return np.zeros(0)
+        gaps = self.frame_segments[1:, 0] - self.frame_segments[:-1, 1]
+        return gaps * self.frame_duration
+
+    def pause_metrics(self, long_pause: float = 1.0) -> Dict[str, float]:
+        """
+        Pause and rhythm statistics derived from the segment list.
+
+        Leading and trailing silence is not counted as pausing; pause_ratio is
+        the share of non-speech between the first and last speech frame.
+
+        Args:
+            long_pause (float): Pauses at least this long (s) are counted as long pauses
+
+        Returns:
+            Dict[str, float]: Speech and pause statistics
+        """
+        pauses = self.pause_durations()
+        segment_lengths = (self.frame_segments[:, 1] - self.frame_segments[:, 0]) * self.frame_duration
+        speech_seconds = float(segment_lengths.sum())
+        if len(self.frame_segments):
+            span = (self.frame_segments[-1, 1] - self.frame_segments[0, 0]) * self.frame_duration
+        else:
+            span = 0.0
+        return {
+            'speech_ratio': self.speech_ratio,
+            'speech_seconds': speech_seconds,
+            'segments': len(self.frame_segments),
+            'mean_segment': float(segment_lengths.mean()) if len(segment_lengths) else 0.0,
+            'segments_per_minute': float(len(self.frame_segments) / span * 60) if span > 0 else 0.0,
+            'pauses': len(pauses),
+            'pause_ratio': float(pauses.sum() / span) if span > 0 else 0.0,
+            'mean_pause': float(pauses.mean()) if len(pauses) else 0.0,
+            'pause_std': float(pauses.std()) if len(pauses) else 0.0,
+            'long_pauses': int(np.sum(pauses >= long_pause))
+        }
+
+
+def to_db(rms: np.ndarray) -> np.ndarray:
+    """Frame RMS in dBFS."""
+    return 20 * np.log10(np.asarray(rms, dtype=np.float64) + 1e-10)
+
+
+class FrameLevels:
+    """
+    Frame energy distribution of a recording analyzed block by block.
+
+    Frame RMS values are binned in dB into a fixed-size histogram, so the
+    noise floor and speech level of a whole file can be measured without
+    holding it in memory and then applied to every block
+    (VoiceActivityDetector.detect(levels=...)).
+
+    Parameters:
+        resolution (float): Bin width in dB (default: 0.1)
+        floor (float): Lowest level in dB; quieter frames count as this level (default: -200)
+        ceiling (float): Highest level in dB; louder frames count as this level (default: 20)
+    """
+
+    def __init__(self, resolution: float = 0.1, floor: float = -200.0, ceiling: float = 20.0):
+        self._edges = np.arange(floor, ceiling + resolution, resolution)
+        self._histogram = np.zeros(len(self._edges) - 1, dtype=np.int64)
+        self.frames = 0
+
+    def update(self, rms: np.ndarray):
+        """Add the RMS of further frames."""
+        db = np.clip(to_db(rms), self._edges[0], self._edges[-1])
+        self._histogram += np.histogram(db, bins=self._edges)[0]
+        self.frames += len(db)
+
+    def percentile(self, q: float) -> float:
+        """Approximate percentile of frame level in dB (the upper edge of its bin)."""
+        if self.frames == 0:
+            return float(self._edges[0])
+        cumulative = np.cumsum(self._histogram)
+        index = np.searchsorted(cumulative, q / 100 * self.frames)
+        return float(self._edges[min(index + 1, len(self._histogram))])
+
+    def levels(self) -> Tuple[float, float]:
+        """Noise floor and speech level in dB, as VoiceActivityDetector measures them."""
+        return (self.percentile(VoiceActivityDetector.noise_percentile),
+                self.percentile(VoiceActivityDetector.speech_percentile))
+
+
+class VoiceActivityDetector:
+    """
+    Vectorized energy-based voice activity detection on a frame grid.
+
+    Thresholds adapt to each recording: they sit between its noise floor
+    (a low percentile of frame energy in dB) and its speech level (a high
+    percentile). Frames above the high threshold seed speech, which extends
+    over neighbouring frames above the low threshold (hysteresis). Gaps
+    shorter than min_pause are bridged and segments shorter than min_speech
+    dropped. Every step is an array operation over run boundaries.
+
+    Parameters:
+        sample_rate (int): Sampling rate of the audio
+        frame_length (int): Frame size for RMS in samples (default: 2048)
+        hop_length (int): Hop between frames in samples (default: 512)
+        min_speech (float): Shortest kept speech segment in seconds (default: 0.1)
+        min_pause (float): Shortest gap kept as a pause in seconds (default: 0.15)
+        silence_db (float): Recordings peaking below this level (dBFS) are all silence (default: -50)
+    """
+
+    noise_percentile = 10
+    speech_percentile = 95
+
+    def __init__(
+        self,
+        sample_rate: int,
+        frame_length: int = 2048,
+        hop_length: int = 512,
+        min_speech: float = 0.1,
+        min_pause: float = 0.15,
+        silence_db: float = -50.0
+    ):
+        self.sample_rate = sample_rate
+        self.frame_length = frame_length
+        self.hop_length = hop_length
+        self.min_speech = min_speech
+        self.min_pause = min_pause
+        self.silence_db = silence_db
+
+    def detect(
+        self,
+        audio: Optional[np.ndarray] = None,
+        rms: Optional[np.ndarray] = None,
+        levels: Optional[Tuple[float, float]] = None
+    ) -> VoiceActivity:
+        """
+        Classify every frame as speech or not.
+
+        Args:
+            audio (Optional[np.ndarray]): Audio data (used if rms is not given)
+            rms (Optional[np.ndarray]): Precomputed RMS per frame on this detector's grid
+            levels (Optional[Tuple[float, float]]): Noise floor and speech level in dB of the
+                whole recording when only part of it is passed (see FrameLevels);
+                default: measured on this input
+
+        Returns:
+            VoiceActivity: Per-frame decisions and speech segments
+        """
+        if rms is None:
+            rms = frame_rms(audio, self.frame_length, self.hop_length)
+        db = to_db(rms)
+        if len(db) == 0:
+            return VoiceActivity(np.zeros(0, dtype=bool), self.sample_rate, self.hop_length)
+
+        if levels is None:
+            levels = np.percentile(db, [self.noise_percentile, self.speech_percentile])
+        low, high = self.thresholds(levels)
+        if low == np.inf:
+            voiced = np.zeros(len(db), dtype=bool)
+        elif low == -np.inf:
+            voiced = np.ones(len(db), dtype=bool)
+        else:
+            voiced = self._hysteresis(db > low, db > high)
+            voiced = self._smooth(voiced)
+        return VoiceActivity(voiced, self.sample_rate, self.hop_length)
+
+    def thresholds(self, levels: Tuple[float, float]) -> Tuple[float, float]:
+        """
+        Hysteresis thresholds for a recording's noise floor and speech level.
+
+        Args:
+            levels (Tuple[float, float]): Noise floor and speech level in dB
+
+        Returns:
+            Tuple[float, float]: Low (extend) and high (seed) thresholds in dB;
+                (inf, inf) if the recording is too quiet to hold speech and
+                (-inf, -inf) if it has no usable contrast (all speech)
+        """
+        noise, peak = levels
+        if peak < self.silence_db:
+            return np.inf, np.inf
+        if peak - noise < 6:
+            # No usable contrast: the whole recording is one level, and loud enough
+            return -np.inf, -np.inf
+        spread = peak - noise
+        return max(noise + 0.25 * spread, noise + 3), max(noise + 0.5 * spread, self.silence_db)
+
+    @staticmethod
+    def _hysteresis(candidates: np.ndarray, seeds: np.ndarray) -> np.ndarray:
+        starts, ends = _runs(candidates)
+        seed_count = np.concatenate(([0], np.cumsum(seeds)))
+        keep = seed_count[ends] - seed_count[starts] > 0
+        return _fill(len(candidates), starts[keep], ends[keep])
+
+    def _smooth(self, voiced: np.ndarray) -> np.ndarray:
+        starts, ends = _runs(voiced)
+        if len(starts) == 0:
+            return voiced
+        frame_duration = self.hop_length / self.sample_rate
+        # Bridge short gaps, then drop short segments
+        split = (starts[1:] - ends[:-1]) * frame_duration >= self.min_pause
+        starts, ends = starts[np.r_[True, split]], ends[np.r_[split, True]]
+        keep = (ends - starts) * frame_duration >= self.min_speech
+        return _fill(len(voiced), starts[keep], ends[keep])
+
+
+class VoiceActivityTracker:
+    """
+    Incremental VoiceActivityDetector for audio that arrives frame by frame.
+
+    Each frame is classified when it arrives, against thresholds derived
+    from the levels of all frames so far, so early decisions rest on less
+    evidence than a whole-recording detect(). Hysteresis, gap bridging and
+    the minimum segment length are applied as in detect(). Finished segments
+    are reduced to running totals, so memory stays constant however long
+    the session runs.
+
+    Parameters:
+        detector (VoiceActivityDetector): Frame grid, thresholds and smoothing rules
+        long_pause (float): Pauses at least this long (s) are counted as long pauses (default: 1.0)
+    """
+
+    def __init__(self, detector: VoiceActivityDetector, long_pause: float = 1.0):
+        self.detector = detector
+        self.long_pause = long_pause
+        self.frame_duration = detector.hop_length / detector.sample_rate
+        self.levels = FrameLevels()
+        self.frames = 0
+        self.segments = 0
+        self.speech_frames = 0
+        self.pauses = RunningStats()
+        self.long_pauses = 0
+        self._first_start = None
+        self._last_end = None
+        # Run of frames above the low threshold, and whether one was above the high one
+        self._run_start = None
+        self._run_seeded = False
+        # Last speech segment, which the next one may still be bridged onto
+        self._open = None
+
+    def update(self, rms: np.ndarray):
+        """
+        Classify newly completed frames.
+
+        Args:
+            rms (np.ndarray): RMS of each new frame on the detector's grid
+        """
+        self.levels.update(rms)
+        low, high = self.detector.thresholds(self.levels.levels())
+        for db in to_db(rms):
+            if db > low:
+                if self._run_start is None:
+                    self._run_start, self._run_seeded = self.frames, False
+                self._run_seeded = self._run_seeded or db > high
+            elif self._run_start is not None:
+                self._end_run(self.frames)
+            self.frames += 1
+
+    def _end_run(self, end: int):
+        if self._run_seeded:
+            if self._open is not None and (self._run_start - self._open[1]) * self.frame_duration < self.detector.min_pause:
+                self._open = (self._open[0], end)
+            else:
+                if self._open is not None:
+                    self._finish(*self._open)
+                self._open = (self._run_start, end)
+        self._run_start = None
+
+    def _finish(self, start: int, end: int):
+        if (end - start) * self.frame_duration < self.detector.min_speech:
+            return
+        if self._last_end is None:
+            self._first_start = start
+        else:
+            pause = (start - self._last_end) * self.frame_duration
+            self.pauses.update(pause)
+            self.long_pauses += int(pause >= self.long_pause)
+        self._last_end = end
+        self.segments += 1
+        self.speech_frames += end - start
+
+    def pause_metrics(self) -> Dict[str, float]:
+        """
+        Statistics of VoiceActivity.pause_metrics, treating the frames so far as the whole recording.
+
+        Returns:
+            Dict[str, float]: Speech and pause statistics
+        """
+        closed = copy.copy(self)
+        closed.pauses = copy.copy(self.pauses)
+        if closed._run_start is not None:
+            closed._end_run(self.frames)
+        if closed._open is not None:
+            closed._finish(*closed._open)
+        speech_seconds = closed.speech_frames * self.frame_duration
+        span = (closed._last_end - closed._first_start) * self.frame_duration if closed.segments else 0.0
+        pauses = closed.pauses
+        return {
+            'speech_ratio': closed.speech_frames / self.frames if self.frames else 0.0,
+            'speech_seconds': speech_seconds,
+            'segments': closed.segments,
+            'mean_segment': speech_seconds / closed.segments if closed.segments else 0.0,
+            'segments_per_minute': closed.segments / span * 60 if span > 0 else 0.0,
+            'pauses': pauses.count,
+            'pause_ratio': float(pauses.mean * pauses.count / span) if span > 0 else 0.0,
+            'mean_pause': pauses.mean if pauses.count else 0.0,
+            'pause_std': pauses.std,
+            'long_pauses': closed.long_pauses
+        }
+
+
+def _fill(n: int, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Boolean mask of length n that is True inside every [start, end) run."""
+    delta = np.zeros(n + 1, dtype=np.int32)
+    np.add.at(delta, starts, 1)
+    np.add.at(delta, ends, -1)
+    return np.cumsum(delta[:-1]) > 0
+
+
+def detect_voice_activity(
+    audio: np.ndarray,
+    sample_rate: int,
+    frame_length: int = 2048,
+    hop_length: int = 512,
+    **kwargs
+) -> VoiceActivity:
+    """
+    Convenience wrapper around VoiceActivityDetector.detect.
+
+    Args:
+        audio (np.ndarray): Audio data
+        sample_rate (int): Sampling rate of the audio
+        frame_length (int): Frame size for RMS in samples (default: 2048)
+        hop_length (int): Hop between frames in samples (default: 512)
+        **kwargs: Further VoiceActivityDetector parameters
+
+    Returns:
+        VoiceActivity: Per-frame decisions and speech segments
+    """
+    return VoiceActivityDetector(sample_rate, frame_length, hop_length, **kwargs).detect(audio)
@@ -112,76 +112,336 @@
 
 
 
-# NEw code -3 
+# NEw code -3 (replaced by the tracking loop below)
+# import cv2
+# import numpy as np
+
+# # Initialize capture
+# cap = cv2.VideoCapture(0)
+# cap.set(3, 640)
+# cap.set(4, 480)
+
+# # Load cascade classifiers
+# face_cascade = cv2.CascadeClassifier('D:/FYP/video/haarcascade_frontalface_default.xml')
+# # Try the alternative eye cascade which sometimes works better
+# eye_cascade = cv2.CascadeClassifier('D:/FYP/video/haarcascade_eye.xml')
+
+# # Check if cascades are loaded correctly
+# if face_cascade.empty():
+#     raise IOError('Unable to load face cascade classifier xml file')
+# if eye_cascade.empty():
+#     raise IOError('Unable to load eye cascade classifier xml file')
+
+# while True:
+#     ret, frame = cap.read()
+#     if not ret:
+#         print("Failed to grab frame")
+#         break
+
+#     # Convert to grayscale for detection
+#     gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+#     # Enhance contrast of the grayscale image
+#     gray = cv2.equalizeHist(gray)
+
+#     # Detect faces in grayscale image
+#     faces = face_cascade.detectMultiScale(
+#         gray,
+#         scaleFactor=1.1,
+#         minNeighbors=5,
+#         minSize=(30, 30)
+#     )
+
+#     for (x, y, w, h) in faces:
+#         cv2.rectangle(frame, (x,y), (x+w,y+h), (255,0,0), 2)
+
+#         # Create ROI for eyes - only use upper half of face
+#         roi_gray = gray[y:y+h//2, x:x+w]    # Only upper half of face
+#         roi_color = frame[y:y+h//2, x:x+w]
+
+#         # Improve contrast in eye region
+#         roi_gray = cv2.equalizeHist(roi_gray)
+
+#         # More lenient parameters for eye detection
+#         eyes = eye_cascade.detectMultiScale(
+#             roi_gray,
+#             scaleFactor=1.05,      # Smaller scale factor for more detections
+#             minNeighbors=6,        # Increased for more reliable detections
+#             minSize=(25, 25),      # Minimum size for an eye
+#             maxSize=(45, 45)       # Maximum size for an eye
+#         )
+
+#         for (ex, ey, ew, eh) in eyes:
+#             # Draw both rectangle and circle for better visualization
+#             cv2.rectangle(roi_color, (ex,ey), (ex+ew,ey+eh), (0,255,0), 2)
+#             center = (ex + ew//2, ey + eh//2)
+#             radius = min(ew//2, eh//2)
+#             cv2.circle(roi_color, center, radius, (0,0,255), 2)
+
+#     cv2.imshow('Face and Eye Detection', frame)
+
+#     if cv2.waitKey(1) & 0xFF == ord('q'):
+#         break
+
+# cap.release()
+
+
+# NEw code -4: decimated detection + template tracking, capture on its own thread
+import argparse
+import os
+import threading
+import time
+
 import cv2
 import numpy as np
 
-# Initialize capture
-cap = cv2.VideoCapture(0)
-cap.set(3, 640)
-cap.set(4, 480)
-
-# Load cascade classifiers
-face_cascade = cv2.CascadeClassifier('D:/FYP/video/haarcascade_frontalface_default.xml')
-# Try the alternative eye cascade which sometimes works better
-eye_cascade = cv2.CascadeClassifier('D:/FYP/video/haarcascade_eye.xml')
-
-# Check if cascades are loaded correctly
-if face_cascade.empty():
-    raise IOError('Unable to load face cascade classifier xml file')
-if eye_cascade.empty():
-    raise IOError('Unable to load eye cascade classifier xml file')
-
-while True:
-    ret, frame = cap.read()
-    if not ret:
-        print("Failed to grab frame")
-        break
-        
-    # Convert to grayscale for detection
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    
-    # Enhance contrast of the grayscale image
-    gray = cv2.equalizeHist(gray)
-    
-    # Detect faces in grayscale image
+CASCADE_DIR = os.path.dirname(os.path.abspath(__file__))
+FACE_CASCADE_PATH = os.path.join(CASCADE_DIR, 'haarcascade_frontalface_default.xml')
+EYE_CASCADE_PATH = os.path.join(CASCADE_DIR, 'haarcascade_eye.xml')
+
+
+def load_cascades(face_path=FACE_CASCADE_PATH, eye_path=EYE_CASCADE_PATH):
+    """Load the face and eye Haar cascades, failing loudly if either is missing"""
+    face_cascade = cv2.CascadeClassifier(face_path)
+    eye_cascade = cv2.CascadeClassifier(eye_path)
+
+    # Check if cascades are loaded correctly
+    if face_cascade.empty():
+        raise IOError('Unable to load face cascade classifier xml file')
+    if eye_cascade.empty():
+        raise IOError('Unable to load eye cascade classifier xml file')
+    return face_cascade, eye_cascade
+
+
+def detect_faces(face_cascade, gray, scale=0.5, min_size=30):
+    """Detect faces on a downscaled, equalized copy and return boxes in full-frame coordinates"""
+    small = gray if scale == 1.0 else cv2.resize(
+        gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    small = cv2.equalizeHist(small)
+    min_side = max(1, int(min_size * scale))
     faces = face_cascade.detectMultiScale(
-        gray,
+        small,
         scaleFactor=1.1,
         minNeighbors=5,
-        minSize=(30, 30)
+        minSize=(min_side, min_side)
     )
-    
-    for (x, y, w, h) in faces:
-        cv2.rectangle(frame, (x,y), (x+w,y+h), (255,0,0), 2)
-        
-        # Create ROI for eyes - only use upper half of face
-        roi_gray = gray[y:y+h//2, x:x+w]    # Only upper half of face
-        roi_color = frame[y:y+h//2, x:x+w]
-        
-        # Improve contrast in eye region
-        roi_gray = cv2.equalizeHist(roi_gray)
-        
-        # More lenient parameters for eye detection
-        eyes = eye_cascade.detectMultiScale(
-            roi_gray,
-            scaleFactor=1.05,      # Smaller scale factor for more detections
-            minNeighbors=6,        # Increased for more reliable detections
-            minSize=(25, 25),      # Minimum size for an eye
-            maxSize=(45, 45)       # Maximum size for an eye
-        )
-        
-        for (ex, ey, ew, eh) in eyes:
+    return [tuple(int(round(v / scale)) for v in face) for face in faces]
+
+
+def detect_eyes(eye_cascade, gray, face):
+    """Detect eyes in the upper half of a face box; boxes are relative to the face"""
+    x, y, w, h = face
+    # Only upper half of face, with improved contrast
+    roi_gray = cv2.equalizeHist(gray[y:y + h // 2, x:x + w])
+    if roi_gray.size == 0:
+        return []
+    eyes = eye_cascade.detectMultiScale(
+        roi_gray,
+        scaleFactor=1.05,
+        minNeighbors=6,
+        minSize=(25, 25),
+        maxSize=(45, 45)
+    )
+    return [tuple(int(v) for v in eye) for eye in eyes]
+
+
+class FaceTrack:
+    """One tracked face: its box, eye boxes relative to it, and its grayscale template"""
+
+    def __init__(self, box, eyes, template):
+        self.box = box
+        self.eyes = eyes
+        self.template = template
+        self.score = 1.0
+
+
+class FaceTracker:
+    """
+    Face/eye tracker that runs the cascades only every few frames.
+
+    On detection frames faces are found on a downscaled frame and eyes on
+    the full-resolution face ROI. In between, each face is followed by
+    normalized template matching inside a small search window around its
+    last position; eyes keep their offsets within the face. A track whose
+    match score falls below min_score is dropped; once every track is lost,
+    detection runs again on the same frame instead of waiting for the next
+    detection frame. With no face in view the cascades still run only every
+    detect_every frames.
+
+    Parameters:
+        face_cascade, eye_cascade: Loaded Haar cascades
+        detect_every (int): Run the cascades every N frames (1 = detect on every frame)
+        scale (float): Downscale factor for face detection
+        search_margin (float): Search window padding as a fraction of the face size
+        min_score (float): Lowest template match score that keeps a track alive
+    """
+
+    def __init__(self, face_cascade, eye_cascade, detect_every=5, scale=0.5,
+                 search_margin=0.3, min_score=0.5):
+        self.face_cascade = face_cascade
+        self.eye_cascade = eye_cascade
+        self.detect_every = max(1, detect_every)
+        self.scale = scale
+        self.search_margin = search_margin
+        self.min_score = min_score
+        self.tracks = []
+        # Detect on the first frame
+        self.frames_since_detection = self.detect_every
+        self.detections = 0
+
+    def _detect(self, gray):
+        self.tracks = []
+        for face in detect_faces(self.face_cascade, gray, self.scale):
+            x, y, w, h = face
+            eyes = detect_eyes(self.eye_cascade, gray, face)
+            self.tracks.append(FaceTrack(face, eyes, gray[y:y + h, x:x + w].copy()))
+        self.frames_since_detection = 0
+        self.detections += 1
+
+    def _follow(self, gray, track):
+        x, y, w, h = track.box
+        height, width = gray.shape[:2]
+        pad_x, pad_y = int(w * self.search_margin), int(h * self.search_margin)
+        x0, y0 = max(0, x - pad_x), max(0, y - pad_y)
+        x1, y1 = min(width, x + w + pad_x), min(height, y + h + pad_y)
+        window = gray[y0:y1, x0:x1]
+        if window.shape[0] < h or window.shape[1] < w:
+            return False
+
+        result = cv2.matchTemplate(window, track.template, cv2.TM_CCOEFF_NORMED)
+        _, score, _, (dx, dy) = cv2.minMaxLoc(result)
+        track.score = score
+        if score < self.min_score:
+            return False
+        track.box = (x0 + dx, y0 + dy, w, h)
+        nx, ny = track.box[:2]
+        track.template = gray[ny:ny + h, nx:nx + w].copy()
+        return True
+
+    def update(self, gray):
+        """Advance the tracker by one grayscale frame and return the live tracks"""
+        self.frames_since_detection += 1
+        if self.frames_since_detection >= self.detect_every:
+            self._detect(gray)
+        elif self.tracks:
+            self.tracks = [track for track in self.tracks if self._follow(gray, track)]
+            if not self.tracks:
+                # The last face was lost: look again now, not at the next cadence
+                self._detect(gray)
+        return self.tracks
+
+
+class CaptureThread:
+    """
+    Grabs camera frames on a background thread and keeps only the newest.
+
+    read() never waits for the camera behind a slow consumer: frames that
+    arrive while the consumer is busy are overwritten and counted as dropped.
+    """
+
+    def __init__(self, source=0, width=640, height=480):
+        self.cap = cv2.VideoCapture(source)
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        self._cond = threading.Condition()
+        self._frame = None
+        self._frame_id = 0
+        self._consumed_id = 0
+        self._running = False
+        self._thread = None
+        self.dropped = 0
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while self._running:
+            ret, frame = self.cap.read()
+            if not ret:
+                print("Failed to grab frame")
+                break
+            with self._cond:
+                if self._consumed_id < self._frame_id:
+                    self.dropped += 1
+                self._frame = frame
+                self._frame_id += 1
+                self._cond.notify_all()
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+
+    def read(self, last_id=0, timeout=None):
+        """Wait for a frame newer than last_id; returns (frame_id, frame), or (last_id, None) once stopped"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._frame_id > last_id or not self._running, timeout)
+            if self._frame_id <= last_id:
+                return last_id, None
+            self._consumed_id = self._frame_id
+            return self._frame_id, self._frame
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        self.cap.release()
+
+
+def draw_tracks(frame, tracks):
+    for track in tracks:
+        x, y, w, h = track.box
+        cv2.rectangle(frame, (x, y), (x + w, y + h), (255, 0, 0), 2)
+        for (ex, ey, ew, eh) in track.eyes:
             # Draw both rectangle and circle for better visualization
-            cv2.rectangle(roi_color, (ex,ey), (ex+ew,ey+eh), (0,255,0), 2)
-            center = (ex + ew//2, ey + eh//2)
-            radius = min(ew//2, eh//2)
-            cv2.circle(roi_color, center, radius, (0,0,255), 2)
-    
-    cv2.imshow('Face and Eye Detection', frame)
-    
-    if cv2.waitKey(1) & 0xFF == ord('q'):
-        break
+            ex, ey = x + ex, y + ey
+            cv2.rectangle(frame, (ex, ey), (ex + ew, ey + eh), (0, 255, 0), 2)
+            center = (ex + ew // 2, ey + eh // 2)
+            radius = min(ew // 2, eh // 2)
+            cv2.circle(frame, center, radius, (0, 0, 255), 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Real-time face and eye tracking')
+    parser.add_argument('--camera', type=int, default=0)
+    parser.add_argument('--mode', choices=['track', 'detect'], default='track',
+                        help="'detect' runs both cascades on every full-size frame (old behaviour)")
+    parser.add_argument('--detect-every', type=int, default=5, help='Frames between detections in track mode')
+    parser.add_argument('--scale', type=float, default=0.5, help='Downscale factor for face detection')
+    args = parser.parse_args()
+
+    face_cascade, eye_cascade = load_cascades()
+    if args.mode == 'detect':
+        tracker = FaceTracker(face_cascade, eye_cascade, detect_every=1, scale=1.0)
+    else:
+        tracker = FaceTracker(face_cascade, eye_cascade, detect_every=args.detect_every, scale=args.scale)
+
+    capture = CaptureThread(args.camera).start()
+    frame_id, shown, fps = 0, 0, 0.0
+    started = time.perf_counter()
+    try:
+        while True:
+            frame_id, frame = capture.read(frame_id)
+            if frame is None:
+                break
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            draw_tracks(frame, tracker.update(gray))
+
+            shown += 1
+            elapsed = time.perf_counter() - started
+            if elapsed >= 1.0:
+                fps, shown, started = shown / elapsed, 0, time.perf_counter()
+            cv2.putText(frame, f'{fps:.1f} fps  dropped {capture.dropped}', (10, 20),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
+            cv2.imshow('Face and Eye Detection', frame)
+
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                break
+    finally:
+        capture.stop()
+        cv2.destroyAllWindows()
+
 
-cap.release()
-cv2.destroyAllWindows()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,373 @@
+import argparse
+import math
+import os
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Repository root for batch_analyzer, and this directory for face_eye, so the
+# module imports both as a script and as video.video_batch
+VIDEO_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(VIDEO_DIR))
+sys.path.insert(0, VIDEO_DIR)
+
+from batch_analyzer import ResultWriter, to_builtin
+from face_eye import detect_eyes, detect_faces, load_cascades
+
+VIDEO_EXTENSIONS = ('.mp4', '.mov', '.avi', '.mkv', '.webm', '.m4v')
+
+# Per-process cascades, loaded once by the pool initializer
+_face_cascade = None
+_eye_cascade = None
+
+
+def _init_worker():
+    global _face_cascade, _eye_cascade
+    # One OpenCV thread per process; the pool provides the parallelism
+    cv2.setNumThreads(1)
+    _face_cascade, _eye_cascade = load_cascades()
+
+
+def video_info(video_path: str) -> Dict:
+    """
+    Read a video's frame rate, frame count and frame size from its container.
+
+    Args:
+        video_path (str): Path to the video file
+
+    Returns:
+        Dict: fps, frame_count, width, height and duration (frame_count and
+            duration are 0 when the container does not report a length)
+    """
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise IOError(f"Unable to open video: {video_path}")
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    finally:
+        cap.release()
+    return {
+        'fps': fps,
+        'frame_count': frame_count,
+        'width': width,
+        'height': height,
+        'duration': frame_count / fps
+    }
+
+
+def plan_shards(frame_count: int, fps: float, shard_seconds: float = 30.0) -> List[Tuple[int, Optional[int]]]:
+    """
+    Split a video into [start, end) frame ranges of roughly shard_seconds each.
+
+    Shard boundaries fall on whole seconds so no per-second bucket is split
+    between workers. Containers that do not report a frame count (common
+    for webm/mkv and streamed files) get a single open-ended shard
+    (end None), decoded sequentially to the end of the stream.
+
+    Args:
+        frame_count (int): Total number of frames
+        fps (float): Frame rate
+        shard_seconds (float): Target shard length (default: 30 s)
+
+    Returns:
+        List[Tuple[int, Optional[int]]]: Frame ranges covering the whole video
+    """
+    if frame_count <= 0:
+        return [(0, None)]
+    seconds_per_shard = max(1, int(shard_seconds))
+    boundaries = []
+    second = 0
+    while True:
+        start = int(math.ceil(second * fps))
+        if start >= frame_count:
+            break
+        end = min(frame_count, int(math.ceil((second + seconds_per_shard) * fps)))
+        boundaries.append((start, end))
+        second += seconds_per_shard
+    return boundaries
+
+
+def _frame_index(cap, fps: float, previous: int) -> int:
+    """Index of the frame just grabbed, from its timestamp; counted on if the timestamp is unusable."""
+    index = int(round(cap.get(cv2.CAP_PROP_POS_MSEC) * fps / 1000))
+    return index if index > previous else previous + 1
+
+
+def grab_range(cap, start: int, end: Optional[int], fps: float) -> Iterable[int]:
+    """
+    Grab the frames [start, end) in order, yielding each one's index.
+
+    CAP_PROP_POS_FRAMES seeks are keyframe-approximate on many codecs
+    (mp4/h264, webm), so counting frames from the requested position can
+    skip or repeat frames at shard boundaries. The capture is therefore
+    positioned a second early and read forward, and each frame's index is
+    taken from its presentation timestamp (CAP_PROP_POS_MSEC after grab).
+    A seek that lands past start is retried further back. The frame just
+    grabbed is available through cap.retrieve().
+
+    Args:
+        cap: Open cv2.VideoCapture
+        start (int): First frame
+        end (Optional[int]): Frame after the last one (None: end of the stream)
+        fps (float): Frame rate of the video
+
+    Yields:
+        int: Index of each grabbed frame
+    """
+    preroll = max(1, int(math.ceil(fps)))
+    while True:
+        target = max(0, start - preroll)
+        if start:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+        previous = target - 1
+        while True:
+            if not cap.grab():
+                return
+            index = _frame_index(cap, fps, previous)
+            if previous == target - 1 and target > 0 and index > start:
+                break  # Landed past start: seek further back
+            previous = index
+            if index < start:
+                continue
+            if end is not None and index >= end:
+                return
+            yield index
+        preroll *= 4
+
+
+def analyze_shard(
+    video_path: str,
+    start: int,
+    end: Optional[int],
+    fps: float,
+    sample_fps: float = 5.0,
+    scale: float = 0.5
+) -> Dict:
+    """
+    Detect faces and eyes on every sampled frame of one frame range.
+
+    Frames between samples are only grabbed (demuxed and decoded, but not
+    converted or analyzed). Samples are aligned to the whole video, so
+    results do not depend on how it was sharded.
+
+    Args:
+        video_path (str): Path to the video file
+        start (int): First frame of the shard
+        end (Optional[int]): Frame after the last one in the shard (None: end of the stream)
+        fps (float): Frame rate of the video
+        sample_fps (float): Frames analyzed per second of video (default: 5)
+        scale (float): Downscale factor for face detection (default: 0.5)
+
+    Returns:
+        Dict: Record with file, shard range, status and either samples and
+            frames_read (frames grabbed) or error. Each sample is
+            (frame, face_present, eyes, center_x, center_y, face_width)
+            with positions normalized to the frame size.
+    """
+    record = {'file': video_path, 'start': start, 'end': end}
+    step = max(1, int(round(fps / sample_fps)))
+    cap = cv2.VideoCapture(video_path)
+    try:
+        if not cap.isOpened():
+            raise IOError(f"Unable to open video: {video_path}")
+
+        samples = []
+        frames_read = 0
+        for frame_index in grab_range(cap, start, end, fps):
+            frames_read += 1
+            if frame_index % step:
+                continue
+            ret, frame = cap.retrieve()
+            if not ret:
+                break
+
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            height, width = gray.shape
+            faces = detect_faces(_face_cascade, gray, scale)
+            if not faces:
+                samples.append((frame_index, False, 0, None, None, None))
+                continue
+
+            # The largest face is taken to be the speaker's
+            face = max(faces, key=lambda box: box[2] * box[3])
+            x, y, w, h = face
+            eyes = detect_eyes(_eye_cascade, gray, face)
+            samples.append((frame_index, True, len(eyes), (x + w / 2) / width, (y + h / 2) / height, w / width))
+
+        record.update(status='ok', samples=samples, frames_read=frames_read)
+    except Exception as e:
+        record.update(status='error', error=str(e))
+    finally:
+        cap.release()
+    return record
+
+
+def _mean(values):
+    return float(np.mean(values)) if values else None
+
+
+def summarize_samples(samples: Iterable[Tuple], fps: float) -> Tuple[Dict, List[Dict]]:
+    """
+    Aggregate frame samples into a per-second timeline and a whole-video summary.
+
+    Args:
+        samples (Iterable[Tuple]): Samples from analyze_shard, in any order
+        fps (float): Frame rate of the video
+
+    Returns:
+        Tuple[Dict, List[Dict]]: Summary and one timeline row per second
+    """
+    buckets = defaultdict(list)
+    for sample in samples:
+        buckets[int(sample[0] // fps)].append(sample)
+
+    timeline = []
+    for second in sorted(buckets):
+        rows = buckets[second]
+        with_face = [row for row in rows if row[1]]
+        timeline.append({
+            'second': second,
+            'samples': len(rows),
+            'face_present': len(with_face) / len(rows),
+            'eyes_detected': sum(1 for row in with_face if row[2] > 0) / len(rows),
+            'face_x': _mean([row[3] for row in with_face]),
+            'face_y': _mean([row[4] for row in with_face]),
+            'face_size': _mean([row[5] for row in with_face])
+        })
+
+    all_rows = [row for rows in buckets.values() for row in rows]
+    with_face = [row for row in all_rows if row[1]]
+    summary = {
+        'seconds': len(timeline),
+        'samples': len(all_rows),
+        'face_present_ratio': len(with_face) / len(all_rows) if all_rows else 0.0,
+        'eye_contact_ratio': sum(1 for row in with_face if row[2] > 0) / len(all_rows) if all_rows else 0.0,
+        'face_x_std': float(np.std([row[3] for row in with_face])) if with_face else None,
+        'face_y_std': float(np.std([row[4] for row in with_face])) if with_face else None
+    }
+    return summary, timeline
+
+
+def collect_videos(source: str) -> List[str]:
+    """Collect video files from a directory (recursively) or a single file path."""
+    if not os.path.isdir(source):
+        return [source]
+    files = []
+    for root, _, names in os.walk(source):
+        for name in names:
+            if name.lower().endswith(VIDEO_EXTENSIONS):
+                files.append(os.path.join(root, name))
+    return sorted(files)
+
+
+def run_batch(
+    files: Iterable[str],
+    output_path: str,
+    workers: Optional[int] = None,
+    sample_fps: float = 5.0,
+    shard_seconds: float = 30.0,
+    scale: float = 0.5
+) -> Dict[str, float]:
+    """
+    Analyze videos headlessly, with frame-range shards spread over a process pool.
+
+    Each video is written as one record (summary in 'result', per-second
+    series in 'timeline') as soon as all of its shards are done.
+
+    Args:
+        files (Iterable[str]): Video files
+        output_path (str): JSONL or CSV output path (CSV keeps only the summary)
+        workers (Optional[int]): Worker processes (default: CPU count)
+        sample_fps (float): Frames analyzed per second of video (default: 5)
+        shard_seconds (float): Shard length in seconds of video (default: 30)
+        scale (float): Downscale factor for face detection (default: 0.5)
+
+    Returns:
+        Dict[str, float]: ok/error counts, seconds of video processed and wall time
+    """
+    stats = {'ok': 0, 'error': 0, 'video_seconds': 0.0, 'wall_seconds': 0.0}
+    started = time.perf_counter()
+    writer = ResultWriter(output_path)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            pending, infos, futures = {}, {}, []
+            for path in files:
+                try:
+                    info = video_info(path)
+                except Exception as e:
+                    stats['error'] += 1
+                    writer.write({'file': path, 'status': 'error', 'error': str(e)})
+                    continue
+                shards = plan_shards(info['frame_count'], info['fps'], shard_seconds)
+                infos[path] = info
+                pending[path] = {'remaining': len(shards), 'samples': [], 'errors': [], 'frames': 0}
+                futures += [
+                    executor.submit(analyze_shard, path, start, end, info['fps'], sample_fps, scale)
+                    for start, end in shards
+                ]
+
+            for future in as_completed(futures):
+                shard = future.result()
+                state = pending[shard['file']]
+                state['remaining'] -= 1
+                if shard['status'] == 'ok':
+                    state['samples'].extend(shard['samples'])
+                    state['frames'] += shard['frames_read']
+                else:
+                    state['errors'].append(shard['error'])
+                if state['remaining']:
+                    continue
+
+                path, info = shard['file'], infos[shard['file']]
+                if not state['errors'] and not info['frame_count']:
+                    # Length unknown up front: take it from the frames actually decoded
+                    info['duration'] = state['frames'] / info['fps']
+                if state['errors']:
+                    record = {'file': path, 'status': 'error', 'error': '; '.join(state['errors'])}
+                elif not state['frames']:
+                    record = {'file': path, 'status': 'error', 'error': "No frames could be decoded"}
+                else:
+                    summary, timeline = summarize_samples(state['samples'], info['fps'])
+                    summary['duration'] = info['duration']
+                    record = {'file': path, 'status': 'ok', 'result': summary, 'timeline': timeline}
+                    stats['video_seconds'] += info['duration']
+                stats[record['status']] += 1
+                writer.write(to_builtin(record))
+                print(f"[{record['status']}] {path}")
+                del pending[path]
+    finally:
+        writer.close()
+    stats['wall_seconds'] = time.perf_counter() - started
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless face/eye metrics over recorded videos")
+    parser.add_argument('source', help="Video file or directory of videos")
+    parser.add_argument('-o', '--output', default='video_results.jsonl', help="Output file (.jsonl or .csv)")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--sample-fps', type=float, default=5.0, help="Frames analyzed per second of video")
+    parser.add_argument('--shard-seconds', type=float, default=30.0, help="Seconds of video per worker task")
+    parser.add_argument('--scale', type=float, default=0.5, help="Downscale factor for face detection")
+    args = parser.parse_args()
+
+    files = collect_videos(args.source)
+    print(f"Analyzing {len(files)} videos...")
+    stats = run_batch(files, args.output, workers=args.workers, sample_fps=args.sample_fps,
+                      shard_seconds=args.shard_seconds, scale=args.scale)
+    speed = stats['video_seconds'] / stats['wall_seconds'] if stats['wall_seconds'] else 0.0
+    print(f"Done: {stats['ok']} ok, {stats['error']} failed, "
+          f"{stats['video_seconds']:.0f} s of video in {stats['wall_seconds']:.1f} s ({speed:.1f}x real time). "
+          f"Results in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,26 @@
-import streamlit as st
+import io
 import numpy as np
-import librosa
-import sounddevice as sd
-from scipy.stats import zscore
-import scipy.io.wavfile as wavfile
 import os
 from datetime import datetime
+from audio_io import ANALYSIS_SAMPLE_RATE, record
+from features import FeatureContext
+from lazy_imports import lazy_import
+
+# Heavy dependencies load on first use; importing this module builds no UI
+wavfile = lazy_import('scipy.io.wavfile')
+
+def to_wav_bytes(audio, sample_rate):
+    """Encode audio as 16-bit WAV in memory, e.g. for st.audio"""
+    peak = np.max(np.abs(audio)) if len(audio) else 0
+    audio_int16 = (audio / peak * 32767 if peak > 0 else audio).astype(np.int16)
+    buffer = io.BytesIO()
+    wavfile.write(buffer, sample_rate, audio_int16)
+    buffer.seek(0)
+    return buffer
 
 class VoiceRatingAnalyzer:
     def __init__(self):
-        self.sample_rate = 22050
-        self.parameters = {
-            'pitch': 0.0,
-            'tone': 0.0,
-            'frequency_variation': 0.0,
-            'pauses': 0.0,
-            'confidence': 0.0
-        }
+        self.sample_rate = ANALYSIS_SAMPLE_RATE
         
         # Create recordings directory if it doesn't exist
         self.recordings_dir = "recordings"
@@ -26,11 +30,7 @@ class VoiceRatingAnalyzer:
     def record_audio(self, duration=5):
         """Record audio for specified duration"""
         print("Recording...")
-        audio = sd.rec(int(duration * self.sample_rate),
-                      samplerate=self.sample_rate,
-                      channels=1)
-        sd.wait()
-        return audio.flatten()
+        return record(duration, self.sample_rate)
 
     def save_wav(self, audio, filename=None):
         """Save audio as WAV file"""
@@ -50,49 +50,54 @@ class VoiceRatingAnalyzer:
         wavfile.write(filepath, self.sample_rate, audio_int16)
         return filepath
 
-    def analyze_pitch(self, audio):
+    def features(self, audio):
+        """Lazily computed features of the audio, shared by the analyze_* methods"""
+        return FeatureContext(audio, self.sample_rate)
+
+    def analyze_pitch(self, audio, features=None):
         """Analyze pitch characteristics"""
-        pitches, magnitudes = librosa.piptrack(y=audio, sr=self.sample_rate)
-        pitch_mean = np.mean(pitches[pitches > 0])
-        pitch_std = np.std(pitches[pitches > 0])
+        pitches = (features or self.features(audio))['voiced_pitches']
+        pitch_mean = np.mean(pitches)
+        pitch_std = np.std(pitches)
         
         # Score based on pitch stability and range
         pitch_score = min(100, max(0, 100 - (pitch_std * 10)))
         return pitch_score
 
-    def analyze_tone(self, audio):
+    def analyze_tone(self, audio, features=None):
         """Analyze tone quality"""
-        stft = librosa.stft(audio)
-        db = librosa.amplitude_to_db(abs(stft))
+        db = (features or self.features(audio))['spectral_db']
         
         # Calculate tone score based on spectral characteristics
         tone_score = min(100, max(0, np.mean(db) + 100))
         return tone_score
 
-    def analyze_frequency_variation(self, audio):
+    def analyze_frequency_variation(self, audio, features=None):
         """Analyze frequency variation"""
-        spectral_centroids = librosa.feature.spectral_centroid(y=audio, sr=self.sample_rate)[0]
+        spectral_centroids = (features or self.features(audio))['spectral_centroid']
         variation_score = min(100, max(0, 100 - (np.std(spectral_centroids) * 0.1)))
         return variation_score
 
-    def analyze_pauses(self, audio):
+    def analyze_pauses(self, audio, features=None):
         """Analyze speech pauses"""
-        rms = librosa.feature.rms(y=audio)[0]
-        silence_threshold = np.mean(rms) * 0.5
-        pauses = np.sum(rms < silence_threshold) / len(rms)
+        # Pauses are the gaps between speech segments
+        pauses = (features or self.features(audio))['pause_metrics']['pause_ratio']
         
         # Score based on appropriate pause ratio
         pause_score = min(100, max(0, 100 - abs(pauses - 0.2) * 200))
         return pause_score
 
-    def analyze_confidence(self, audio):
+    def analyze_confidence(self, audio, features=None):
         """Analyze speaking confidence"""
-        rms = librosa.feature.rms(y=audio)[0]
+        rms = (features or self.features(audio))['rms']
         confidence_score = min(100, max(0, np.mean(rms) * 200 + 50))
         return confidence_score
 
-    def analyze_voice(self, audio=None, duration=5):
-        """Analyze voice and return ratings"""
+    def analyze_voice(self, audio=None, duration=5, save=True):
+        """Analyze voice and return ratings
+        
+        With save=False nothing is written to disk and wav_path is None.
+        """
         if audio is None:
             audio = self.record_audio(duration)
         
@@ -100,29 +105,33 @@ class VoiceRatingAnalyzer:
         audio = audio / np.max(np.abs(audio))
         
         # Save the WAV file
-        wav_path = self.save_wav(audio)
+        wav_path = self.save_wav(audio) if save else None
         
-        # Analyze individual parameters
-        self.parameters['pitch'] = self.analyze_pitch(audio)
-        self.parameters['tone'] = self.analyze_tone(audio)
-        self.parameters['frequency_variation'] = self.analyze_frequency_variation(audio)
-        self.parameters['pauses'] = self.analyze_pauses(audio)
-        self.parameters['confidence'] = self.analyze_confidence(audio)
+        # Analyze individual parameters on one shared set of features
+        # (kept per call: one analyzer instance is shared across sessions)
+        features = self.features(audio)
+        parameters = {
+            'pitch': self.analyze_pitch(audio, features),
+            'tone': self.analyze_tone(audio, features),
+            'frequency_variation': self.analyze_frequency_variation(audio, features),
+            'pauses': self.analyze_pauses(audio, features),
+            'confidence': self.analyze_confidence(audio, features)
+        }
         
         # Calculate overall score
-        overall_score = np.mean(list(self.parameters.values()))
+        overall_score = np.mean(list(parameters.values()))
         
         return {
-            'parameters': self.parameters,
+            'parameters': parameters,
             'overall_score': overall_score,
             'wav_path': wav_path
         }
 
-    def get_feedback(self):
-        """Generate feedback based on ratings"""
+    def get_feedback(self, parameters):
+        """Generate feedback based on the ratings returned by analyze_voice"""
         feedback = []
         
-        for param, score in self.parameters.items():
+        for param, score in parameters.items():
             if score >= 80:
                 feedback.append(f"Excellent {param}: {score:.1f}/100")
             elif score >= 60:
@@ -133,30 +142,44 @@ class VoiceRatingAnalyzer:
         return feedback
 
 # Streamlit app
-st.title("Voice Recording and Analysis")
+def main():
+    import streamlit as st
 
-if st.button("Record (5 seconds)"):
-    # Create analyzer instance
-    analyzer = VoiceRatingAnalyzer()
-    
-    # Record and analyze voice
-    with st.spinner("Recording..."):
-        results = analyzer.analyze_voice()
+    @st.cache_resource
+    def get_analyzer():
+        # One analyzer per server process, warmed up so the first click
+        # does not pay for librosa imports and numba compilation
+        analyzer = VoiceRatingAnalyzer()
+        t = np.arange(analyzer.sample_rate) / analyzer.sample_rate
+        analyzer.analyze_voice(audio=np.sin(2 * np.pi * 180 * t), save=False)
+        return analyzer
+
+    st.title("Voice Recording and Analysis")
+    analyzer = get_analyzer()
+
+    if st.button("Record (5 seconds)"):
+        # Record once and analyze the captured audio in memory
+        with st.spinner("Recording..."):
+            audio = analyzer.record_audio(5)
+        with st.spinner("Analyzing..."):
+            results = analyzer.analyze_voice(audio=audio)
     
-    # Display results
-    st.success(f"Recording saved as: {results['wav_path']}")
+        # Display results
+        st.success(f"Recording saved as: {results['wav_path']}")
     
-    st.subheader("Analysis Results")
-    st.write(f"Overall Score: {results['overall_score']:.1f}/100")
+        st.subheader("Analysis Results")
+        st.write(f"Overall Score: {results['overall_score']:.1f}/100")
     
-    st.write("Individual Parameters:")
-    for param, score in results['parameters'].items():
-        st.write(f"{param.title()}: {score:.1f}/100")
+        st.write("Individual Parameters:")
+        for param, score in results['parameters'].items():
+            st.write(f"{param.title()}: {score:.1f}/100")
     
-    st.write("\nFeedback:")
-    for feedback in analyzer.get_feedback():
-        st.write(f"- {feedback}")
+        st.write("\nFeedback:")
+        for feedback in analyzer.get_feedback(results['parameters']):
+            st.write(f"- {feedback}")
     
-    # Play the recording
-    with open(results['wav_path'], 'rb') as audio_file:
-        st.audio(audio_file)
\ No newline at end of file
+        # Play the recording from memory
+        st.audio(to_wav_bytes(audio, analyzer.sample_rate), format="audio/wav")
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,39 @@
 import numpy as np
-import librosa
-import sounddevice as sd
-from scipy.stats import zscore
 from typing import Dict, List, Optional, Tuple, Union
 
+from audio_io import ANALYSIS_SAMPLE_RATE, record
+from features import FeatureContext
+from instrumentation import Instrumentation
+from lazy_imports import lazy_import
+
+# Heavy dependencies load on first use
+librosa = lazy_import('librosa')
+
 class VoiceRatingAnalyzer:
     """
     A class for analyzing voice recordings and providing detailed feedback on various parameters.
     
     Parameters:
-        sample_rate (int): The sampling rate for audio recording (default: 22050 Hz)
+        sample_rate (int): The sampling rate for recording and analysis (default: ANALYSIS_SAMPLE_RATE, 16 kHz)
         pitch_weight (float): Weight for pitch scoring (default: 1.0)
         tone_weight (float): Weight for tone scoring (default: 1.0)
         variation_weight (float): Weight for frequency variation scoring (default: 0.8)
         pause_weight (float): Weight for pause analysis scoring (default: 0.7)
         confidence_weight (float): Weight for confidence scoring (default: 1.0)
+        instrumentation (Optional[Instrumentation]): Per-stage timer; when enabled,
+            analyze_voice adds a 'timings' entry to its result
+            (default: enabled by the VOICE_ANALYSIS_TIMINGS environment variable)
     """
     
     def __init__(
         self,
-        sample_rate: int = 22050,
+        sample_rate: int = ANALYSIS_SAMPLE_RATE,
         pitch_weight: float = 1.0,
         tone_weight: float = 1.0,
         variation_weight: float = 0.8,
         pause_weight: float = 0.7,
-        confidence_weight: float = 1.0
+        confidence_weight: float = 1.0,
+        instrumentation: Optional[Instrumentation] = None
     ):
         self.sample_rate = sample_rate
         self.weights = {
@@ -34,14 +43,8 @@ class VoiceRatingAnalyzer:
             'pauses': pause_weight,
             'confidence': confidence_weight
         }
-        self.parameters = {
-            'pitch': 0.0,
-            'tone': 0.0,
-            'frequency_variation': 0.0,
-            'pauses': 0.0,
-            'confidence': 0.0
-        }
         self._last_audio = None
+        self.instrumentation = instrumentation or Instrumentation()
         
     def record_audio(self, duration: float = 5) -> np.ndarray:
         """
@@ -54,27 +57,30 @@ class VoiceRatingAnalyzer:
             np.ndarray: Recorded audio data
         """
         print(f"Recording for {duration} seconds...")
-        audio = sd.rec(
-            int(duration * self.sample_rate),
-            samplerate=self.sample_rate,
-            channels=1
-        )
-        sd.wait()
+        # Captured at the analysis rate when the device supports it
+        audio = record(duration, self.sample_rate)
         print("Recording complete!")
-        return audio.flatten()
+        return audio
     
-    def analyze_pitch(self, audio: np.ndarray) -> float:
+    def analyze_pitch(
+        self,
+        audio: np.ndarray,
+        features: Optional[FeatureContext] = None
+    ) -> float:
         """
         Analyze pitch characteristics of the audio.
         
         Args:
             audio (np.ndarray): Audio data
+            features (Optional[FeatureContext]): Shared features of this audio
             
         Returns:
             float: Pitch score (0-100)
         """
-        pitches, magnitudes = librosa.piptrack(y=audio, sr=self.sample_rate)
-        pitch_data = pitches[pitches > 0]
+        features = features or self.features(audio)
+        
+        # One F0 value per voiced frame, tracked inside speech segments only
+        pitch_data = features['voiced_pitches']
         
         if len(pitch_data) == 0:
             return 0.0
@@ -88,22 +94,26 @@ class VoiceRatingAnalyzer:
         
         return np.mean([stability_score, range_score])
     
-    def analyze_tone(self, audio: np.ndarray) -> float:
+    def analyze_tone(
+        self,
+        audio: np.ndarray,
+        features: Optional[FeatureContext] = None
+    ) -> float:
         """
         Analyze tone quality using spectral characteristics.
         
         Args:
             audio (np.ndarray): Audio data
+            features (Optional[FeatureContext]): Shared features of this audio
             
         Returns:
             float: Tone score (0-100)
         """
-        stft = librosa.stft(audio)
-        db = librosa.amplitude_to_db(abs(stft))
+        features = features or self.features(audio)
+        db = features['spectral_db']
         
-        # Analyze harmonic content
-        harmonic, percussive = librosa.decompose.hpss(stft)
-        harmonic_ratio = np.sum(abs(harmonic)) / (np.sum(abs(percussive)) + 1e-6)
+        # Analyze harmonic content of the speech frames
+        harmonic_ratio = features['harmonic_ratio']
         
         # Calculate tone score based on spectral characteristics and harmonics
         spectral_score = min(100, max(0, np.mean(db) + 100))
@@ -111,49 +121,58 @@ class VoiceRatingAnalyzer:
         
         return np.mean([spectral_score, harmonic_score])
     
-    def analyze_frequency_variation(self, audio: np.ndarray) -> float:
+    def analyze_frequency_variation(
+        self,
+        audio: np.ndarray,
+        features: Optional[FeatureContext] = None
+    ) -> float:
         """
         Analyze frequency variation and speaking dynamics.
         
         Args:
             audio (np.ndarray): Audio data
+            features (Optional[FeatureContext]): Shared features of this audio
             
         Returns:
             float: Frequency variation score (0-100)
         """
-        # Analyze spectral contrast
-        contrast = librosa.feature.spectral_contrast(y=audio, sr=self.sample_rate)
+        features = features or self.features(audio)
+        
+        # Analyze spectral contrast of the speech frames
+        contrast = features['spectral_contrast']
         contrast_score = min(100, np.mean(contrast) * 20 + 50)
         
         # Analyze spectral centroid variation
-        centroids = librosa.feature.spectral_centroid(y=audio, sr=self.sample_rate)[0]
+        centroids = features['spectral_centroid']
         centroid_var = np.std(centroids)
         variation_score = min(100, max(0, 100 - (centroid_var * 0.1)))
         
         return np.mean([contrast_score, variation_score])
     
-    def analyze_pauses(self, audio: np.ndarray) -> float:
+    def analyze_pauses(
+        self,
+        audio: np.ndarray,
+        features: Optional[FeatureContext] = None
+    ) -> float:
         """
         Analyze speech pauses and rhythm.
         
         Args:
             audio (np.ndarray): Audio data
+            features (Optional[FeatureContext]): Shared features of this audio
             
         Returns:
             float: Pause score (0-100)
         """
-        # Detect silence using root mean square energy
-        rms = librosa.feature.rms(y=audio)[0]
-        silence_threshold = np.mean(rms) * 0.5
-        
-        # Calculate pause ratio
-        pauses = np.sum(rms < silence_threshold) / len(rms)
-        
-        # Analyze pause distribution
-        pause_segments = np.where(rms < silence_threshold)[0]
-        if len(pause_segments) > 1:
-            pause_spacing = np.diff(pause_segments)
-            spacing_score = min(100, max(0, 100 - np.std(pause_spacing) * 0.1))
+        features = features or self.features(audio)
+        
+        # Pauses are the gaps between speech segments
+        metrics = features['pause_metrics']
+        pauses = metrics['pause_ratio']
+        
+        # Analyze pause distribution: evenly sized pauses score higher
+        if metrics['pauses'] > 1:
+            spacing_score = min(100, max(0, 100 - metrics['pause_std'] * 50))
         else:
             spacing_score = 50
         
@@ -162,23 +181,28 @@ class VoiceRatingAnalyzer:
         
         return np.mean([ratio_score, spacing_score])
     
-    def analyze_confidence(self, audio: np.ndarray) -> float:
+    def analyze_confidence(
+        self,
+        audio: np.ndarray,
+        features: Optional[FeatureContext] = None
+    ) -> float:
         """
         Analyze speaking confidence based on various metrics.
         
         Args:
             audio (np.ndarray): Audio data
+            features (Optional[FeatureContext]): Shared features of this audio
             
         Returns:
             float: Confidence score (0-100)
         """
+        features = features or self.features(audio)
+        
         # Analyze amplitude dynamics
-        rms = librosa.feature.rms(y=audio)[0]
-        amplitude_score = min(100, max(0, np.mean(rms) * 200 + 50))
+        amplitude_score = min(100, max(0, np.mean(features['rms']) * 200 + 50))
         
         # Analyze speaking rate
-        onset_env = librosa.onset.onset_strength(y=audio, sr=self.sample_rate)
-        tempo = librosa.beat.tempo(onset_envelope=onset_env, sr=self.sample_rate)[0]
+        tempo = features['tempo']
         tempo_score = min(100, max(0, 100 - abs(tempo - 120) * 0.5))
         
         return np.mean([amplitude_score, tempo_score])
@@ -196,7 +220,8 @@ class VoiceRatingAnalyzer:
             duration (float): Recording duration if no audio provided
             
         Returns:
-            Dict containing parameters scores and overall score
+            Dict containing parameters scores and overall score, plus per-stage
+            'timings' when instrumentation is enabled
         """
         if audio is None:
             audio = self.record_audio(duration)
@@ -204,32 +229,57 @@ class VoiceRatingAnalyzer:
         # Store audio for potential reanalysis
         self._last_audio = audio
         
-        # Normalize audio
-        audio = audio / (np.max(np.abs(audio)) + 1e-6)
-        
-        # Analyze individual parameters
-        self.parameters['pitch'] = self.analyze_pitch(audio)
-        self.parameters['tone'] = self.analyze_tone(audio)
-        self.parameters['frequency_variation'] = self.analyze_frequency_variation(audio)
-        self.parameters['pauses'] = self.analyze_pauses(audio)
-        self.parameters['confidence'] = self.analyze_confidence(audio)
+        with self.instrumentation.collect() as timings:
+            with self.instrumentation.stage('total'):
+                # Normalize audio
+                audio = audio / (np.max(np.abs(audio)) + 1e-6)
+                
+                # Intermediates (STFT, speech segments, ...) are computed once and shared
+                features = self.features(audio)
+                
+                # Analyze individual parameters; the result belongs to this call only
+                parameters = {
+                    'pitch': self.analyze_pitch(audio, features),
+                    'tone': self.analyze_tone(audio, features),
+                    'frequency_variation': self.analyze_frequency_variation(audio, features),
+                    'pauses': self.analyze_pauses(audio, features),
+                    'confidence': self.analyze_confidence(audio, features)
+                }
         
         # Calculate weighted overall score
         weighted_scores = [
             score * self.weights[param]
-            for param, score in self.parameters.items()
+            for param, score in parameters.items()
         ]
         overall_score = np.sum(weighted_scores) / np.sum(list(self.weights.values()))
         
-        return {
-            'parameters': self.parameters,
+        result = {
+            'parameters': parameters,
             'overall_score': overall_score
         }
+        if self.instrumentation.enabled:
+            result['timings'] = timings
+        return result
     
-    def get_feedback(self) -> List[str]:
+    def features(self, audio: np.ndarray) -> FeatureContext:
+        """
+        Lazily computed features of one recording, shared by the analyze_* methods.
+        
+        Args:
+            audio (np.ndarray): Audio data at the analyzer's sampling rate
+            
+        Returns:
+            FeatureContext: Features computed on first access, timed by the analyzer's instrumentation
+        """
+        return FeatureContext(audio, self.sample_rate, instrumentation=self.instrumentation)
+    
+    def get_feedback(self, parameters: Dict[str, float]) -> List[str]:
         """
         Generate detailed feedback based on the analysis results.
         
+        Args:
+            parameters (Dict[str, float]): Parameter scores returned by analyze_voice
+            
         Returns:
             List[str]: List of feedback statements
         """
@@ -274,7 +324,7 @@ class VoiceRatingAnalyzer:
             }
         }
         
-        for param, score in self.parameters.items():
+        for param, score in parameters.items():
             for threshold, message in feedback_thresholds[param].items():
                 if score >= threshold:
                     feedback.append(f"{message} ({score:.1f}/100)")
@@ -21,7 +21,7 @@ for param, score in results['parameters'].items():
 
 # Get detailed feedback
 print("\nDetailed Feedback:")
-for feedback in analyzer.get_feedback():
+for feedback in analyzer.get_feedback(results['parameters']):
     print(f"- {feedback}")
 
 # Optionally save the recorded audio